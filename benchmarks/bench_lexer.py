@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lexer engines throughput, tokens per second.
+
+    python benchmarks/bench_lexer.py [file ...]
+
+Without arguments the sources of the lexer package are used as the corpus.
+"""
+import glob
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import ENGINES, tokens
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 5
+
+
+def default_corpus():
+    return [path for path in sorted(glob.glob(os.path.join(ROOT, 'lexer', '*.py')))
+            if os.path.getsize(path)]
+
+
+def count_tokens(engine, text):
+    lexer = engine(text)
+    count = 1
+    while lexer.get_token().type != tokens.ENDMARKER:
+        count += 1
+    return count
+
+
+def bench(engine, texts):
+    """:return (token数, 最好的一次耗时)"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        count = sum(count_tokens(engine, text) for text in texts)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count, best
+
+
+def main(files):
+    logging.disable(logging.CRITICAL)
+    texts = [open(file, encoding='utf-8').read() for file in files or default_corpus()]
+    print(f'{len(texts)} files, {sum(map(len, texts))} chars, best of {REPEAT}')
+    results = {}
+    for name, engine in sorted(ENGINES.items()):
+        count, elapsed = bench(engine, texts)
+        results[name] = count / elapsed
+        print(f'{name:<10} {count:>8} tokens {elapsed * 1000:>9.1f} ms {results[name]:>12.0f} tokens/s')
+    baseline = results.pop('scanner')
+    for name, rate in results.items():
+        print(f'{name} / scanner: {rate / baseline:.1f}x')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
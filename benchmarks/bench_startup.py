@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cold start latency of manager.py run, lexer and parser on a tiny script.
+
+    python benchmarks/bench_startup.py [file]
+
+Each command is started REPEAT times in a fresh interpreter. The best wall
+time is reported, followed by the slowest imports of one run as measured by
+python -X importtime.
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANAGER = os.path.join(ROOT, 'manager.py')
+COMMANDS = ('run', 'lexer', 'parser')
+REPEAT = 10
+TOP = 8  # 每个命令列出的最慢导入数
+
+
+def default_file():
+    return os.path.join(ROOT, 'tests_pysrc', 'test_if.py')
+
+
+def start(command, file, importtime=False):
+    """:return (耗时, stderr)"""
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + [MANAGER, command, file]
+    begin = time.perf_counter()
+    process = subprocess.run(args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - begin
+    if process.returncode:
+        raise RuntimeError(f'{command} failed:\n{process.stderr}')
+    return elapsed, process.stderr
+
+
+def parse_importtime(stderr):
+    """:return [(累计微秒, 模块名)], 只含顶层导入 即不被其他导入包含的"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):  # 缩进表示嵌套的导入
+            imports.append((int(cumulative), name.strip()))
+    return imports
+
+
+def main(file=None):
+    file = file or default_file()
+    baseline = min(start('-h', file)[0] for _ in range(REPEAT))  # 只有click和参数解析
+    print(f'{os.path.relpath(file, ROOT)}, best of {REPEAT}')
+    print(f'{"-h":<8} {baseline * 1000:>7.1f} ms')
+    for command in COMMANDS:
+        elapsed = min(start(command, file)[0] for _ in range(REPEAT))
+        imports = parse_importtime(start(command, file, importtime=True)[1])
+        total = sum(cumulative for cumulative, _ in imports)
+        print(f'{command:<8} {elapsed * 1000:>7.1f} ms, imports {total / 1000:.1f} ms')
+        for cumulative, name in sorted(imports, reverse=True)[:TOP]:
+            print(f'    {cumulative / 1000:>7.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -1 +1,8 @@
-from ._lexer import PeekTokenLexer, lf_lines
+from ._lexer import Lexer, PeekTokenLexer, lf_lines
+from .regex_lexer import RegexLexer
+from .incremental import IncrementalLexer
+from .token_buffer import TokenBuffer
+from .errors import LexError
+
+# manager.py --engine
+ENGINES = {'scanner': Lexer, 'regex': RegexLexer}
@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import re
+from string import ascii_letters
 from abc import ABC, abstractmethod
+from collections import deque
 from robin import settings
-from robin import util
-from lexer import util, automate
+from lexer import automate
 from lexer import tokens
 from lexer.tokens import Token, iskeyword
-import logging
-from robin.util import log_def, log_cls
+from lexer.errors import LexError
+from lexer.source import iter_lf_lines, source_lines
+from lexer.token_buffer import TokenBuffer
+from robin.util import log_def
 
 
 def lf_lines(text):
@@ -22,17 +26,59 @@ def lf_lines(text):
 
 
 class Context(object):
+    """所有Scanner共享的词法分析状态"""
+    __slots__ = ('lines', 'line_no', 'prev_line', 'line', 'position', 'current_char', 'indent_stack',
+                 'brackets_stack', 'line_states')
+
     def __init__(self, text):
-        self.lines = lf_lines(text)
+        """:param text str或source.SourceFile"""
+        self.lines = lf_lines(text) if isinstance(text, str) else list(text.lines())
+        self.init_line(self.lines[0] if self.lines else '\n')  # 空文本当作一个空行, 只有ENDMARKER
+
+    @classmethod
+    def resume(cls, lines, line_no, indent_stack):
+        """从安全行line_no开始(此前的行已分析过), indent_stack为该行开始时的快照"""
+        context = cls.__new__(cls)
+        context.lines = lines
+        context.init_line(lines[line_no])
+        context.line_no = line_no
+        context.prev_line = lines[line_no - 1] if line_no else ''
+        context.indent_stack = list(indent_stack)
+        return context
+
+    def init_line(self, line):
         self.line_no = 0
-        self.line = self.lines[self.line_no]
-        self.position = 0  # todo offset  '\t'
+        self.prev_line = ''  # 上一行 用于判断显式行连接
+        self.line = line
+        self.position = 0  # 列为字符数, 偏移 制表符显示列见line_index.LineIndex
         self.current_char = self.line[self.position]
         self.indent_stack = [0]  # 处理indent dedent
         self.brackets_stack = []  # 处理隐式行连接 在() [] {}中
+        self.line_states = None  # 不为None时 记录每个安全行开始时的indent_stack: {line_no: tuple}
+
+    def read_line(self):
+        """:return 下一行, 全文结束返回None"""
+        if self.line_no >= len(self.lines) - 1:
+            return None
+        return self.lines[self.line_no + 1]
+
+
+class StreamContext(Context):
+    """按需从lines中读取行, 只保留当前行和上一行"""
+    __slots__ = ('_lines',)
+
+    def __init__(self, lines):
+        self.lines = None
+        self._lines = iter(lines)
+        self.init_line(next(self._lines, '\n'))
+
+    def read_line(self):
+        return next(self._lines, None)
 
 
 class Scanner(ABC):
+    """子类直接读写self.context, 下面的属性只为兼容保留"""
+
     def __init__(self, context):
         self.context = context
 
@@ -97,40 +143,60 @@ class Scanner(ABC):
 
     def look_around(self, n):
         """:argument n 左负 右正"""
-        pos = self.position + n
-        if pos <= len(self.line) - 1:
-            return self.line[pos]
+        context = self.context
+        pos = context.position + n
+        if pos <= len(context.line) - 1:
+            return context.line[pos]
 
     def next_char(self):
-        if self.current_char == '\n':  # 行末
+        context = self.context
+        if context.current_char == '\n':  # 行末
             self.next_line()
         else:
-            self.position += 1
-            self.current_char = self.line[self.position]
+            context.position += 1
+            context.current_char = context.line[context.position]
 
     def next_line(self):
-        if self.line_no == len(self.lines) - 1:  # 结束
-            self.current_char = None
+        context = self.context
+        line = context.read_line()
+        if line is None:  # 结束
+            context.current_char = None
             return
-        self.line_no += 1
-        self.position = 0
-        self.line = self.lines[self.line_no]
-        self.current_char = self.line[self.position]
+        context.line_no += 1
+        context.position = 0
+        context.prev_line = context.line
+        context.line = line
+        context.current_char = line[0]
 
     def make_token(self, type, value=None):
-        return Token(type=type, value=value, line=self.line_no, column=self.position)  # todo offset  '\t'
+        context = self.context
+        return Token(type, value, context.line_no, context.position)
 
     def skip_whitespace(self):
-        while self.current_char not in (None, '\n') and self.current_char.isspace():
-            self.next_char()
-
-    def error(self):
-        # todo 自定义异常  offset  '\t'
-        print(f'line {self.line_no}')
-        print(self.lines[self.line_no][0:-1])
-        print(' ' * self.position + '^')
-        print('Lexical error: invalid char')
-        exit()
+        """跳过空白符 不跨行"""
+        context = self.context
+        char = context.current_char
+        if char is None:
+            return
+        line = context.line
+        position = context.position
+        while char != '\n' and char.isspace():
+            position += 1
+            char = line[position]
+        context.position = position
+        context.current_char = char
+
+    def error(self, message='invalid char'):
+        context = self.context
+        raise LexError(message, context.line_no, context.position, context.line)
+
+    def skip_line(self):
+        """出错后跳过本行剩余部分, 未闭合的括号也一起丢弃"""
+        context = self.context
+        context.position = len(context.line) - 1
+        context.current_char = '\n'
+        context.brackets_stack = []
+        self.next_line()
 
     #############################
 
@@ -148,115 +214,140 @@ class Scanner(ABC):
 
 class IndentScanner(Scanner):
     def match(self):
-        if self.position != 0:
+        context = self.context
+        if context.position != 0:
             return False
-        if len(self.brackets_stack) != 0:  # 行连接
+        if context.brackets_stack:  # 行连接
             return False
-        if self.line_no and len(self.lines[self.line_no - 1]) > 1 and self.lines[self.line_no - 1][-2] == '\\':  # 行连接
+        prev_line = context.prev_line
+        if len(prev_line) > 1 and prev_line[-2] == '\\':  # 行连接
             return False
         return True
 
     @log_def(name='IndentScanner')
     def scan(self):
-        indent_num = self.indent_skip()
-        while self.current_char in ('#', '\n'):  # 跳过 注释行 空白行
-            self.next_line()
-            indent_num = self.indent_skip()
+        context = self.context
+        tabsize = settings.TABSIZE
+        states = context.line_states
+        while True:
+            if states is not None and context.line_no not in states:  # 此行可作为重新分析的起点; 全文结束时会再次进入
+                states[context.line_no] = tuple(context.indent_stack)
+            # 跳过缩进，并计算缩进的格数
+            line = context.line
+            position = context.position
+            char = context.current_char
+            indent_num = 0
+            while char == ' ' or char == '\t':  # 空格符 制表符
+                if char == ' ':
+                    indent_num += 1
+                else:
+                    indent_num += tabsize - indent_num % tabsize
+                position += 1
+                char = line[position]
+            context.position = position
+            context.current_char = char
 
-        return self.indent_judge(indent_num)
+            if char != '#' and char != '\n':
+                break
+            self.next_line()  # 跳过 注释行 空白行
 
-    def indent_skip(self):
-        """跳过缩进，并返回缩进的格数"""
-        indent_num = 0
-        while self.current_char in (' ', '\t'):  # 空格符 制表符
-            if self.current_char == ' ':
-                indent_num += 1
-            else:
-                indent_num += settings.TABSIZE - indent_num % settings.TABSIZE
-            self.next_char()
-        return indent_num
+        return self.indent_judge(indent_num)
 
     def indent_judge(self, indent_num):
         """:argument indent_num 以此判断应该INDENT还是DEDENT或没有"""
-        last_indent = self.indent_stack[-1]
+        indent_stack = self.context.indent_stack
+        last_indent = indent_stack[-1]
 
         if indent_num > last_indent:  # INDENT
-            self.indent_stack.append(indent_num)
+            indent_stack.append(indent_num)
             return self.make_token(tokens.INDENT, indent_num)
         elif indent_num < last_indent:  # DEDENT
             dedent_count = 0
             while indent_num < last_indent:
                 dedent_count += 1
-                last_indent = self.indent_stack[-1 - dedent_count]
-            self.indent_stack = self.indent_stack[:- dedent_count]
+                last_indent = indent_stack[-1 - dedent_count]
+            del indent_stack[-dedent_count:]
             return self.make_token(tokens.DEDENT, dedent_count)
-        elif indent_num == last_indent:
-            return None
-
-        self.error()  # IndentationError: unindent does not match any outer indentation level
 
 
 class EndScanner(Scanner):
     def match(self):
-        return self.current_char in ('#', '\\', '\n', None)
+        return self.context.current_char in ('#', '\\', '\n', None)
 
     # 全文结束ENDMARKER 或 行结束NEWLINE 或 None
     @log_def(name='EndScanner')
     def scan(self):
-        char = self.current_char
+        context = self.context
+        char = context.current_char
         if char is None:  # 全结束
             return self.make_token(tokens.ENDMARKER)
 
-        if char in '#\n' and len(self.brackets_stack) == 0:  # 逻辑行结束
-            token = self.make_token(tokens.NEWLINE)
-            self.next_line()
-            return token
+        if not context.brackets_stack:
+            if char == '#' or char == '\n':  # 逻辑行结束
+                token = self.make_token(tokens.NEWLINE)
+                self.next_line()
+                return token
+        elif char == '#':  # 括号中的注释
+            context.position = len(context.line) - 1
+            context.current_char = '\n'
+            return
 
-        if (char == '\\' and self.look_around(1) == '\n') \
-                or (char == '\n' and len(self.brackets_stack) != 0):  # 显式行连接 隐式行连接
+        if char == '\n' or context.line[context.position + 1] == '\n':  # 隐式行连接 显式行连接
             self.next_line()
             self.skip_whitespace()
+        else:
+            self.error('unexpected character after line continuation character')
 
 
 class NumberScanner(Scanner):
     def match(self):
-        return self.current_char in '0123456789' or (self.current_char == '.' and self.look_around(1) in '0123456789')
+        char = self.context.current_char
+        return char in '0123456789' or (char == '.' and self.look_around(1) in '0123456789')
 
     @log_def(name='NumberScanner')
     def scan(self):
+        context = self.context
         number_dfa = automate.number_dfa
 
-        while number_dfa.accept(self.current_char):
-            self.next_char()
+        line = context.line
+        start, end = number_dfa.match(line, context.position)  # 数字不跨行
+        context.position = end
+        context.current_char = line[end]
         if number_dfa.is_final():
-            token = self.make_token(tokens.NUMBER, number_dfa.string)
-            # token = self.make_token(tokens.NUMBER, self.str2num(number_dfa.string))
-            number_dfa.reset()
-            return token
+            return Token(tokens.NUMBER, line[start:end], context.line_no, end)
         else:
-            self.error()
+            self.error('invalid number literal')
 
 
 class NameScanner(Scanner):
     def match(self):
-        return self.current_char and self.current_char.isidentifier()
+        char = self.context.current_char
+        return char and char.isidentifier()
 
     @log_def(name='NameScanner')
     def scan(self):
-        name = self.current_char
-        self.next_char()
-        while (self.current_char and self.current_char.isidentifier()) or self.current_char in '0123456789':
-            name += self.current_char
-            self.next_char()
-
+        context = self.context
+        line = context.line
+        start = context.position
+        end = start + 1
+        char = line[end]
+        while char.isidentifier() or char in '0123456789':
+            end += 1
+            char = line[end]
+        context.position = end
+        context.current_char = char
+
+        name = line[start:end]
         if iskeyword(name):
-            return self.make_token(name)
-        return self.make_token(tokens.ID, name)
+            return Token(name, None, context.line_no, end)
+        if name in tokens.reserved:
+            raise LexError(f"keyword '{name}' is not implemented", context.line_no, start, line)
+        return Token(tokens.ID, name, context.line_no, end)
 
 
 class StrScanner(Scanner):
     def match(self):
-        head = self.current_char
+        head = self.context.current_char
         if head in '\'\"':
             return True
         if head.lower() in 'rufb':
@@ -267,112 +358,113 @@ class StrScanner(Scanner):
                 return True
         return False
 
+    # 字符串内容中需要停下判断的字符: 结束引号 反斜杠, 单引号字符串还有行末
+    stops = {quote * num: re.compile(r'[\\%s%s]' % (quote, '' if num == 3 else '\n'))
+             for quote in '\'"' for num in (1, 3)}
+
     @log_def(name='StrScanner')
     def scan(self):
-        string = ''
-        while self.current_char not in '\'\"':  # 前缀
-            string += self.current_char
-            self.next_char()
-
-        is_bytes = False
-        if 'b' in string.lower():
-            is_bytes = True
-
-        quote = self.current_char  # 单引号或双引号
-        quote_num = self.quote_num()  # 1 or 3
-
-        string += quote * quote_num
+        context = self.context
+        line = first_line = context.line
+        line_no = context.line_no
+        start = token_start = position = context.position
+        while line[position] not in '\'\"':  # 前缀
+            position += 1
+        is_bytes = 'b' in line[start:position].lower()
+
+        quote = line[position]  # 单引号或双引号
+        quote_start = position
+        if line.startswith(quote * 3, position):
+            quote *= 3
+        position += len(quote)
+        stop = self.stops[quote]
+
+        segments = []  # 跨行字符串之前各行的部分
         while True:
-            char = self.current_char
-            if quote_num == 1 and char == '\n' or char is None:
-                self.error()  # SyntaxError: EOL while scanning string literal
-            elif char == '\\':
-                string += '\\'
-                self.next_char()
-                string += self.current_char
-                self.next_char()
-            elif char == quote and self.quote_num() == quote_num:
-                string += quote * quote_num
-                if is_bytes:
-                    return self.make_token(tokens.BYTES, string)
-                else:
-                    return self.make_token(tokens.STRING, string)
-            elif is_bytes and not util.is_ascii(char):
-                self.error()  # SyntaxError: bytes can only contain ASCII literal characters.
-            else:
-                string += char
-                self.next_char()
-
-    def quote_num(self):
-        if self.current_char == self.look_around(1) == self.look_around(2):
-            self.next_char()
-            self.next_char()
-            self.next_char()
-            return 3
-        else:
-            self.next_char()
-            return 1
+            match = stop.search(line, position)
+            if match is None or match.end() == len(line) - 1 and match.group() == '\\':
+                # 三引号字符串 或 \续行: 本行剩余部分都属于字符串
+                segments.append(line[start:])
+                self.next_line()
+                if context.current_char is None:
+                    raise LexError('unterminated triple-quoted string literal', line_no, quote_start, first_line)
+                line = context.line
+                start = position = 0
+                continue
+            position = match.start()
+            char = match.group()
+            if char == '\\':  # 转义 跳过下一个字符
+                position += 2
+            elif char == '\n':
+                raise LexError('unterminated string literal', line_no, quote_start, first_line)
+            elif line.startswith(quote, position):
+                position += len(quote)
+                break
+            else:  # 三引号字符串中单独的引号
+                position += 1
+
+        segments.append(line[start:position])
+        string = ''.join(segments)
+        context.position = position
+        context.current_char = line[position]
+        if is_bytes and not string.isascii():  # 出错后从字符串之后的行末继续
+            raise LexError('bytes can only contain ASCII literal characters', line_no, token_start, first_line)
+        return self.make_token(tokens.BYTES if is_bytes else tokens.STRING, string)
 
 
 class OpDelimiterScanner(Scanner):
+    # 多字符的操作符 分隔符, 其余为单字符
+    triples = frozenset(('**=', '//=', '<<=', '>>='))
+    doubles = frozenset(('->', '!=', '**', '//', '<<', '>>',
+                         '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<=', '>=', '=='))
+    singles = frozenset('()[]{},:.;@~+-*/%&|^<>=')
+
     def __init__(self, context):
         super().__init__(context)
-        self.len = 0
         self.brackets_dict = {'(': ')', '[': ']', '{': '}'}
 
     def deal_brackets(self, bracket):
-        logging.debug(f'brackets_stack: {self.brackets_stack}, cur_char:{self.current_char}')
+        brackets_stack = self.context.brackets_stack
         if bracket in '([{':
-            self.brackets_stack.append(bracket)
-        elif len(self.brackets_stack) == 0 or self.brackets_dict[self.brackets_stack[-1]] != bracket:
-            self.error()
+            brackets_stack.append(bracket)
+        elif len(brackets_stack) == 0 or self.brackets_dict[brackets_stack[-1]] != bracket:
+            self.error('unmatched bracket')
         else:
-            self.brackets_stack.pop()
+            brackets_stack.pop()
 
-    @log_def(name='OpDelimiterScanner')
     def match(self):
-        self.len = 0
-        op_delimiter = self.current_char
-        if op_delimiter is None:
+        context = self.context
+        if context.current_char is None:
             return False
-        if op_delimiter in '()[]{},:.;@~':
-            if op_delimiter in '()[]{}':
-                self.deal_brackets(op_delimiter)
-            self.len = 1
-            return True
-        elif op_delimiter in '+-*/%&|^<>=':
-            if self.look_around(1) == '=':
-                self.len = 2
-            else:
-                self.len = 1
-            return True
-
-        op_delimiter += self.look_around(1)
-        if op_delimiter in ('->', '!='):
-            self.len = 2
-            return True
-        elif op_delimiter in ('**', '//', '<<', '>>'):
-            if self.look_around(2) == '=':
-                self.len = 3
-            else:
-                self.len = 2
-            return True
-        return False
+        return self.longest(context.line, context.position) is not None
+
+    def longest(self, line, position):
+        """:return position处最长的操作符 分隔符"""
+        op_delimiter = line[position:position + 3]
+        if op_delimiter in self.triples:
+            return op_delimiter
+        op_delimiter = op_delimiter[:2]
+        if op_delimiter in self.doubles:
+            return op_delimiter
+        op_delimiter = op_delimiter[:1]
+        if op_delimiter in self.singles:
+            return op_delimiter
 
     @log_def(name='OpDelimiterScanner')
     def scan(self):
-        op_delimiter = ''
-        for i in range(self.len):
-            op_delimiter += self.current_char
-            self.next_char()
-        logging.debug(f'op_delimiter= "{op_delimiter}"  len={self.len}')
-        if op_delimiter in tokens.operator & tokens.delimiter:
-            return self.make_token(op_delimiter)
-        else:
+        context = self.context
+        position = context.position
+        op_delimiter = self.longest(context.line, position)
+        if op_delimiter is None:
             self.error()
+        if op_delimiter in '()[]{}':
+            self.deal_brackets(op_delimiter)
+        position += len(op_delimiter)
+        context.position = position
+        context.current_char = context.line[position]
+        return Token(op_delimiter, None, context.line_no, position)
 
 
-# @log_cls
 class Lexer(Scanner):
     def match(self):
         pass
@@ -380,46 +472,131 @@ class Lexer(Scanner):
     def scan(self):
         pass
 
-    def __init__(self, text: str):
-        super().__init__(Context(text))
+    def __init__(self, text, lazy=False, recover=False):
+        """
+        :param text str或source.SourceFile
+        :param lazy 为True时按需逐行读取text, 不保留全部行
+        :param recover 为True时LexError记录到errors, 跳过出错的行继续分析; 否则抛出
+        """
+        super().__init__(StreamContext(source_lines(text)) if lazy else Context(text))
+        self.init_scanners(recover)
+
+    @classmethod
+    def from_context(cls, context, recover=False):
+        """在已有的Context上继续分析, 见Context.resume"""
+        lexer = cls.__new__(cls)
+        Scanner.__init__(lexer, context)
+        lexer.init_scanners(recover)
+        return lexer
+
+    def init_scanners(self, recover=False):
+        self.errors = [] if recover else None
         self.indent_scanner = IndentScanner(self.context)
         self.str_scanner = StrScanner(self.context)
         self.name_scanner = NameScanner(self.context)
         self.number_scanner = NumberScanner(self.context)
         self.end_scanner = EndScanner(self.context)
         self.op_delimiter_scanner = OpDelimiterScanner(self.context)
-
-    @log_def(name='Lexer')
-    def get_token(self):
-        if self.indent_scanner.match():  # 行开始
-            token = self.indent_scanner.scan()
-            if token:
-                return token
-        if self.end_scanner.match():  # 全结束 或 行结束
-            token = self.end_scanner.scan()
-            if token:
-                return token
-
-        self.skip_whitespace()  # 空白符
-        if self.str_scanner.match():  # 字符串  在标识符或关键字之前判断
+        self.dispatch = self.build_dispatch()
+
+    def build_dispatch(self):
+        """
+        首字符 -> 扫描函数, 扫描函数返回token或在前进后返回None; 表中没有的字符另行判断
+        表中是绑定的方法, 之后调用enable_trace()不影响这个Lexer
+        """
+        dispatch = {}
+        for char in ascii_letters + '_':
+            dispatch[char] = self.name_scanner.scan
+        for char in 'rRuUfFbB':  # 可能是字符串前缀
+            dispatch[char] = self.scan_prefix
+        for char in '\'\"':
+            dispatch[char] = self.str_scanner.scan
+        for char in '0123456789':
+            dispatch[char] = self.number_scanner.scan
+        for char in OpDelimiterScanner.singles | {'!'}:
+            dispatch[char] = self.op_delimiter_scanner.scan
+        dispatch['.'] = self.scan_dot
+        dispatch[' '] = dispatch['\t'] = self.skip_whitespace
+        return dispatch
+
+    def scan_prefix(self):
+        if self.str_scanner.match():  # 字符串 在标识符或关键字之前判断
             return self.str_scanner.scan()
-        elif self.name_scanner.match():  # 标识符或关键字
-            return self.name_scanner.scan()
-        elif self.number_scanner.match():  # 数字
+        return self.name_scanner.scan()
+
+    def scan_dot(self):
+        if self.number_scanner.match():
             return self.number_scanner.scan()
-        elif self.op_delimiter_scanner.match():  # 操作符 分割符
-            return self.op_delimiter_scanner.scan()
+        return self.op_delimiter_scanner.scan()
 
-        # indent_scanner 和 end_scanner 可能返回None   skip_whitespace没返回        就再次调用get_token()
-        return self.get_token()
+    @log_def(name='Lexer')
+    def get_token(self):
+        context = self.context
+        dispatch = self.dispatch
+        indent_scanner = self.indent_scanner
+        while True:
+            try:
+                if context.position == 0 and indent_scanner.match():  # 行开始
+                    token = indent_scanner.scan()
+                    if token:
+                        return token
+
+                char = context.current_char
+                if char is None or char in '#\\\n':  # 全结束 或 行结束
+                    token = self.end_scanner.scan()
+                    if token:
+                        return token
+                    continue
+
+                scan = dispatch.get(char)
+                if scan is None:  # 非ASCII字符
+                    if char.isspace():
+                        scan = self.skip_whitespace
+                    elif char.isidentifier():
+                        scan = self.name_scanner.scan
+                    else:
+                        self.error()
+                token = scan()
+                if token:
+                    return token
+                # indent_scanner end_scanner skip_whitespace 没返回token时继续循环
+            except LexError as e:
+                if self.errors is None:
+                    raise
+                self.errors.append(e)
+                self.skip_line()
 
 
 class PeekTokenLexer(object):
-    def __init__(self, text):
-        self.lexer = Lexer(text)
+    """
+    lazy为False时一次性生成全部token到token_stream
+    lazy为True时按需从Lexer读取token, 只缓存最多lookahead个token, 内存占用与源文件大小无关
+    engine为提供get_token()的词法分析器类, 默认Lexer
+    compact为True时token_stream为列式存储的TokenBuffer(只用于lazy为False)
+    recover为True时词法错误不抛出, 见errors
+    """
+
+    def __init__(self, text, lazy=False, lookahead=settings.LOOKAHEAD, engine=None, compact=False, recover=False):
+        if compact:
+            text = ''.join(source_lines(text))
+        self.lexer = (engine or Lexer)(text, lazy=lazy, recover=recover)
         self.index = -1
-        self.token_stream = []
-        self._stream_token()
+        self.lazy = lazy
+        if lazy:
+            self.token_stream = None
+            self.lookahead = lookahead
+            self.buffer = deque()  # 已读取但未被next_token取走的token
+            self.current = None  # peek_token(0)
+            self.dedent_num = 0  # 待拆分的DEDENT个数
+            self.end = None  # ENDMARKER
+        else:
+            self.token_stream = TokenBuffer(text) if compact else []
+            self._stream_token()
+
+    @property
+    def errors(self):
+        """recover为True时已遇到的LexError"""
+        return self.lexer.errors
 
     def _stream_token(self):
         token = self.lexer.get_token()
@@ -429,7 +606,6 @@ class PeekTokenLexer(object):
             else:
                 self.token_stream.append(token)
             token = self.lexer.get_token()
-            logging.info(token)
         self.token_stream.append(self.lexer.get_token())
 
     def _add_dedent(self, token):
@@ -439,11 +615,40 @@ class PeekTokenLexer(object):
             num += 1
             self.token_stream.append(Token(tokens.DEDENT, None, token.line, token.column))
 
+    def _read_token(self):
+        """lazy模式下从Lexer读取下一个token, DEDENT在此拆分"""
+        if self.end is not None:
+            return self.end
+        if self.dedent_num:
+            self.dedent_num -= 1
+            return self.dedent
+        token = self.lexer.get_token()
+        if token.type == tokens.DEDENT:
+            self.dedent = Token(tokens.DEDENT, None, token.line, token.column)
+            self.dedent_num = token.value - 1
+            return self.dedent
+        if token.type == tokens.ENDMARKER:  # 与_stream_token一致 使用第二次读到的ENDMARKER
+            self.end = self.lexer.get_token()
+            return self.end
+        return token
+
     def next_token(self):
         self.index += 1
-        return self.token_stream[self.index]
+        if not self.lazy:
+            return self.token_stream[self.index]
+        self.current = self.buffer.popleft() if self.buffer else self._read_token()
+        return self.current
 
     def peek_token(self, peek=1):
+        if self.lazy:
+            if peek == 0:
+                return self.current
+            if not 0 < peek <= self.lookahead:
+                raise IndexError(f'peek_token({peek}) out of lookahead {self.lookahead}')
+            while len(self.buffer) < peek:
+                self.buffer.append(self._read_token())
+            return self.buffer[peek - 1]
+
         index = self.index + peek
         if index >= len(self.token_stream):
             return self.token_stream[-1]
@@ -6,17 +6,22 @@ from enum import Enum
 class Automate(object):
     def __init__(self, arcs, status_map, final_status):
         """
-        :param arcs 注：每个弧之间不含相同的字符！
+        :param arcs 注：每个弧之间不含相同的字符！ 弧为Arcs或字符串
         :param status_map 状态转换图 二维
         :param final_status 对应的状态是不是终态 是True非False
         """
         self.arcs = arcs
         self.status_map = status_map
         self.final_status = final_status
-        self.status = 0  # 当前状态
-        self.string = ''  # 已识别的部分
         self.check_map()
         self.fill_map()
+        self.build()
+        self.reset()
+
+    @classmethod
+    def from_spec(cls, spec):
+        """由类正则表达式spec构造最小化的DFA, 语法见SpecParser"""
+        return cls(*build_dfa(SpecParser(spec).parse()))
 
     def error(self):
         raise Exception('Automate error!')
@@ -34,9 +39,29 @@ class Automate(object):
         if len(self.final_status) != len(self.status_map):
             self.error()
 
+    def build(self):
+        """将arcs和status_map转换为每个状态一个dict 字符->下一状态"""
+        self.table = []
+        for row in self.status_map:
+            transitions = {}
+            for arc, next_status in zip(self.arcs, row):
+                if next_status is not None:
+                    for char in getattr(arc, 'value', arc):
+                        transitions.setdefault(char, next_status)
+            self.table.append(transitions)
+
     def reset(self):
         self.status = 0
-        self.string = ''
+        self.source = ''  # 被识别的文本
+        self.start = self.end = 0  # 已识别的部分在source中的偏移
+        self.chars = []  # accept()逐个接受的字符
+
+    @property
+    def string(self):
+        """已识别的部分"""
+        if self.chars:
+            return ''.join(self.chars)
+        return self.source[self.start:self.end]
 
     def is_final(self):
         """当前状态是否为终态"""
@@ -46,23 +71,224 @@ class Automate(object):
         """
         :return 能否接受char
         """
-        row = self.status_map[self.status]
-        for i, arc in enumerate(self.arcs):
-            if row[i] and char in arc.value:
-                # print(f'log:   char:{char}, arc:{arc.value}, i:{i},next:{row[i]}')
-                self.string += char
-                self.status = row[i]
-                return True
+        next_status = self.table[self.status].get(char)
+        if next_status is not None:
+            self.chars.append(char)
+            self.status = next_status
+            return True
         return False
 
+    def match(self, text, start=0):
+        """
+        从text[start]开始接受尽可能多的字符, 之后用is_final()判断是否识别成功
+        :return: 已识别部分的偏移 (start, end)
+        """
+        table = self.table
+        status = 0
+        end = start
+        length = len(text)
+        while end < length:
+            next_status = table[status].get(text[end])
+            if next_status is None:
+                break
+            status = next_status
+            end += 1
+        self.status = status
+        self.source = text
+        self.start = start
+        self.end = end
+        self.chars = []
+        return start, end
+
     def recognise(self, string):
         """
         :return: 能否识别string
         """
-        for char in string:
-            if self.accept(char) is False:
-                return False
-        return self.is_final()
+        return self.match(string)[1] == len(string) and self.is_final()
+
+
+class SpecParser(object):
+    """
+    类正则表达式 -> 语法树
+        spec   : branch ('|' branch)*
+        branch : piece*
+        piece  : atom ('*' | '+' | '?')*
+        atom   : char | '\\' char | '[' class ']' | '(' spec ')'
+    字符类支持区间 a-z, 不支持取反; 空白被忽略, 空格用'\\ '
+    语法树: ('char', frozenset) ('cat', a, b) ('or', a, b) ('star', a) ('plus', a) ('opt', a) ('empty',)
+    """
+
+    def __init__(self, spec):
+        self.spec = self.strip(spec)
+        self.position = 0
+
+    @staticmethod
+    def strip(spec):
+        """去掉未转义的空白"""
+        chars = []
+        escaped = False
+        for char in spec:
+            if escaped or not char.isspace():
+                chars.append(char)
+            escaped = not escaped and char == '\\'
+        return ''.join(chars)
+
+    def error(self):
+        raise Exception(f'Spec error at {self.position}: {self.spec!r}')
+
+    def peek(self):
+        if self.position < len(self.spec):
+            return self.spec[self.position]
+
+    def next(self):
+        char = self.peek()
+        if char is None:
+            self.error()
+        self.position += 1
+        return char
+
+    def parse(self):
+        node = self.branches()
+        if self.peek() is not None:
+            self.error()
+        return node
+
+    def branches(self):
+        node = self.branch()
+        while self.peek() == '|':
+            self.next()
+            node = ('or', node, self.branch())
+        return node
+
+    def branch(self):
+        node = ('empty',)
+        while self.peek() not in (None, '|', ')'):
+            piece = self.piece()
+            node = piece if node == ('empty',) else ('cat', node, piece)
+        return node
+
+    def piece(self):
+        node = self.atom()
+        while self.peek() in ('*', '+', '?'):
+            node = ({'*': 'star', '+': 'plus', '?': 'opt'}[self.next()], node)
+        return node
+
+    def atom(self):
+        char = self.next()
+        if char == '(':
+            node = self.branches()
+            if self.next() != ')':
+                self.error()
+            return node
+        if char == '[':
+            return 'char', self.char_class()
+        if char in '|)*+?]':
+            self.error()
+        if char == '\\':
+            char = self.next()
+        return 'char', frozenset(char)
+
+    def char_class(self):
+        chars = set()
+        while self.peek() != ']':
+            char = self.next()
+            if char == '\\':
+                char = self.next()
+            elif self.peek() == '-' and self.spec[self.position + 1:self.position + 2] not in ('', ']'):
+                self.next()
+                chars.update(map(chr, range(ord(char), ord(self.next()) + 1)))
+                continue
+            chars.add(char)
+        self.next()
+        return frozenset(chars)
+
+
+def build_dfa(tree):
+    """
+    由语法树直接构造DFA(followpos方法), 再用Moore算法最小化
+    :return (arcs, status_map, final_status) 弧为互不相交的字符串
+    """
+    leaves = []  # 每个位置的字符集
+    followpos = []
+
+    def walk(node):
+        """:return nullable, firstpos, lastpos"""
+        kind = node[0]
+        if kind == 'char':
+            leaves.append(node[1])
+            followpos.append(set())
+            position = frozenset([len(leaves) - 1])
+            return False, position, position
+        if kind == 'empty':
+            return True, frozenset(), frozenset()
+        if kind in ('cat', 'or'):
+            left, right = walk(node[1]), walk(node[2])
+            if kind == 'or':
+                return left[0] or right[0], left[1] | right[1], left[2] | right[2]
+            for position in left[2]:
+                followpos[position] |= right[1]
+            first = left[1] | right[1] if left[0] else left[1]
+            last = left[2] | right[2] if right[0] else right[2]
+            return left[0] and right[0], first, last
+        nullable, first, last = walk(node[1])
+        if kind in ('star', 'plus'):
+            for position in last:
+                followpos[position] |= first
+        return nullable or kind != 'plus', first, last
+
+    nullable, first, last = walk(tree)
+    end = len(leaves)  # 结束标记的位置
+    for position in last:
+        followpos[position].add(end)
+    if nullable:
+        first = first | {end}
+
+    # 字符按属于哪些位置的字符集分类 每类作为一个弧
+    classes = {}
+    for char in set().union(*leaves):
+        signature = frozenset(i for i, leaf in enumerate(leaves) if char in leaf)
+        classes.setdefault(signature, []).append(char)
+    arcs = sorted(''.join(sorted(chars)) for chars in classes.values())
+    signatures = [frozenset(i for i, leaf in enumerate(leaves) if arc[0] in leaf) for arc in arcs]
+
+    states = [frozenset(first)]
+    index = {states[0]: 0}
+    moves = []
+    for state in states:
+        row = []
+        for signature in signatures:
+            target = frozenset().union(*(followpos[position] for position in state & signature))
+            if not target:
+                row.append(None)
+                continue
+            if target not in index:
+                index[target] = len(states)
+                states.append(target)
+            row.append(index[target])
+        moves.append(row)
+    finals = [end in state for state in states]
+
+    # Moore最小化: 按(是否终态, 各弧目标所在分组)反复细分
+    groups = [int(final) for final in finals]
+    while True:
+        keys = [(groups[i],) + tuple(None if t is None else groups[t] for t in row) for i, row in enumerate(moves)]
+        numbering = {}
+        refined = [numbering.setdefault(key, len(numbering)) for key in keys]
+        if len(numbering) == len(set(groups)):
+            break
+        groups = refined
+
+    # 重新编号, 初态为0
+    order = {}
+    for i in range(len(states)):
+        order.setdefault(groups[i], len(order))
+    status_map = [None] * len(order)
+    final_status = [None] * len(order)
+    for i, row in enumerate(moves):
+        status = order[groups[i]]
+        status_map[status] = [None if t is None else order[groups[t]] for t in row]
+        final_status[status] = finals[i]
+    return tuple(arcs), status_map, tuple(final_status)
 
 
 class Arcs(Enum):
@@ -112,26 +338,13 @@ int_dfa = Automate(
     final_status=(False, True, True, True, False, False, False, True, True, True)
 )
 
-number_dfa = Automate(
-    arcs=(Arcs.no_zero, Arcs.zero, Arcs.dot, Arcs.exponent_sign, Arcs.complex_sign, Arcs.bin_sign, Arcs.oct_sign,
-          Arcs.hex_sign, Arcs.sign_bit, Arcs.bin, Arcs.oct, Arcs.hex),
-    status_map=[[1, 2, 3],
-                [1, 1, 4, 5, 6],
-                [7, 8, 4, 5, 6, 9, 10, 11],
-                [4, 4],
-                [4, 4, None, 5, 6],
-                [12, 12, None, None, None, None, None, None, 13],
-                [],
-                [7, 7, 4, 5, 6],
-                [7, 8, 4, 5, 6],
-                [None, None, None, None, None, None, None, None, None, 14],
-                [None, None, None, None, None, None, None, None, None, None, 15],
-                [None, None, None, None, None, None, None, None, None, None, None, 16],
-                [12, 12, None, None, 6],
-                [12, 12],
-                [None, None, None, None, None, None, None, None, None, 14],
-                [None, None, None, None, None, None, None, None, None, None, 15],
-                [None, None, None, None, None, None, None, None, None, None, None, 16]],
-    final_status=(
-        False, True, True, False, True, False, True, False, True, False, False, False, True, False, True, True, True)
-)
+# 数字字面量 不支持下划线
+NUMBER_SPEC = r'''
+      [1-9][0-9]* | 0+
+    | 0[bB][01]+ | 0[oO][0-8]+ | 0[xX][0-9a-fA-F]+
+    | ([0-9]+ | [0-9]+\.[0-9]* | \.[0-9]+) ([eE][+\-]?[0-9]+)? [jJ]
+    | ([0-9]+\.[0-9]* | \.[0-9]+) ([eE][+\-]?[0-9]+)?
+    | [0-9]+ [eE][+\-]?[0-9]+
+'''
+
+number_dfa = Automate.from_spec(NUMBER_SPEC)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from robin import settings
+
+
+class LexError(Exception):
+    """词法错误, line column从0开始 与Token相同"""
+
+    def __init__(self, message, line, column, source_line):
+        super().__init__(message, line, column, source_line)
+        self.message = message
+        self.line = line
+        self.column = column
+        self.source_line = source_line.rstrip('\n')
+
+    def __str__(self):
+        return f'line {self.line}, column {self.column}: {self.message}'
+
+    def format(self, tabsize=None):
+        """出错的行 并在出错位置下标出^, 制表符按tabsize展开"""
+        tabsize = tabsize or settings.TABSIZE
+        source_line = self.source_line.expandtabs(tabsize)
+        caret = len(self.source_line[:self.column].expandtabs(tabsize))
+        return f'line {self.line}\n{source_line}\n{" " * caret}^\nLexical error: {self.message}'
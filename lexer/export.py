@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+边分析边导出token, 通过缓冲批量写入二进制文件对象
+jsonl: 每行一个 {"type": ..., "value": ..., "line": ..., "column": ...}
+binary: MAGIC, uint32 种类表长度, 种类表(tokens.kinds以\\n连接的utf-8), 之后每个token一条定长记录
+        <BIIII: kind start length line column, start length为在换行符统一为\\n的源文本中的偏移
+"""
+import json
+import mmap
+import struct
+from lexer import tokens
+from lexer.tokens import KIND, kinds
+from lexer.token_buffer import span
+
+FORMATS = ('jsonl', 'binary')
+MAGIC = b'RTOK\x01'
+record = struct.Struct('<BIIII')
+_table_size = struct.Struct('<I')
+FLUSH_SIZE = 1 << 16  # 缓冲达到此字节数时写入
+
+
+def iter_tokens(lexer):
+    """PeekTokenLexer的token 直到ENDMARKER(包含)"""
+    token = lexer.next_token()
+    while token.type != tokens.ENDMARKER:
+        yield token
+        token = lexer.next_token()
+    yield token
+
+
+def write_jsonl(token_iter, out):
+    dumps = json.dumps
+    types = {type: dumps(type) for type in kinds}
+    lines = []
+    size = 0
+    for type, value, line, column in token_iter:
+        text = f'{{"type": {types[type]}, "value": {dumps(value)}, "line": {line}, "column": {column}}}\n'
+        lines.append(text)
+        size += len(text)
+        if size >= FLUSH_SIZE:
+            out.write(''.join(lines).encode())
+            lines.clear()
+            size = 0
+    out.write(''.join(lines).encode())
+
+
+def write_binary(token_iter, line_index, out):
+    """:param line_index LineIndex, 如SourceFile.line_index(); 读到token时其所在行已记录即可"""
+    table = '\n'.join(kinds).encode()
+    out.write(MAGIC + _table_size.pack(len(table)) + table)
+    pack = record.pack
+    buffer = bytearray()
+    for token in token_iter:
+        kind = KIND[token.type]
+        end = line_index.offset(token.line, token.column)
+        start = span(kind, token, end)
+        buffer += pack(kind, start, end - start, token.line, token.column)
+        if len(buffer) >= FLUSH_SIZE:
+            out.write(buffer)
+            buffer.clear()
+    out.write(buffer)
+
+
+def read_binary(path):
+    """:return (种类名称元组, 记录(kind, start, length, line, column)的迭代器), 记录直接从内存映射读取"""
+    with open(path, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'{path} is not a token file')
+    offset = len(MAGIC) + _table_size.size
+    size, = _table_size.unpack_from(data, len(MAGIC))
+    names = tuple(data[offset:offset + size].decode().split('\n'))
+    return names, record.iter_unpack(memoryview(data)[offset + size:])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量词法分析: 编辑若干行后, 只从编辑处之前最近的安全行重新分析,
+与旧token流的状态再次一致时停止, 其余token平移行号后复用
+安全行: brackets_stack为空 且上一行不是\\续行, 即IndentScanner在此行开始处判断缩进
+"""
+from bisect import bisect_right
+from lexer import tokens
+from lexer.tokens import Token
+from lexer._lexer import Context, Lexer, PeekTokenLexer, lf_lines
+
+
+def _restart_lines(lines, line_states):
+    """可以重新开始分析的行号, 升序; 上一行以\\结尾时IndentScanner不会判断缩进"""
+    return [line_no for line_no in sorted(line_states)
+            if line_no == 0 or not lines[line_no - 1].endswith('\\\n')]
+
+
+class IncrementalLexer(PeekTokenLexer):
+    """
+    token_stream与PeekTokenLexer(text)相同, edit()之后与PeekTokenLexer(编辑后的text)相同
+    line_states: 每个安全行开始时的indent_stack快照
+    """
+
+    def __init__(self, text):
+        self.line_states = {}
+        super().__init__(text, engine=self._recording_lexer)
+
+    def _recording_lexer(self, text, lazy=False, recover=False):
+        lexer = Lexer(text, recover=recover)
+        lexer.context.line_states = self.line_states
+        self.lines = lexer.context.lines
+        return lexer
+
+    def text(self):
+        return ''.join(self.lines)
+
+    def edit(self, start, end, text):
+        """
+        用text替换[start, end)行, 重新分析受影响的部分
+        :return (index, old_end, new_end) token_stream[index:old_end]被替换为新的token_stream[index:new_end]
+        """
+        old_lines, old_states, old_stream = self.lines, self.line_states, self.token_stream
+        new_lines = lf_lines(text)
+        lines = old_lines[:start] + new_lines + old_lines[end:]
+        delta = len(new_lines) - (end - start)
+
+        # 编辑处之前的行不变, 其开始时的状态也不变; 删除到全文结束时从前面的行开始
+        restart_lines = _restart_lines(old_lines, old_states)
+        restart = restart_lines[bisect_right(restart_lines, min(start, len(lines) - 1)) - 1]
+        index = 0
+        while old_stream[index].line < restart:
+            index += 1
+
+        states = {line_no: state for line_no, state in old_states.items() if line_no < restart}
+        context = Context.resume(lines, restart, old_states[restart])
+        context.line_states = states
+        lexer = Lexer.from_context(context)
+
+        # 编辑处之后的行与旧的行相同, 状态也相同时后面的token必然相同
+        sync_from = start + len(new_lines)
+        inserted = []
+        suffix = None
+        while True:
+            line_no = context.line_no
+            token = lexer.get_token()
+            for new_line in range(max(line_no, sync_from), context.line_no + 1):
+                old_line = new_line - delta
+                if new_line in states and old_states.get(old_line) == states[new_line]:
+                    suffix = new_line
+                    break
+            if suffix is not None:  # 本次get_token的token在同步行及之后, 由旧token流提供
+                break
+            if token.type == tokens.ENDMARKER:
+                inserted.append(lexer.get_token())
+                break
+            if token.type == tokens.DEDENT:
+                inserted.extend(Token(tokens.DEDENT, None, token.line, token.column) for _ in range(token.value))
+            else:
+                inserted.append(token)
+
+        old_end = len(old_stream)
+        if suffix is not None:
+            old_end = index
+            while old_stream[old_end].line < suffix - delta:
+                old_end += 1
+            for line_no, state in old_states.items():
+                if line_no >= suffix - delta:
+                    states[line_no + delta] = state
+            if delta:
+                inserted.extend([Token(type, value, line + delta, column)
+                                 for type, value, line, column in old_stream[old_end:]])
+            else:
+                inserted.extend(old_stream[old_end:])
+
+        stream = self.token_stream = old_stream[:index] + inserted
+        self.lines = lines
+        self.line_states = states
+        self.index = -1
+        new_end = index + len(inserted) - (len(old_stream) - old_end)
+
+        # 从安全行开始重新分析的token 开头和结尾可能与旧的相同, 只返回真正改变的部分
+        while index < old_end and index < new_end and old_stream[index] == stream[index]:
+            index += 1
+        while old_end > index and new_end > index:
+            type, value, line, column = old_stream[old_end - 1]
+            if stream[new_end - 1] != (type, value, line + delta, column):
+                break
+            old_end -= 1
+            new_end -= 1
+        return index, old_end, new_end
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+源文本的行索引: 各行开始偏移的数组, 偏移与(行, 列)之间的转换
+行 列从0开始 与Token相同, 列为字符数; 制表符展开后的显示列见visual_column
+使用者: TokenBuffer, SourceFile.line_index()及二进制导出; robin.parser与robin.ast仍使用Token的行列号
+"""
+from array import array
+from bisect import bisect_right
+from robin import settings
+
+
+class LineIndex(object):
+    __slots__ = ('starts',)
+
+    def __init__(self, starts):
+        """:param starts 各行开始偏移的升序序列, 如SourceFile.line_offsets"""
+        self.starts = starts
+
+    @classmethod
+    def from_text(cls, text):
+        """:param text 换行符已统一为\\n的全文"""
+        starts = array('I', [0])
+        position = text.find('\n')
+        while position != -1:
+            starts.append(position + 1)
+            position = text.find('\n', position + 1)
+        return cls(starts)
+
+    def line(self, offset):
+        return bisect_right(self.starts, offset) - 1
+
+    def position(self, offset):
+        """:return (line, column)"""
+        line = bisect_right(self.starts, offset) - 1
+        return line, offset - self.starts[line]
+
+    def offset(self, line, column):
+        return self.starts[line] + column
+
+    def visual_column(self, text, offset, tabsize=None):
+        """offset在行中的显示列, 制表符对齐到tabsize的倍数"""
+        start = self.starts[self.line(offset)]
+        return len(text[start:offset].expandtabs(tabsize or settings.TABSIZE))
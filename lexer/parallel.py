@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单个大文件的多进程词法分析: 在顶层语句开始的行处切分, 各块独立分析后拼接
+块从缩进0 空括号栈开始分析, 与在原文中分析到该行时的状态只差indent_stack, 拼接时补上DEDENT
+切分行是否真在字符串 括号之外, 由前一块能否干净结束来验证, 否则与后一块合并重新分析
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from lexer import tokens
+from lexer.tokens import Token
+from lexer.errors import LexError
+from lexer.source import source_lines
+from lexer._lexer import PeekTokenLexer
+
+
+def split_lines(lines, chunk_size):
+    """:return 各块开始的行号; 只在缩进为0 且上一行不以\\续行的行处切分, 每块至少chunk_size个字符"""
+    starts = [0]
+    size = 0
+    for line_no, line in enumerate(lines):
+        if line_no and size >= chunk_size and line[0] not in ' \t#\n' and not lines[line_no - 1].endswith('\\\n'):
+            starts.append(line_no)
+            size = 0
+        size += len(line)
+    return starts
+
+
+def lex_chunk(text, engine=None):
+    """
+    在子进程中运行
+    :return (token元组, 块结束时未闭合的缩进层数, 是否干净结束) 或 LexError
+    非最后一块的结尾的DEDENT ENDMARKER是块结束产生的, 由调用者去掉
+    """
+    try:
+        lexer = PeekTokenLexer(text, engine=engine)
+    except LexError as e:  # 可能是在字符串中切分
+        return e
+    stream = [tuple(token) for token in lexer.token_stream]
+    end = len(stream) - 1
+    while end > 0 and stream[end - 1][0] == tokens.DEDENT:
+        end -= 1
+    depth = sum(1 for token in stream[:end] if token[0] == tokens.INDENT) \
+        - sum(1 for token in stream[:end] if token[0] == tokens.DEDENT)
+    return stream, end, depth, not lexer.lexer.brackets_stack
+
+
+def _shift(stream, line_offset):
+    return [Token(type, value, line + line_offset, column) for type, value, line, column in stream]
+
+
+def parallel_tokens(text, jobs=None, engine=None, chunk_size=1 << 16):
+    """
+    :param text str或source.SourceFile
+    :return 与PeekTokenLexer(text, engine=engine).token_stream相同的token列表
+    """
+    lines = list(source_lines(text))
+    starts = split_lines(lines, chunk_size)
+    chunks = [''.join(lines[start:end]) for start, end in zip(starts, starts[1:] + [len(lines)])]
+    if len(chunks) == 1:
+        return PeekTokenLexer(chunks[0], engine=engine).token_stream
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        results = list(executor.map(lex_chunk, chunks, [engine] * len(chunks)))
+
+    token_stream = []
+    index = 0
+    while index < len(chunks):
+        start = index
+        result = results[index]
+        # 在字符串或括号中切分的块不能干净结束, 与下一块合并后重新分析
+        while index + 1 < len(chunks) and (isinstance(result, LexError) or not result[3]):
+            index += 1
+            result = lex_chunk(''.join(chunks[start:index + 1]), engine)
+        line_offset = starts[start]
+        if isinstance(result, LexError):
+            raise LexError(result.message, result.line + line_offset, result.column, result.source_line)
+
+        stream, end, depth, _ = result
+        if index + 1 == len(chunks):  # 最后一块 保留全文结束的DEDENT ENDMARKER
+            token_stream.extend(_shift(stream, line_offset))
+        else:  # 下一块的第一行缩进为0, 关闭所有缩进
+            token_stream.extend(_shift(stream[:end], line_offset))
+            token_stream.extend([Token(tokens.DEDENT, None, starts[index + 1], 0)] * depth)
+        index += 1
+    return token_stream
+
+
+class ParallelLexer(PeekTokenLexer):
+    """token_stream由parallel_tokens生成, 只支持非lazy模式"""
+
+    def __init__(self, text, jobs=None, engine=None, chunk_size=1 << 16):
+        self.lexer = None
+        self.index = -1
+        self.lazy = False
+        self.token_stream = parallel_tokens(text, jobs=jobs, engine=engine, chunk_size=chunk_size)
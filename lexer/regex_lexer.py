@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于单个预编译正则的词法分析器, 与_lexer.Lexer接口相同, 输出相同的Token
+一次finditer扫描全文, 缩进在扫描过程中处理
+"""
+import re
+from robin import settings
+from lexer import tokens
+from lexer.automate import number_dfa
+from lexer.errors import LexError
+from lexer.source import source_lines
+from lexer.tokens import Token, iskeyword
+
+_string = r'''
+    (?i:fr|rf|br|rb|[rufb])?
+    (?: \'\'\' (?:[^'\\]|\\[\s\S]|'(?!''))* \'\'\'
+      | """ (?:[^"\\]|\\[\s\S]|"(?!""))* """
+      | '(?!'') (?:[^'\\\n]|\\[\s\S])* '
+      | "(?!"") (?:[^"\\\n]|\\[\s\S])* "
+    )
+'''
+
+# 只匹配数字的开始, 范围和是否合法由automate.number_dfa判断, 与Lexer.NumberScanner相同:
+# 接受尽可能多的字符, 停在非终态时报错 (0123 1e 0x)
+_number = r'[0-9] | \.[0-9]'
+
+_op_delimiter = r'''
+      \*\*=? | //=? | <<=? | >>=? | -> | !=
+    | [-+*/%&|^<>=]=?
+    | [()\[\]{},:.;@~]
+'''
+
+master_pattern = re.compile(rf'''
+      (?P<newline> \n )
+    | (?P<comment> \#[^\n]* )
+    | (?P<continuation> \\\n )
+    | (?P<indent> ^[ \t]+ )
+    | (?P<whitespace> [^\S\n]+ )
+    | (?P<string> {_string} )
+    | (?P<name> [^\W\d](?:[^\W\d]|[0-9])* )
+    | (?P<number> {_number} )
+    | (?P<op_delimiter> {_op_delimiter} )
+    | (?P<error> . )
+''', re.VERBOSE | re.MULTILINE)
+
+brackets_dict = {'(': ')', '[': ']', '{': '}'}
+
+
+class RegexLexer(object):
+    """
+    :param lazy 为与Lexer接口一致而保留, token总是按需生成
+    :param recover 与Lexer相同, 为True时LexError记录到errors, 跳过出错的行继续分析
+    """
+
+    def __init__(self, text, lazy=False, recover=False):
+        """
+        :param text str或source.SourceFile
+                    SourceFile也先解码成一个str: 正则跨行匹配字符串和续行, 内存占用与源文件大小成正比
+        """
+        self.text = ''.join(source_lines(text))
+        self.errors = [] if recover else None
+        self.indent_stack = [0]  # 处理indent dedent
+        self.brackets_stack = []  # 处理隐式行连接 在() [] {}中
+        self.line_no = 0
+        self.line_start = 0  # 当前行在text中的偏移
+        self._tokens = self._tokenize()
+
+    def get_token(self):
+        return next(self._tokens)
+
+    def error(self, position, message='invalid char'):
+        line_end = self.text.find('\n', self.line_start)
+        raise LexError(message, self.line_no, position - self.line_start, self.text[self.line_start:line_end])
+
+    def _next_line(self, position):
+        """position处的\\n之后开始新行, 全文结束返回False"""
+        if position + 1 == len(self.text):
+            return False
+        self.line_no += 1
+        self.line_start = position + 1
+        return True
+
+    def _at_line_start(self):
+        """是否在新的逻辑行开始处 需要判断缩进"""
+        if self.brackets_stack:  # 行连接
+            return False
+        start = self.line_start
+        return not (start >= 2 and self.text[start - 2] == '\\')  # 行连接
+
+    def _indent_judge(self, indent_num, column):
+        """:argument indent_num 以此判断应该INDENT还是DEDENT或没有"""
+        indent_stack = self.indent_stack
+        last_indent = indent_stack[-1]
+
+        if indent_num > last_indent:  # INDENT
+            indent_stack.append(indent_num)
+            return Token(tokens.INDENT, indent_num, self.line_no, column)
+        elif indent_num < last_indent:  # DEDENT
+            dedent_count = 0
+            while indent_num < last_indent:
+                dedent_count += 1
+                last_indent = indent_stack[-1 - dedent_count]
+            del indent_stack[-dedent_count:]
+            return Token(tokens.DEDENT, dedent_count, self.line_no, column)
+
+    @staticmethod
+    def _indent_num(indent):
+        """缩进的格数"""
+        indent_num = 0
+        for char in indent:
+            if char == ' ':
+                indent_num += 1
+            else:
+                indent_num += settings.TABSIZE - indent_num % settings.TABSIZE
+        return indent_num
+
+    def _tokenize(self):
+        text = self.text
+        match_token = master_pattern.match
+        indenting = bool(text)  # 行开始, 正在跳过缩进 注释行 空白行
+        indent_num = 0
+        column = 0  # 全文结束时的位置
+        skip_newline = False  # 注释已经产生NEWLINE
+        position = 0
+
+        while position < len(text):
+            match = match_token(text, position)  # 总能匹配, 最后一项为error
+            kind = match.lastgroup
+            start = match.start()
+            position = match.end()
+            try:
+                if indenting:
+                    if kind == 'indent':
+                        indent_num = self._indent_num(match.group())
+                        continue
+                    if kind == 'comment':  # 注释行
+                        skip_newline = True
+                        column = start - self.line_start
+                        continue
+                    if kind == 'newline':  # 空白行
+                        if not skip_newline:
+                            column = start - self.line_start
+                        skip_newline = False
+                        indent_num = 0
+                        if not self._next_line(start):
+                            break
+                        continue
+                    indenting = False
+                    token = self._indent_judge(indent_num, start - self.line_start)
+                    indent_num = 0
+                    if token:
+                        yield token
+
+                if kind == 'whitespace' or kind == 'indent':
+                    continue
+                elif kind == 'newline':
+                    if skip_newline:
+                        skip_newline = False
+                    else:
+                        column = start - self.line_start
+                        if not self.brackets_stack:  # 逻辑行结束
+                            yield Token(tokens.NEWLINE, None, self.line_no, column)
+                    if not self._next_line(start):
+                        break
+                    indenting = self._at_line_start()
+                elif kind == 'comment':
+                    if not self.brackets_stack:  # 逻辑行结束
+                        column = start - self.line_start
+                        yield Token(tokens.NEWLINE, None, self.line_no, column)
+                        skip_newline = True
+                elif kind == 'continuation':
+                    column = start - self.line_start
+                    if not self._next_line(start + 1):
+                        break
+                elif kind == 'name':
+                    name = match.group()
+                    end = position - self.line_start
+                    if iskeyword(name):
+                        yield Token(name, None, self.line_no, end)
+                    elif name in tokens.reserved:
+                        self.error(start, f"keyword '{name}' is not implemented")
+                    else:
+                        yield Token(tokens.ID, name, self.line_no, end)
+                elif kind == 'number':
+                    _, position = number_dfa.match(text, start)
+                    if not number_dfa.is_final():
+                        self.error(position, 'invalid number literal')
+                    yield Token(tokens.NUMBER, text[start:position], self.line_no, position - self.line_start)
+                elif kind == 'string':
+                    string = match.group()
+                    quote = string.find(string[-1])
+                    is_bytes = 'b' in string[:quote].lower()
+                    if is_bytes and not string.isascii():  # 出错后从字符串之后的行末继续
+                        self.error(start, 'bytes can only contain ASCII literal characters')
+                    newlines = string.count('\n')
+                    if newlines:  # 跨行字符串
+                        self.line_no += newlines
+                        self.line_start = text.rindex('\n', start, position) + 1
+                    yield Token(tokens.BYTES if is_bytes else tokens.STRING, string, self.line_no,
+                                position - self.line_start)
+                elif kind == 'op_delimiter':
+                    op_delimiter = match.group()
+                    if op_delimiter in '()[]{}':
+                        self._deal_brackets(op_delimiter, start)
+                    yield Token(op_delimiter, None, self.line_no, position - self.line_start)
+                else:
+                    char = match.group()
+                    if char == '\\':
+                        self.error(start, 'unexpected character after line continuation character')
+                    elif text.startswith(char * 3, start) and char in '\'"':
+                        position = len(text)  # 出错后跳到全文结束
+                        self.error(start, 'unterminated triple-quoted string literal')
+                    elif char in '\'"':
+                        self.error(start, 'unterminated string literal')
+                    self.error(start)
+            except LexError as e:
+                if self.errors is None:
+                    raise
+                self.errors.append(e)
+                # 跳过本行剩余部分 丢弃未闭合的括号, 与Lexer.skip_line相同
+                self.brackets_stack = []
+                newline = text.find('\n', position - 1)
+                self.line_no += text.count('\n', self.line_start, newline)
+                self.line_start = text.rfind('\n', 0, newline) + 1
+                column = newline - self.line_start
+                skip_newline = False
+                indent_num = 0
+                if not self._next_line(newline):
+                    break
+                position = newline + 1
+                indenting = self._at_line_start()
+
+        # 全文结束 与Lexer相同: 停在最后一行 必要时先DEDENT
+        if indenting or (column == 0 and self._at_line_start()):
+            token = self._indent_judge(0, column)
+            if token:
+                yield token
+        while True:
+            yield Token(tokens.ENDMARKER, None, self.line_no, column)
+
+    def _deal_brackets(self, bracket, position):
+        if bracket in '([{':
+            self.brackets_stack.append(bracket)
+        elif len(self.brackets_stack) == 0 or brackets_dict[self.brackets_stack[-1]] != bracket:
+            self.error(position, 'unmatched bracket')
+        else:
+            self.brackets_stack.pop()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+源文件输入: 内存映射文件, 按BOM和PEP 263编码声明增量解码
+"""
+import codecs
+import mmap
+import re
+from array import array
+from tokenize import detect_encoding
+from lexer.line_index import LineIndex
+
+# 与str.splitlines()相同的行分隔符
+_line_break = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def iter_lf_lines(text):
+    """lf_lines的惰性版本, 逐行生成, 不构建整个列表"""
+    start = 0
+    for match in _line_break.finditer(text):
+        yield text[start:match.start()] + '\n'
+        start = match.end()
+    if start < len(text):
+        yield text[start:] + '\n'
+
+
+def source_lines(source):
+    """:param source str或SourceFile  :return 换行符统一为\\n的行"""
+    if isinstance(source, str):
+        return iter_lf_lines(source)
+    return source.lines()
+
+
+class SourceFile(object):
+    """
+    只读内存映射的源文件, 逐块解码, 不把整个文件读成str
+    line_offsets: 已读出的每行在(换行符统一为\\n后的)文本中的起始偏移
+    """
+    chunk_size = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            try:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # 空文件不能映射
+                self.data = b''
+        self.encoding = self.detect_encoding()
+        self.line_offsets = array('Q')
+
+    def detect_encoding(self):
+        """BOM 或 前两行的coding声明, 默认utf-8"""
+        if not self.data:
+            return 'utf-8'
+        encoding, _ = detect_encoding(self.data.readline)
+        self.data.seek(0)
+        return encoding
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def lines(self):
+        """逐行生成, 与lf_lines(解码后的全文)相同; 同时记录line_offsets"""
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        offsets = self.line_offsets
+        del offsets[:]
+        offset = 0
+        pending = ''  # 未遇到行分隔符的部分
+        data = self.data
+        for start in range(0, len(data), self.chunk_size):
+            pending += decoder.decode(data[start:start + self.chunk_size])
+            position = 0
+            for match in _line_break.finditer(pending):
+                if match.end() == len(pending) and match.group() == '\r':  # 可能是\r\n的前一半
+                    break
+                if match.group() == '\n':
+                    line = pending[position:match.end()]
+                else:
+                    line = pending[position:match.start()] + '\n'
+                offsets.append(offset)
+                offset += len(line)
+                yield line
+                position = match.end()
+            pending = pending[position:]
+
+        for line in iter_lf_lines(pending + decoder.decode(b'', final=True)):
+            offsets.append(offset)
+            offset += len(line)
+            yield line
+
+    def line_index(self):
+        """已读出的行的LineIndex, 随lines()继续读取而增长"""
+        return LineIndex(self.line_offsets)
+
+    def read(self):
+        """:return 换行符统一为\\n后的全文"""
+        return ''.join(self.lines())
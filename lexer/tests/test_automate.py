@@ -1,7 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import itertools
 from lexer import automate
 
+# 手写的状态转换表, 用于检验由NUMBER_SPEC生成的number_dfa
+number_table_dfa = automate.Automate(
+    arcs=(automate.Arcs.no_zero, automate.Arcs.zero, automate.Arcs.dot, automate.Arcs.exponent_sign, automate.Arcs.complex_sign, automate.Arcs.bin_sign, automate.Arcs.oct_sign,
+          automate.Arcs.hex_sign, automate.Arcs.sign_bit, automate.Arcs.bin, automate.Arcs.oct, automate.Arcs.hex),
+    status_map=[[1, 2, 3],
+                [1, 1, 4, 5, 6],
+                [7, 8, 4, 5, 6, 9, 10, 11],
+                [4, 4],
+                [4, 4, None, 5, 6],
+                [12, 12, None, None, None, None, None, None, 13],
+                [],
+                [7, 7, 4, 5, 6],
+                [7, 8, 4, 5, 6],
+                [None, None, None, None, None, None, None, None, None, 14],
+                [None, None, None, None, None, None, None, None, None, None, 15],
+                [None, None, None, None, None, None, None, None, None, None, None, 16],
+                [12, 12, None, None, 6],
+                [12, 12],
+                [None, None, None, None, None, None, None, None, None, 14],
+                [None, None, None, None, None, None, None, None, None, None, 15],
+                [None, None, None, None, None, None, None, None, None, None, None, 16]],
+    final_status=(
+        False, True, True, False, True, False, True, False, True, False, False, False, True, False, True, True, True)
+)
+
 
 def test_automate(automate, cases):
     for num_str in cases:
@@ -38,6 +64,36 @@ def test_number_dfa():
         '''.split())
 
 
+def test_number_spec():
+    for length in range(1, 5):
+        for chars in itertools.product('0189.ejbox+-a', repeat=length):
+            string = ''.join(chars) + '\n'
+            number_table_dfa.reset()
+            end = 0
+            while number_table_dfa.accept(string[end]):
+                end += 1
+            assert automate.number_dfa.match(string) == (0, end), string
+            assert automate.number_dfa.is_final() == number_table_dfa.is_final(), string
+
+
+def test_match_offsets():
+    dfa = automate.number_dfa
+    assert dfa.match('a = 3.14e-10j + 1', 4) == (4, 13)
+    assert dfa.is_final() and dfa.string == '3.14e-10j'
+    dfa.match('x 0o', 2)
+    assert not dfa.is_final()
+
+
+def test_from_spec():
+    dfa = automate.Automate.from_spec('(a|b)*abb')
+    assert len(dfa.status_map) == 4  # 最小化
+    assert dfa.recognise('babb') and dfa.recognise('abb')
+    assert not dfa.recognise('abba')
+    dfa = automate.Automate.from_spec(r'[_a-z][_a-z0-9]* | \ +')
+    assert dfa.recognise('_x1') and dfa.recognise('   ')
+    assert not dfa.recognise('1x')
+
+
 if __name__ == '__main__':
     test_number_dfa()
     test_float_complex_dfa()
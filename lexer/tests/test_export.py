@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import tempfile
+from lexer import PeekTokenLexer, tokens
+from lexer.export import iter_tokens, read_binary, write_binary, write_jsonl
+from lexer.source import SourceFile
+
+source = os.path.join(os.path.dirname(os.path.dirname(__file__)), '_lexer.py')
+
+
+def test_jsonl():
+    text = 'if a:\n    b = "x\\ny" + 1\n'
+    out = io.BytesIO()
+    write_jsonl(iter_tokens(PeekTokenLexer(text, lazy=True)), out)
+    lines = out.getvalue().decode().splitlines()
+    assert [tokens.Token(**json.loads(line)) for line in lines] == PeekTokenLexer(text).token_stream
+
+
+def test_binary():
+    with SourceFile(source) as file:
+        lexer = PeekTokenLexer(file, lazy=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tokens.bin')
+            with open(path, 'wb') as out:
+                write_binary(iter_tokens(lexer), file.line_index(), out)
+            names, records = read_binary(path)
+            records = list(records)
+        text = file.read()
+    stream = PeekTokenLexer(text, compact=True).token_stream
+    assert names == tokens.kinds
+    assert records == [(stream.kinds[index], stream.starts[index], stream.ends[index] - stream.starts[index],
+                        stream[index].line, stream[index].column) for index in range(len(stream))]
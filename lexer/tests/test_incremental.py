@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import random
+from lexer import IncrementalLexer, LexError, PeekTokenLexer
+from lexer._lexer import lf_lines
+
+source = os.path.join(os.path.dirname(os.path.dirname(__file__)), '_lexer.py')
+
+text = '''def f(a,
+      b):
+    x = [1,
+         2]
+    if a:
+        y = """
+doc
+"""  # comment
+    z = a + \\
+        b
+
+    return x
+w = 1
+'''
+
+
+def check_edit(lexer, start, end, new_text):
+    lines = lf_lines(lexer.text())
+    expected = PeekTokenLexer(''.join(lines[:start]) + new_text + ''.join(lines[end:])).token_stream
+    old_stream = lexer.token_stream
+    index, old_end, new_end = lexer.edit(start, end, new_text)
+    assert lexer.token_stream == expected
+    assert old_stream[:index] == expected[:index]
+    assert len(old_stream) - old_end == len(expected) - new_end
+
+
+def test_same_as_full_lex():
+    lexer = IncrementalLexer(text)
+    assert lexer.token_stream == PeekTokenLexer(text).token_stream
+    check_edit(lexer, 12, 13, 'w = 2\n')
+    check_edit(lexer, 4, 4, '        pass\n')  # 新增缩进块
+    check_edit(lexer, 0, 1, 'def f(a, c,\n')  # 括号内
+    check_edit(lexer, 7, 8, 'doc"""\n"""\n')  # 跨行字符串
+    check_edit(lexer, 8, 10, '')
+    check_edit(lexer, 8, 9, '    z = a\n')  # 去掉续行
+    check_edit(lexer, 12, 13, '')  # 删除最后一行
+
+
+def test_stop_early():
+    lexer = IncrementalLexer(open(source, encoding='utf-8').read())
+    line = lexer.lines.index('class Scanner(ABC):\n')
+    index, old_end, new_end = lexer.edit(line + 1, line + 1, '    x = (1,\n         2)\n')
+    assert old_end - index < 10
+    assert (new_end - index) - (old_end - index) == 8  # x = ( 1 , 2 ) NEWLINE
+
+
+def test_random_edits():
+    rand = random.Random(0)
+    lines = lf_lines(text)
+    lexer = IncrementalLexer(text)
+    for _ in range(200):
+        current = lf_lines(lexer.text())
+        start = rand.randrange(len(current))
+        end = rand.randrange(start, min(start + 3, len(current)) + 1)
+        new_text = ''.join(rand.sample(lines, rand.randrange(3)))
+        if len(current) - (end - start) + len(lf_lines(new_text)) == 0:
+            continue
+        try:
+            PeekTokenLexer(''.join(current[:start]) + new_text + ''.join(current[end:]))
+        except LexError:  # 编辑后有词法错误
+            continue
+        check_edit(lexer, start, end, new_text)
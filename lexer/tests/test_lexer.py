@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from lexer import Lexer, lf_lines, tokens
+from lexer import Lexer, LexError, PeekTokenLexer, lf_lines, tokens
 import logging
 
 
@@ -40,6 +40,55 @@ b
      ''')
 
 
+def test_no_recursion():
+    text = 'a = (\n' + '\n' * 5000 + '1)\n' + '\\\n' * 5000 + 'b\n'
+    types = [token.type for token in PeekTokenLexer(text).token_stream]
+    assert types == [tokens.ID, '=', '(', tokens.NUMBER, ')', tokens.NEWLINE, tokens.ID, tokens.NEWLINE,
+                     tokens.ENDMARKER]
+
+
+def test_comment_in_brackets():
+    types = [token.type for token in PeekTokenLexer('a = [1,  # one\n     2]\n').token_stream]
+    assert types == [tokens.ID, '=', '[', tokens.NUMBER, ',', tokens.NUMBER, ']', tokens.NEWLINE, tokens.ENDMARKER]
+
+
+def test_invalid_char():
+    try:
+        PeekTokenLexer('a = $\n')
+    except LexError as e:
+        assert (e.line, e.column, e.message) == (0, 4, 'invalid char')
+    else:
+        assert False
+
+
+def test_recover():
+    lexer = PeekTokenLexer('a = $ b\nif (c:\n    d = 1)\ne = "f\ng = 2\n', recover=True)
+    assert [(e.line, e.column) for e in lexer.errors] == [(0, 4), (3, 4)]
+    assert [token.type for token in lexer.token_stream][:3] == [tokens.ID, '=', 'if']
+    assert lexer.token_stream[-2].line == 4
+
+
+def test_reserved_keyword():
+    for text, column in (('async = 1\n', 0), ('a = await\n', 4)):
+        try:
+            PeekTokenLexer(text)
+        except LexError as e:
+            assert (e.line, e.column) == (0, column) and e.message.startswith('keyword')
+        else:
+            assert False
+    lexer = PeekTokenLexer('async = 1\nb = 2\n', recover=True)
+    assert [(e.line, e.column) for e in lexer.errors] == [(0, 0)]
+    assert [token.type for token in lexer.token_stream][:4] == [tokens.ID, '=', tokens.NUMBER, tokens.NEWLINE]
+
+
+def test_recover_brackets():
+    # 出错的行中未闭合的括号不影响之后的行
+    lexer = PeekTokenLexer('a = (1 $\nb = 2\nc = 3\n', recover=True)
+    assert [(e.line, e.column) for e in lexer.errors] == [(0, 7)]
+    assert [(token.type, token.line) for token in lexer.token_stream if token.type == tokens.NEWLINE] == \
+        [(tokens.NEWLINE, 1), (tokens.NEWLINE, 2)]
+
+
 file = r'C:\Users\22340\PycharmProjects\robin\lexer\_lexer.py'
 
 
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from lexer import LexError, PeekTokenLexer
+from lexer.line_index import LineIndex
+
+text = 'ab\n\n\tc = 1\nd\n'
+
+
+def test_position():
+    index = LineIndex.from_text(text)
+    for offset in range(len(text)):
+        line, column = index.position(offset)
+        assert index.offset(line, column) == offset
+        assert text.split('\n')[line][column:column + 1] == (text[offset] if text[offset] != '\n' else '')
+    assert index.position(3) == (1, 0)
+    assert index.position(len(text)) == (4, 0)
+
+
+def test_visual_column():
+    index = LineIndex.from_text(text)
+    assert index.visual_column(text, text.index('c'), tabsize=8) == 8
+    assert index.visual_column(text, text.index('='), tabsize=4) == 6
+
+
+def test_error_caret():
+    try:
+        PeekTokenLexer('\tif $\n')
+    except LexError as e:
+        assert e.column == 4
+        assert e.format(tabsize=8).splitlines()[1:3] == ['        if $', ' ' * 11 + '^']
+    else:
+        assert False
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+from lexer import PeekTokenLexer, RegexLexer, LexError
+from lexer.parallel import parallel_tokens, split_lines
+from lexer._lexer import lf_lines
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+text = '''class A:
+    def f(self):
+        return 1
+s = """
+not a statement
+"""
+x = [1,
+2]
+def g():
+    if x:
+        y = 2
+# comment
+z = 3 + \\
+4
+'''
+
+
+def test_split_lines():
+    assert split_lines(lf_lines(text), 0) == [0, 3, 4, 5, 6, 7, 8, 12]  # 4 5在字符串中 7在括号中
+
+
+def test_same_as_peek_token_lexer():
+    assert parallel_tokens(text, jobs=2, chunk_size=0) == PeekTokenLexer(text).token_stream
+    source = open(os.path.join(root, 'lexer', '_lexer.py'), encoding='utf-8').read()
+    for engine in (None, RegexLexer):
+        expected = PeekTokenLexer(source, engine=engine).token_stream
+        assert parallel_tokens(source, jobs=2, engine=engine, chunk_size=2000) == expected
+
+
+def test_error_line():
+    try:
+        parallel_tokens(text + 'w = $\n', jobs=2, chunk_size=0)
+    except LexError as e:
+        assert (e.line, e.column) == (14, 4)
+    else:
+        assert False
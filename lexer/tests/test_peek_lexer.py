@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+from lexer import PeekTokenLexer, tokens
+from lexer._lexer import iter_lf_lines, lf_lines
+
+source = os.path.join(os.path.dirname(os.path.dirname(__file__)), '_lexer.py')
+
+
+def lazy_tokens(text):
+    lexer = PeekTokenLexer(text, lazy=True)
+    result = []
+    peek = lexer.peek_token(1)
+    while peek.type != tokens.ENDMARKER:
+        assert lexer.peek_token(2) is not None
+        token = lexer.next_token()
+        assert token == peek == lexer.peek_token(0)
+        result.append(token)
+        peek = lexer.peek_token(1)
+    result.append(lexer.next_token())
+    return result
+
+
+def test_iter_lf_lines():
+    for text in ('a\n    b\nc\rd\r\ne', 'a\n\n', '\x0cx\u2028y', ''):
+        assert list(iter_lf_lines(text)) == lf_lines(text)
+
+
+def test_lazy_same_as_eager():
+    text = open(source, encoding='utf-8').read()
+    assert lazy_tokens(text) == PeekTokenLexer(text).token_stream
+
+
+def test_lazy_dedent():
+    text = 'if a:\n    if b:\n        c\nd\n'
+    stream = lazy_tokens(text)
+    assert stream == PeekTokenLexer(text).token_stream
+    assert [token.type for token in stream].count(tokens.DEDENT) == 2
+
+
+def test_lazy_lookahead():
+    lexer = PeekTokenLexer('a b c d\n', lazy=True, lookahead=2)
+    assert lexer.peek_token(2).value == 'b'
+    assert len(lexer.buffer) == 2
+    try:
+        lexer.peek_token(3)
+    except IndexError:
+        pass
+    else:
+        assert False
+    assert lexer.lexer.context.lines is None
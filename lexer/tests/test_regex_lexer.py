@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import glob
+from lexer import Lexer, LexError, PeekTokenLexer, RegexLexer, tokens
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+cases = [
+    '',
+    'if a:\n    b\n',
+    'if a:\n    b\n\n',
+    'if a:\n    b\n    # c\n',
+    'if a:\n\tif b:\n\t\tc = (1,\n  2)\n  # x\n\n\td\ne\n',
+    'x = 1 + \\\n    2\ny = [1,\n\n 2]\nif x:\n  z = 0x1f + 0o17 + 0b101 + 1.5e-3j + .5 + 10. + 0e0\n',
+    'a = b"abc" + rb"x\\n" + Rb"y" + f"{a}" + u"q" + "a\\\nb"\n# c \\\nd\n',
+    'if a:\n    if b:\n        c\n  d\ne\n',
+    'a \xa0= 1\n \xa0b\n',
+    '\n\n# only comment\n   \n',
+    'def f(a, b=2, *c, **d) -> int:\n    return a ** 2 // 3 << 1 >> 2 & 4 | 5 ^ ~6 % 7 != 8\n',
+    'x\r\ny\r\n',
+    "a = '''x'y''z\\'''\n  ''' + \"\"\"\n\"\"\" + '' + 'a\\'b'\n",
+    'a = b\"\"\"\n\\\"\"\"\"\"\" + rb"\\\\"\n',
+    'a = 00 + 0e0 + 0.0j + 09.5 + 1_0 + 0xfj + 1..2\n',
+]
+
+
+def get_tokens(engine, text):
+    return read_all(engine(text))
+
+
+def read_all(lexer):
+    result = [lexer.get_token()]
+    while result[-1].type != tokens.ENDMARKER:
+        result.append(lexer.get_token())
+    return result
+
+
+def tokens_or_error(engine, text):
+    try:
+        return get_tokens(engine, text)
+    except LexError as e:  # 未实现的关键字
+        return str(e)
+
+
+def test_same_tokens():
+    for text in cases:
+        assert get_tokens(RegexLexer, text) == get_tokens(Lexer, text), text
+
+
+def test_same_tokens_file():
+    for path in glob.glob(os.path.join(root, '**', '*.py'), recursive=True):
+        text = open(path, encoding='utf-8').read()
+        assert tokens_or_error(RegexLexer, text) == tokens_or_error(Lexer, text), path
+
+
+def test_peek_token_lexer():
+    text = cases[3]
+    assert PeekTokenLexer(text, engine=RegexLexer).token_stream == PeekTokenLexer(text).token_stream
+
+
+def test_triple_quoted():
+    for engine in (Lexer, RegexLexer):
+        string = get_tokens(engine, 'a = """x"y""z"""\n')[2]
+        assert string == tokens.Token(tokens.STRING, '"""x"y""z"""', 0, 16)
+
+
+error_cases = [
+    'a = $ b\nif (c:\n    d = 1)\ne = "f\ng = 2\n',
+    'x = b"\xe9" + b"""\n\xe9""" + 1\ny\n',
+    'a = (1]\nb = 2 \\ c\n  c\n',
+    'if a:\n    $\nb\n    ?\n',
+    'a = """abc\n  d\n',
+    "a = '''\n",
+    'a\n$',
+    'async = 1\nb = (2 $\nc = 3\n',
+    'a = 0123\nb = 1e\nc = 0x\nd = 1e+ 2\ne = 00 + 0.e1j\n',  # 数字停在非终态
+]
+
+
+def test_recover():
+    for text in error_cases:
+        streams = []
+        for engine in (Lexer, RegexLexer):
+            lexer = engine(text, recover=True)
+            streams.append((read_all(lexer), [(e.line, e.column, e.message) for e in lexer.errors]))
+        assert streams[0] == streams[1], text
+        assert streams[0][1], text
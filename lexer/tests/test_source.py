@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import codecs
+import os
+import tempfile
+from lexer import PeekTokenLexer, lf_lines
+from lexer.source import SourceFile
+
+
+def write_temp(data):
+    fd, path = tempfile.mkstemp(suffix='.py')
+    with os.fdopen(fd, 'wb') as file:
+        file.write(data)
+    return path
+
+
+def check_source(data, text, chunk_size=None):
+    path = write_temp(data)
+    try:
+        with SourceFile(path) as source:
+            if chunk_size:
+                source.chunk_size = chunk_size
+            lines = list(source.lines())
+            assert lines == lf_lines(text)
+            assert list(source.line_offsets) == [sum(map(len, lines[:i])) for i in range(len(lines))]
+            return source.encoding
+    finally:
+        os.remove(path)
+
+
+def test_utf8():
+    text = 'a = "中文"\r\nb = 1\rc\n\n'
+    assert check_source(text.encode('utf-8'), text) == 'utf-8'
+
+
+def test_bom():
+    text = 'a = "é"\n'
+    assert check_source(codecs.BOM_UTF8 + text.encode('utf-8'), text) == 'utf-8-sig'
+
+
+def test_coding_cookie():
+    text = '#!/usr/bin/env python3\n# -*- coding: latin-1 -*-\na = "é"\n'
+    assert check_source(text.encode('latin-1'), text) == 'iso-8859-1'
+
+
+def test_chunk_boundary():
+    text = ''.join('x%d = "中"\r\n' % i for i in range(50))
+    for chunk_size in (1, 2, 3, 7, 10):
+        check_source(text.encode('utf-8'), text, chunk_size)
+
+
+def test_empty():
+    check_source(b'', '')
+
+
+def test_lazy_lexer():
+    text = 'if a:\r\n    b = "中"\r\nc\r\n'
+    path = write_temp(text.encode('utf-8'))
+    try:
+        stream = PeekTokenLexer(SourceFile(path)).token_stream
+        assert stream == PeekTokenLexer(text).token_stream
+        lexer = PeekTokenLexer(SourceFile(path), lazy=True)
+        assert [lexer.next_token() for _ in stream] == stream
+    finally:
+        os.remove(path)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+from lexer import PeekTokenLexer, RegexLexer, tokens
+from lexer.tokens import KIND
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+files = [os.path.join(root, 'lexer', '_lexer.py'), os.path.join(root, 'robin', 'parser.py')]
+
+
+def test_same_as_token_stream():
+    for file in files:
+        text = open(file, encoding='utf-8').read()
+        for engine in (None, RegexLexer):
+            stream = PeekTokenLexer(text, engine=engine).token_stream
+            buffer = PeekTokenLexer(text, engine=engine, compact=True).token_stream
+            assert len(buffer) == len(stream)
+            assert list(buffer) == stream
+            assert buffer[-1] == stream[-1]
+            assert buffer[10:20] == stream[10:20] and buffer[-3:] == stream[-3:] and buffer[::50] == stream[::50]
+
+
+def test_offsets():
+    text = 'def f(a):\n    return a ** 2  # x\ns = b"""\n"""\n'
+    buffer = PeekTokenLexer(text, compact=True).token_stream
+    for index, token in enumerate(buffer):
+        source = text[buffer.starts[index]:buffer.ends[index]]
+        if token.type in (tokens.ID, tokens.NUMBER, tokens.STRING, tokens.BYTES):
+            assert source == token.value
+        elif token.type in (tokens.NEWLINE, tokens.INDENT, tokens.DEDENT, tokens.ENDMARKER):
+            assert source == ''
+        else:
+            assert source == token.type
+        assert buffer.kinds[index] == KIND[token.type]
+
+
+def test_compact():
+    text = open(files[0], encoding='utf-8').read()
+    buffer = PeekTokenLexer(text, compact=True).token_stream
+    assert buffer.nbytes() == 9 * len(buffer)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式token存储: 每个token只占几个array中的整数, value在需要时才从源文本切片
+"""
+from array import array
+from lexer import tokens
+from lexer.tokens import Token, KIND, kinds
+from lexer.line_index import LineIndex
+
+# value为源文本切片的种类
+_sliced = frozenset(KIND[type] for type in (tokens.ID, tokens.NUMBER, tokens.STRING, tokens.BYTES))
+# 没有宽度的种类
+_empty = frozenset(KIND[type] for type in (tokens.ENDMARKER, tokens.NEWLINE, tokens.INDENT, tokens.DEDENT))
+_indent = KIND[tokens.INDENT]
+
+
+def span(kind, token, end):
+    """:return token在源文本中的开始偏移, end为结束偏移"""
+    if kind in _sliced:
+        return end - len(token.value)
+    if kind in _empty:
+        return end
+    return end - len(token.type)  # 关键字 运算符 分隔符
+
+
+class TokenBuffer(object):
+    """
+    与PeekTokenLexer.token_stream相同的序列, 下标访问时生成Token
+    kinds: tokens.KIND中的整数; starts ends: token在text中的偏移, Token的line column由line_index从ends得到
+    """
+    __slots__ = ('text', 'line_index', 'kinds', 'starts', 'ends', 'indents')
+
+    def __init__(self, text):
+        """:param text 换行符已统一为\\n的全文"""
+        self.text = text
+        self.line_index = LineIndex.from_text(text)
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.indents = {}  # INDENT的缩进格数 {index: value}
+
+    def append(self, token):
+        kind = KIND[token.type]
+        end = self.line_index.offset(token.line, token.column)
+        if kind == _indent:
+            self.indents[len(self.kinds)] = token.value
+        self.kinds.append(kind)
+        self.starts.append(span(kind, token, end))
+        self.ends.append(end)
+
+    def value(self, index):
+        kind = self.kinds[index]
+        if kind in _sliced:
+            return self.text[self.starts[index]:self.ends[index]]
+        return self.indents.get(index % len(self.kinds))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):  # 与list相同 返回Token的list
+            return [self[i] for i in range(*index.indices(len(self.kinds)))]
+        line, column = self.line_index.position(self.ends[index])
+        return Token(kinds[self.kinds[index]], self.value(index), line, column)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
+
+    def nbytes(self):
+        """各列占用的字节数, 不含text"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.kinds, self.starts, self.ends))
@@ -55,14 +55,18 @@ break      except     in         raise
 '''.split())
 
 
+# Python的关键字中还未实现的, 不能作为标识符
+reserved = frozenset(keyword.kwlist) - keywords
+
+
 def iskeyword(string):
-    """用于标识符和关键字的判断"""
-    if string in keywords:
-        return True
-    if string in keyword.kwlist:
-        # todo 是否需要行列号
-        raise KeyError(f"'{string}'关键字未实现")
-    return False
+    """用于标识符和关键字的判断, 未实现的关键字见reserved"""
+    return string in keywords
 
 
 Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
+
+# TokenBuffer中使用的整数种类, kinds[kind] == type
+kinds = (ENDMARKER, NEWLINE, INDENT, DEDENT, ID, NUMBER, STRING, BYTES) \
+        + tuple(sorted(keywords)) + tuple(sorted(operator | delimiter))
+KIND = {type: kind for kind, type in enumerate(kinds)}
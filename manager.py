@@ -1,84 +1,206 @@
 #!/usr/bin/env python3
 
 import os
-import logging
+import sys
 import click
 
 from robin import settings
-from robin.interpreter import *
-from lexer import PeekTokenLexer
-from lexer import tokens
 
 __author__ = 'Aollio Hou'
 __email__ = 'aollio@outlook.com'
 
+# 启动时只导入click和settings, 其余模块在子命令中才导入
+# 旧代码从manager导入的名称, 首次访问时从robin.files导入
+_files_names = ('FileLexer', 'FileParser', 'FileInterpreter', 'FileResult', 'lex_file', 'parse_file')
+
+
+def __getattr__(name):
+    if name in _files_names:
+        from robin import files
+        return getattr(files, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def collect_files(pattern):
+    """目录(递归查找*.py) 或 glob模式 或 单个文件"""
+    import glob
+    if os.path.isdir(pattern):
+        return sorted(glob.glob(os.path.join(pattern, '**', '*.py'), recursive=True))
+    if glob.has_magic(pattern):
+        return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return [pattern]
+
+
+def run_batch(worker, files, engine, jobs):
+    """用jobs个进程处理files, 输出出错的文件和总吞吐量"""
+    if not files:
+        print('No files found.')
+        return
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    jobs = jobs or os.cpu_count()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunksize = max(1, len(files) // (jobs * 4))
+        results = list(executor.map(worker, files, [engine] * len(files), chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if result.error]
+    for result in failed:
+        print(f'{result.path}: {result.error}')
+    size = sum(result.size for result in results)
+    count = sum(result.tokens for result in results)
+    nodes = sum(result.nodes for result in results)
+    print(f'{len(results)} files, {len(failed)} failed, {size / 1e6:.2f} MB, {count} tokens, {nodes} nodes '
+          f'in {elapsed:.2f}s')
+    print(f'{len(results) / elapsed:.1f} files/s, {size / 1e6 / elapsed:.2f} MB/s, {count / elapsed:.0f} tokens/s')
+
+
+def is_batch(path):
+    import glob
+    return os.path.isdir(path) or glob.has_magic(path)
+
+
+def reject_batch_options(**options):
+    """批量模式总是按需读取token 只输出计数, 给出这些选项时报错而不是忽略"""
+    given = [name for name, value in options.items() if value]
+    if given:
+        raise click.UsageError(f'{", ".join(given)} cannot be used with a directory or glob')
 
-class FileLexer(PeekTokenLexer):
-    def __init__(self, file):
-        text = open(file=file, encoding='utf-8').read()
-        super().__init__(text)
 
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
-class FileParser(Parser):
-    def __init__(self, file):
-        super().__init__(FileLexer(file))
 
+@click.group(context_settings=CONTEXT_SETTINGS)
+@click.pass_context
+def cli(ctx):
+    if settings.DEBUG:
+        start_trace(ctx)
 
-class FileInterpreter(Interpreter):
-    def __init__(self, file):
-        super().__init__(FileParser(file).parse())
 
+def start_trace(ctx):
+    """Trace log_def methods for this run, print the trace to stderr at exit; once for -d and --trace."""
+    from robin import util
+    if util.enable_trace():
+        ctx.call_on_close(lambda: print(util.format_trace(), file=sys.stderr))
 
-CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
+# lexer.ENGINES的键 与export.FORMATS, 写在这里以免定义选项时导入lexer; robin/tests/test_manager.py检查两者一致
+ENGINE_NAMES = ('regex', 'scanner')
+EXPORT_FORMATS = ('jsonl', 'binary')
 
-@click.group(context_settings=CONTEXT_SETTINGS)
-def cli():
-    pass
+engine_option = click.option('-e', '--engine', type=click.Choice(ENGINE_NAMES), default='scanner',
+                             help='The lexer engine. regex decodes the whole file into memory first.')
+jobs_option = click.option('-j', '--jobs', type=int, default=None,
+                           help='Worker processes for a directory or glob. Default: number of CPUs.')
 
 
-def set_debug(ctx, param, debug):
-    if debug:
-        logging.basicConfig(level=logging.DEBUG)
-    else:
-        logging.basicConfig(level=logging.WARNING)
+def set_trace(ctx, param, trace):
+    if trace:
+        start_trace(ctx.find_root())
+
+
+trace_option = click.option('--trace', is_flag=True, callback=set_trace, expose_value=False, is_eager=True,
+                            help='Record lexer and parser calls and print them at exit.')
+debug_option = click.option('-d', '--debug', is_flag=True, callback=set_trace, expose_value=False, is_eager=True,
+                            help='Show the debug message, the same trace as --trace.')
 
 
 @cli.command(help='Run Python files.')
 @click.argument('file')
-@click.option('-d', '--debug', is_flag=True, callback=set_debug,
-              expose_value=False, is_eager=True, help='Show the debug message.')
-def run(file):
-    interpreter = FileInterpreter(file=file)
+@debug_option
+@trace_option
+@engine_option
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse the parsed tree of an unchanged file from ROBIN_CACHE_DIR (default ~/.cache/robin). '
+                   'Off by default, nothing is written.')
+@click.option('--stream', is_flag=True,
+              help='Run each top-level statement as soon as it is parsed. '
+                   'Statements before a syntax error have already run. Implies --no-cache.')
+@click.option('--lazy-functions', is_flag=True,
+              help='Parse a function body only when the function is first called. '
+                   'Syntax errors in functions never called are not reported. Implies --no-cache.')
+def run(file, engine, cache, stream, lazy_functions):
+    if stream and lazy_functions:  # 跳过函数体需要全部token, --stream按需读取
+        raise click.UsageError('--stream cannot be used with --lazy-functions')
+    from robin.files import FileInterpreter
+    interpreter = FileInterpreter(file=file, engine=engine, cache=cache, stream=stream,
+                                  lazy_functions=lazy_functions)
     interpreter.intreperter()
 
 
-@cli.command(help='Using lexer parse Python file to Tokens')
+@cli.command(help='Using lexer parse Python file to Tokens. '
+                  'FILE may be a directory or a glob, then only counts are printed.')
 @click.argument('file')
-@click.option('-d', '--debug', is_flag=True, callback=set_debug,
-              expose_value=False, is_eager=True, help='Show the debug message.')
-def lexer(file):
-    a_lexer = FileLexer(file)
-    token = a_lexer.next_token()
-
-    while token is not None and token.type != tokens.ENDMARKER:
-        token = a_lexer.next_token()
-        print(token)
-    print(token)
+@debug_option
+@trace_option
+@click.option('--lazy', is_flag=True, help='Lex on demand with a bounded lookahead buffer.')
+@click.option('--split', is_flag=True, help='Lex one large file in parallel, split at top-level statements.')
+@click.option('-f', '--format', 'output_format', type=click.Choice(('repr',) + EXPORT_FORMATS), default='repr',
+              help='Token output format. jsonl and binary are streamed while lexing.')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), default=None,
+              help='Write the tokens to this file instead of stdout.')
+@engine_option
+@jobs_option
+def lexer(file, lazy, split, output_format, output, engine, jobs):
+    if is_batch(file):
+        reject_batch_options(**{'--lazy': lazy, '--split': split, '--format': output_format != 'repr',
+                                '--output': output})
+        from robin.files import lex_file
+        run_batch(lex_file, collect_files(file), engine, jobs)
+        return
+    from lexer import export
+    if split:
+        from lexer import ENGINES
+        from lexer.source import SourceFile
+        from lexer.parallel import ParallelLexer
+        source = SourceFile(file)
+        a_lexer = ParallelLexer(source, jobs=jobs, engine=ENGINES[engine])
+    else:
+        from robin.files import FileLexer
+        lazy = lazy or output_format != 'repr'
+        a_lexer = FileLexer(file, lazy=lazy, engine=engine, compact=not lazy)  # 全部token列式存储
+        source = a_lexer.source
+
+    with source:  # 出错时也关闭源文件
+        if output_format == 'repr':
+            for token in export.iter_tokens(a_lexer):
+                print(token)
+            return
+        out = open(output, 'wb') if output else sys.stdout.buffer
+        try:
+            if output_format == 'jsonl':
+                export.write_jsonl(export.iter_tokens(a_lexer), out)
+            else:
+                export.write_binary(export.iter_tokens(a_lexer), source.line_index(), out)
+        finally:
+            if output:
+                out.close()
 
 
-@cli.command(help='Using parser parse Python file to AST')
+@cli.command(help='Using parser parse Python file to AST. '
+                  'FILE may be a directory or a glob, then only counts are printed.')
 @click.argument('file')
-@click.option('-d', '--debug', is_flag=True, callback=set_debug,
-              expose_value=False, is_eager=True, help='Show the debug message.')
-def parser(file):
-    a_parser = FileParser(file)
+@debug_option
+@trace_option
+@engine_option
+@jobs_option
+def parser(file, engine, jobs):
+    if is_batch(file):
+        from robin.files import parse_file
+        run_batch(parse_file, collect_files(file), engine, jobs)
+        return
+    from robin.files import FileParser
+    a_parser = FileParser(file, engine=engine)
     root = a_parser.parse()
     print('>' * 10, root)
 
 
 @cli.command(help='Test python source.')
 def test_pysrc():
+    import logging
+    from robin.files import FileInterpreter
+    settings.configure_logging()
     dir = settings.TESTS_PY_SOURCE
     for each_file in os.listdir(dir):
         path = os.path.join(dir, each_file)
@@ -112,7 +234,12 @@ def test():
 
 
 def _main():
-    cli()
+    from lexer.errors import LexError
+    try:
+        cli()
+    except LexError as e:
+        click.echo(e.format(), err=True)
+        exit(1)
 
 
 if __name__ == '__main__':
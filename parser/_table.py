@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# 由 parser/grammar.py 根据 Grammar1.md 生成, 不要手动修改: python -m parser.grammar
+
+FIRST = {
+    'single_input': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def', 'del', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'file_input': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def', 'del', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'simple_stmt': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'assert', 'await', 'break', 'continue', 'del', 'from', 'global', 'id', 'import', 'lambda', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'yield', '{', '~'}),
+    'small_stmt': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'assert', 'await', 'break', 'continue', 'del', 'from', 'global', 'id', 'import', 'lambda', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'yield', '{', '~'}),
+    'expr_stmt': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'testlist_star_expr': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'annassign': frozenset({':'}),
+    'augassign': frozenset({'%=', '&=', '**=', '*=', '+=', '-=', '//=', '/=', '<<=', '>>=', '@=', '^=', '|='}),
+    'yield_expr': frozenset({'yield'}),
+    'yield_arg': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'from', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'del_stmt': frozenset({'del'}),
+    'pass_stmt': frozenset({'pass'}),
+    'flow_stmt': frozenset({'break', 'continue', 'raise', 'return', 'yield'}),
+    'break_stmt': frozenset({'break'}),
+    'continue_stmt': frozenset({'continue'}),
+    'return_stmt': frozenset({'return'}),
+    'raise_stmt': frozenset({'raise'}),
+    'yield_stmt': frozenset({'yield'}),
+    'import_stmt': frozenset({'from', 'import'}),
+    'import_name': frozenset({'import'}),
+    'dotted_as_names': frozenset({'id'}),
+    'dotted_as_name': frozenset({'id'}),
+    'import_from': frozenset({'from'}),
+    'dotted_name': frozenset({'id'}),
+    'import_as_names': frozenset({'id'}),
+    'import_as_name': frozenset({'id'}),
+    'global_stmt': frozenset({'global'}),
+    'nonlocal_stmt': frozenset({'nonlocal'}),
+    'assert_stmt': frozenset({'assert'}),
+    'compound_stmt': frozenset({'@', 'async', 'class', 'def', 'for', 'if', 'try', 'while', 'with'}),
+    'if_stmt': frozenset({'if'}),
+    'test': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'or_test': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'not', 'number', 'string', '{', '~'}),
+    'and_test': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'not', 'number', 'string', '{', '~'}),
+    'not_test': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'not', 'number', 'string', '{', '~'}),
+    'comparison': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'comp_op': frozenset({'!=', '<', '<=', '<>', '==', '>', '>=', 'in', 'is', 'not'}),
+    'lambdef': frozenset({'lambda'}),
+    'varargslist': frozenset({'*', '**', 'id'}),
+    'vfpdef': frozenset({'id'}),
+    'suite': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'assert', 'await', 'break', 'continue', 'del', 'from', 'global', 'id', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'yield', '{', '~'}),
+    'while_stmt': frozenset({'while'}),
+    'for_stmt': frozenset({'for'}),
+    'exprlist': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'expr': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'xor_expr': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'and_expr': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'shift_expr': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'arith_expr': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'term': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'factor': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'power': frozenset({'(', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{'}),
+    'atom_expr': frozenset({'(', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{'}),
+    'atom': frozenset({'(', '...', 'False', 'None', 'True', '[', 'id', 'number', 'string', '{'}),
+    'testlist_comp': frozenset({'(', '*', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'dictorsetmaker': frozenset({'(', '*', '**', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'trailer': frozenset({'(', '.', '['}),
+    'subscriptlist': frozenset({'(', '+', '-', '...', ':', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'subscript': frozenset({'(', '+', '-', '...', ':', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'sliceop': frozenset({':'}),
+    'star_expr': frozenset({'*'}),
+    'testlist': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'try_stmt': frozenset({'try'}),
+    'except_clause': frozenset({'except'}),
+    'with_stmt': frozenset({'with'}),
+    'with_item': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'funcdef': frozenset({'def'}),
+    'parameters': frozenset({'('}),
+    'typedargslist': frozenset({'*', '**', 'id'}),
+    'tfpdef': frozenset({'id'}),
+    'classdef': frozenset({'class'}),
+    'arglist': frozenset({'(', '*', '**', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'argument': frozenset({'(', '*', '**', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'comp_for': frozenset({'async', 'for'}),
+    'comp_iter': frozenset({'async', 'for', 'if'}),
+    'comp_if': frozenset({'if'}),
+    'test_nocond': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'lambdef_nocond': frozenset({'lambda'}),
+    'decorated': frozenset({'@'}),
+    'decorators': frozenset({'@'}),
+    'decorator': frozenset({'@'}),
+    'async_funcdef': frozenset({'async'}),
+    'async_stmt': frozenset({'async'}),
+    'encoding_decl': frozenset({'id'}),
+}
+
+NULLABLE = frozenset({})
+
+FOLLOW = {
+    'single_input': frozenset({}),
+    'file_input': frozenset({}),
+    'stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'simple_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'elif', 'else', 'endmarker', 'except', 'finally', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'small_stmt': frozenset({';', 'newline'}),
+    'expr_stmt': frozenset({';', 'newline'}),
+    'testlist_star_expr': frozenset({'%=', '&=', '**=', '*=', '+=', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', '^=', 'newline', '|='}),
+    'annassign': frozenset({';', 'newline'}),
+    'augassign': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', 'yield', '{', '~'}),
+    'yield_expr': frozenset({')', ';', '=', 'newline'}),
+    'yield_arg': frozenset({')', ';', '=', 'newline'}),
+    'del_stmt': frozenset({';', 'newline'}),
+    'pass_stmt': frozenset({';', 'newline'}),
+    'flow_stmt': frozenset({';', 'newline'}),
+    'break_stmt': frozenset({';', 'newline'}),
+    'continue_stmt': frozenset({';', 'newline'}),
+    'return_stmt': frozenset({';', 'newline'}),
+    'raise_stmt': frozenset({';', 'newline'}),
+    'yield_stmt': frozenset({';', 'newline'}),
+    'import_stmt': frozenset({';', 'newline'}),
+    'import_name': frozenset({';', 'newline'}),
+    'dotted_as_names': frozenset({';', 'newline'}),
+    'dotted_as_name': frozenset({',', ';', 'newline'}),
+    'import_from': frozenset({';', 'newline'}),
+    'dotted_name': frozenset({'(', ',', ';', 'as', 'import', 'newline'}),
+    'import_as_names': frozenset({')', ';', 'newline'}),
+    'import_as_name': frozenset({')', ',', ';', 'newline'}),
+    'global_stmt': frozenset({';', 'newline'}),
+    'nonlocal_stmt': frozenset({';', 'newline'}),
+    'assert_stmt': frozenset({';', 'newline'}),
+    'compound_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'if_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'test': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'as', 'async', 'for', 'from', 'newline', '|=', '}'}),
+    'or_test': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'as', 'async', 'else', 'for', 'from', 'if', 'newline', '|=', '}'}),
+    'and_test': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'as', 'async', 'else', 'for', 'from', 'if', 'newline', 'or', '|=', '}'}),
+    'not_test': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'newline', 'or', '|=', '}'}),
+    'comparison': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'newline', 'or', '|=', '}'}),
+    'comp_op': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'number', 'string', '{', '~'}),
+    'lambdef': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'as', 'async', 'for', 'from', 'newline', '|=', '}'}),
+    'varargslist': frozenset({':'}),
+    'vfpdef': frozenset({',', ':', '='}),
+    'suite': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'elif', 'else', 'endmarker', 'except', 'finally', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'while_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'for_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'exprlist': frozenset({';', 'in', 'newline'}),
+    'expr': frozenset({'!=', '%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>=', '@=', ']', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|=', '}'}),
+    'xor_expr': frozenset({'!=', '%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>=', '@=', ']', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'and_expr': frozenset({'!=', '%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>=', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'shift_expr': frozenset({'!=', '%=', '&', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>=', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'arith_expr': frozenset({'!=', '%=', '&', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'term': frozenset({'!=', '%=', '&', '&=', ')', '**=', '*=', '+', '+=', ',', '-', '-=', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'factor': frozenset({'!=', '%', '%=', '&', '&=', ')', '*', '**=', '*=', '+', '+=', ',', '-', '-=', '/', '//', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'power': frozenset({'!=', '%', '%=', '&', '&=', ')', '*', '**=', '*=', '+', '+=', ',', '-', '-=', '/', '//', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'atom_expr': frozenset({'!=', '%', '%=', '&', '&=', ')', '*', '**', '**=', '*=', '+', '+=', ',', '-', '-=', '/', '//', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@', '@=', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'atom': frozenset({'!=', '%', '%=', '&', '&=', '(', ')', '*', '**', '**=', '*=', '+', '+=', ',', '-', '-=', '.', '/', '//', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@', '@=', '[', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'testlist_comp': frozenset({')', ']'}),
+    'dictorsetmaker': frozenset({'}'}),
+    'trailer': frozenset({'!=', '%', '%=', '&', '&=', '(', ')', '*', '**', '**=', '*=', '+', '+=', ',', '-', '-=', '.', '/', '//', '//=', '/=', ':', ';', '<', '<<', '<<=', '<=', '<>', '=', '==', '>', '>=', '>>', '>>=', '@', '@=', '[', ']', '^', '^=', 'and', 'as', 'async', 'else', 'for', 'from', 'if', 'in', 'is', 'newline', 'not', 'or', '|', '|=', '}'}),
+    'subscriptlist': frozenset({']'}),
+    'subscript': frozenset({',', ']'}),
+    'sliceop': frozenset({',', ']'}),
+    'star_expr': frozenset({'%=', '&=', ')', '**=', '*=', '+=', ',', '-=', '//=', '/=', ':', ';', '<<=', '=', '>>=', '@=', ']', '^=', 'async', 'for', 'in', 'newline', '|=', '}'}),
+    'testlist': frozenset({')', ':', ';', '=', 'newline'}),
+    'try_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'except_clause': frozenset({':'}),
+    'with_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'with_item': frozenset({',', ':'}),
+    'funcdef': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'parameters': frozenset({'->', ':'}),
+    'typedargslist': frozenset({')'}),
+    'tfpdef': frozenset({')', ',', '='}),
+    'classdef': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'arglist': frozenset({')'}),
+    'argument': frozenset({')', ','}),
+    'comp_for': frozenset({')', ',', ']', '}'}),
+    'comp_iter': frozenset({')', ',', ']', '}'}),
+    'comp_if': frozenset({')', ',', ']', '}'}),
+    'test_nocond': frozenset({')', ',', ']', 'async', 'for', 'if', '}'}),
+    'lambdef_nocond': frozenset({')', ',', ']', 'async', 'for', 'if', '}'}),
+    'decorated': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'decorators': frozenset({'async', 'class', 'def'}),
+    'decorator': frozenset({'@', 'async', 'class', 'def'}),
+    'async_funcdef': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'async_stmt': frozenset({'(', '*', '+', '-', '...', '@', 'False', 'None', 'True', '[', 'assert', 'async', 'await', 'break', 'class', 'continue', 'dedent', 'def', 'del', 'endmarker', 'for', 'from', 'global', 'id', 'if', 'import', 'lambda', 'newline', 'nonlocal', 'not', 'number', 'pass', 'raise', 'return', 'string', 'try', 'while', 'with', 'yield', '{', '~'}),
+    'encoding_decl': frozenset({}),
+}
+
+PREDICT = {
+    'single_input': {'(': 'simple_stmt', '*': 'simple_stmt', '+': 'simple_stmt', '-': 'simple_stmt', '...': 'simple_stmt', '@': 2, 'False': 'simple_stmt', 'None': 'simple_stmt', 'True': 'simple_stmt', '[': 'simple_stmt', 'assert': 'simple_stmt', 'async': 2, 'await': 'simple_stmt', 'break': 'simple_stmt', 'class': 2, 'continue': 'simple_stmt', 'def': 2, 'del': 'simple_stmt', 'for': 2, 'from': 'simple_stmt', 'global': 'simple_stmt', 'id': 'simple_stmt', 'if': 2, 'import': 'simple_stmt', 'lambda': 'simple_stmt', 'newline': 0, 'nonlocal': 'simple_stmt', 'not': 'simple_stmt', 'number': 'simple_stmt', 'pass': 'simple_stmt', 'raise': 'simple_stmt', 'return': 'simple_stmt', 'string': 'simple_stmt', 'try': 2, 'while': 2, 'with': 2, 'yield': 'simple_stmt', '{': 'simple_stmt', '~': 'simple_stmt'},
+    'stmt': {'(': 'simple_stmt', '*': 'simple_stmt', '+': 'simple_stmt', '-': 'simple_stmt', '...': 'simple_stmt', '@': 'compound_stmt', 'False': 'simple_stmt', 'None': 'simple_stmt', 'True': 'simple_stmt', '[': 'simple_stmt', 'assert': 'simple_stmt', 'async': 'compound_stmt', 'await': 'simple_stmt', 'break': 'simple_stmt', 'class': 'compound_stmt', 'continue': 'simple_stmt', 'def': 'compound_stmt', 'del': 'simple_stmt', 'for': 'compound_stmt', 'from': 'simple_stmt', 'global': 'simple_stmt', 'id': 'simple_stmt', 'if': 'compound_stmt', 'import': 'simple_stmt', 'lambda': 'simple_stmt', 'nonlocal': 'simple_stmt', 'not': 'simple_stmt', 'number': 'simple_stmt', 'pass': 'simple_stmt', 'raise': 'simple_stmt', 'return': 'simple_stmt', 'string': 'simple_stmt', 'try': 'compound_stmt', 'while': 'compound_stmt', 'with': 'compound_stmt', 'yield': 'simple_stmt', '{': 'simple_stmt', '~': 'simple_stmt'},
+    'small_stmt': {'(': 'expr_stmt', '*': 'expr_stmt', '+': 'expr_stmt', '-': 'expr_stmt', '...': 'expr_stmt', 'False': 'expr_stmt', 'None': 'expr_stmt', 'True': 'expr_stmt', '[': 'expr_stmt', 'assert': 'assert_stmt', 'await': 'expr_stmt', 'break': 'flow_stmt', 'continue': 'flow_stmt', 'del': 'del_stmt', 'from': 'import_stmt', 'global': 'global_stmt', 'id': 'expr_stmt', 'import': 'import_stmt', 'lambda': 'expr_stmt', 'nonlocal': 'nonlocal_stmt', 'not': 'expr_stmt', 'number': 'expr_stmt', 'pass': 'pass_stmt', 'raise': 'flow_stmt', 'return': 'flow_stmt', 'string': 'expr_stmt', 'yield': 'flow_stmt', '{': 'expr_stmt', '~': 'expr_stmt'},
+    'augassign': {'%=': 5, '&=': 6, '**=': 11, '*=': 2, '+=': 0, '-=': 1, '//=': 12, '/=': 4, '<<=': 9, '>>=': 10, '@=': 3, '^=': 8, '|=': 7},
+    'yield_arg': {'(': 'testlist', '+': 'testlist', '-': 'testlist', '...': 'testlist', 'False': 'testlist', 'None': 'testlist', 'True': 'testlist', '[': 'testlist', 'await': 'testlist', 'from': 0, 'id': 'testlist', 'lambda': 'testlist', 'not': 'testlist', 'number': 'testlist', 'string': 'testlist', '{': 'testlist', '~': 'testlist'},
+    'flow_stmt': {'break': 'break_stmt', 'continue': 'continue_stmt', 'raise': 'raise_stmt', 'return': 'return_stmt', 'yield': 'yield_stmt'},
+    'import_stmt': {'from': 'import_from', 'import': 'import_name'},
+    'compound_stmt': {'@': 'decorated', 'async': 'async_stmt', 'class': 'classdef', 'def': 'funcdef', 'for': 'for_stmt', 'if': 'if_stmt', 'try': 'try_stmt', 'while': 'while_stmt', 'with': 'with_stmt'},
+    'test': {'(': 0, '+': 0, '-': 0, '...': 0, 'False': 0, 'None': 0, 'True': 0, '[': 0, 'await': 0, 'id': 0, 'lambda': 'lambdef', 'not': 0, 'number': 0, 'string': 0, '{': 0, '~': 0},
+    'not_test': {'(': 'comparison', '+': 'comparison', '-': 'comparison', '...': 'comparison', 'False': 'comparison', 'None': 'comparison', 'True': 'comparison', '[': 'comparison', 'await': 'comparison', 'id': 'comparison', 'not': 0, 'number': 'comparison', 'string': 'comparison', '{': 'comparison', '~': 'comparison'},
+    'comp_op': {'!=': 6, '<': 0, '<=': 4, '<>': 5, '==': 2, '>': 1, '>=': 3, 'in': 7, 'is': 9, 'not': 8},
+    'varargslist': {'*': 1, '**': 2, 'id': 0},
+    'suite': {'(': 'simple_stmt', '*': 'simple_stmt', '+': 'simple_stmt', '-': 'simple_stmt', '...': 'simple_stmt', 'False': 'simple_stmt', 'None': 'simple_stmt', 'True': 'simple_stmt', '[': 'simple_stmt', 'assert': 'simple_stmt', 'await': 'simple_stmt', 'break': 'simple_stmt', 'continue': 'simple_stmt', 'del': 'simple_stmt', 'from': 'simple_stmt', 'global': 'simple_stmt', 'id': 'simple_stmt', 'import': 'simple_stmt', 'lambda': 'simple_stmt', 'newline': 1, 'nonlocal': 'simple_stmt', 'not': 'simple_stmt', 'number': 'simple_stmt', 'pass': 'simple_stmt', 'raise': 'simple_stmt', 'return': 'simple_stmt', 'string': 'simple_stmt', 'yield': 'simple_stmt', '{': 'simple_stmt', '~': 'simple_stmt'},
+    'factor': {'(': 'power', '+': 0, '-': 0, '...': 'power', 'False': 'power', 'None': 'power', 'True': 'power', '[': 'power', 'await': 'power', 'id': 'power', 'number': 'power', 'string': 'power', '{': 'power', '~': 0},
+    'atom': {'(': 0, '...': 6, 'False': 9, 'None': 7, 'True': 8, '[': 1, 'id': 3, 'number': 4, 'string': 5, '{': 2},
+    'dictorsetmaker': {'(': 0, '*': 1, '**': 0, '+': 0, '-': 0, '...': 0, 'False': 0, 'None': 0, 'True': 0, '[': 0, 'await': 0, 'id': 0, 'lambda': 0, 'not': 0, 'number': 0, 'string': 0, '{': 0, '~': 0},
+    'trailer': {'(': 0, '.': 2, '[': 1},
+    'subscript': {'(': 'test', '+': 'test', '-': 'test', '...': 'test', ':': 1, 'False': 'test', 'None': 'test', 'True': 'test', '[': 'test', 'await': 'test', 'id': 'test', 'lambda': 'test', 'not': 'test', 'number': 'test', 'string': 'test', '{': 'test', '~': 'test'},
+    'typedargslist': {'*': 1, '**': 2, 'id': 0},
+    'argument': {'(': 0, '*': 3, '**': 2, '+': 0, '-': 0, '...': 0, 'False': 0, 'None': 0, 'True': 0, '[': 0, 'await': 0, 'id': 0, 'lambda': 0, 'not': 0, 'number': 0, 'string': 0, '{': 0, '~': 0},
+    'comp_iter': {'async': 'comp_for', 'for': 'comp_for', 'if': 'comp_if'},
+    'test_nocond': {'(': 'or_test', '+': 'or_test', '-': 'or_test', '...': 'or_test', 'False': 'or_test', 'None': 'or_test', 'True': 'or_test', '[': 'or_test', 'await': 'or_test', 'id': 'or_test', 'lambda': 'lambdef_nocond', 'not': 'or_test', 'number': 'or_test', 'string': 'or_test', '{': 'or_test', '~': 'or_test'},
+}
+
+CONFLICTS = {
+    'simple_stmt': frozenset({';'}),
+    'testlist_star_expr': frozenset({','}),
+    'import_from': frozenset({'.', '...'}),
+    'import_as_names': frozenset({','}),
+    'comp_op': frozenset({'is'}),
+    'varargslist': frozenset({','}),
+    'exprlist': frozenset({','}),
+    'testlist_comp': frozenset({','}),
+    'dictorsetmaker': frozenset({'(', '+', ',', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'subscriptlist': frozenset({','}),
+    'subscript': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+    'testlist': frozenset({','}),
+    'typedargslist': frozenset({','}),
+    'arglist': frozenset({','}),
+    'argument': frozenset({'(', '+', '-', '...', 'False', 'None', 'True', '[', 'await', 'id', 'lambda', 'not', 'number', 'string', '{', '~'}),
+}
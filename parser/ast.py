@@ -6,6 +6,7 @@ copy from robin.robin.ast
 """
 from lexer.tokens import Token
 from lexer import tokens
+from robin.constants import decode, formatted
 import json
 
 
@@ -21,14 +22,13 @@ class AST(object):
 class Literals(AST):
     def __init__(self, token: Token):
         self.token = token
-        if token.type == tokens.STRING:
-            # todo  转义
-            pass
-        elif token.type == tokens.BYTES:
-            # todo  解码
-            pass
-        elif token.type == tokens.NUMBER:
-            self.str2num()
+        if token.type == tokens.STRING and formatted(token):
+            self.value = None  # todo f-string 的值在运行时求出
+        elif token.type in (tokens.STRING, tokens.BYTES, tokens.NUMBER):
+            try:
+                self.value = decode(token)
+            except (ValueError, SyntaxError):
+                self.error(f'invalid literal {token.value} at line {token.line}, column {token.column}')
         elif token.type == 'True':
             self.value = True
         elif token.type == 'False':
@@ -38,21 +38,6 @@ class Literals(AST):
         else:
             self.error()
 
-    def str2num(self):
-        string = self.token.value.lower()
-        if string[-1] == 'j':
-            self.value = complex(string)
-        elif 'x' in string:
-            self.value = int(string, base=16)
-        elif 'o' in string:
-            self.value = int(string, base=8)
-        elif 'b' in string:
-            self.value = int(string, base=2)
-        elif 'e' in string or '.' in string:
-            self.value = float(string)
-        else:
-            self.value = int(string)
-
 
 class Op(AST):
     def __init__(self, left: AST, op: Token, right: AST):
@@ -77,6 +62,13 @@ class Var(AST):
         self.value = token.value
 
 
+class Tuple(AST):
+    """`(a, b)`, elements are expressions"""
+
+    def __init__(self, elements: list):
+        self.elements = elements
+
+
 class Suite(AST):
     """
     A code suite.
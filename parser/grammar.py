@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+读取Grammar1.md中的EBNF规则, 计算FIRST FOLLOW集合, 生成LL(1)预测表 parser/_table.py
+
+    python -m parser.grammar
+
+语法改变后重新生成, 分析器只读取生成的表, 不在运行时解析语法文件
+"""
+import os
+import re
+from lexer import tokens
+
+__author__ = 'Aollio Hou'
+__email__ = 'aollio@outlook.com'
+
+GRAMMAR_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Grammar1.md')
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_table.py')
+
+# 语法中大写的终结符 对应的token类型, 其余终结符是引号中的关键字和符号 与token类型相同
+TERMINALS = {
+    'NAME': tokens.ID,
+    'NUMBER': tokens.NUMBER,
+    'STRING': tokens.STRING,
+    'NEWLINE': tokens.NEWLINE,
+    'INDENT': tokens.INDENT,
+    'DEDENT': tokens.DEDENT,
+    'ENDMARKER': tokens.ENDMARKER,
+    # async await 还未实现, 词法分析器报LexError(见tokens.reserved); 实现后与其他关键字相同 token类型就是关键字
+    'ASYNC': 'async',
+    'AWAIT': 'await',
+}
+
+# 语法树的节点: (种类, 内容)
+ALT, SEQ, OPT, STAR, PLUS, RULE, TERM = 'alt', 'seq', 'opt', 'star', 'plus', 'rule', 'term'
+
+rule_pattern = re.compile(r'\s*(\w+):\s(.*)')
+symbol_pattern = re.compile(r"'[^']*'|\w+|[()\[\]|*+]")
+
+
+def read_rules(path=GRAMMAR_FILE):
+    """{规则名: 规则体的文本}, 不以"名字:"开始的非空行接在上一条规则之后"""
+    rules = {}
+    name = None
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            match = rule_pattern.match(line)
+            if match:
+                name, body = match.groups()
+                rules[name] = body
+            elif name is not None and line.strip():
+                rules[name] += ' ' + line.strip()
+    return rules
+
+
+class _Reader:
+    """
+    alt: seq ('|' seq)*
+    seq: item+
+    item: atom ['*' | '+']
+    atom: '(' alt ')' | '[' alt ']' | NAME | STRING
+    """
+
+    def __init__(self, name, text):
+        self.name = name
+        self.symbols = symbol_pattern.findall(text)
+        self.position = 0
+
+    def peek(self):
+        return self.symbols[self.position] if self.position < len(self.symbols) else None
+
+    def eat(self, symbol=None):
+        current = self.peek()
+        if current is None or symbol is not None and current != symbol:
+            raise SyntaxError(f'{self.name}: need {symbol!r} at {current!r}')
+        self.position += 1
+        return current
+
+    def read(self):
+        node = self.alt()
+        if self.peek() is not None:
+            raise SyntaxError(f'{self.name}: unexpected {self.peek()!r}')
+        return node
+
+    def alt(self):
+        alternatives = [self.seq()]
+        while self.peek() == '|':
+            self.eat()
+            alternatives.append(self.seq())
+        return alternatives[0] if len(alternatives) == 1 else (ALT, tuple(alternatives))
+
+    def seq(self):
+        items = []
+        while self.peek() not in (None, '|', ')', ']'):
+            items.append(self.item())
+        if not items:
+            raise SyntaxError(f'{self.name}: empty alternative at {self.peek()!r}')
+        return items[0] if len(items) == 1 else (SEQ, tuple(items))
+
+    def item(self):
+        node = self.atom()
+        if self.peek() == '*':
+            self.eat()
+            return STAR, node
+        if self.peek() == '+':
+            self.eat()
+            return PLUS, node
+        return node
+
+    def atom(self):
+        symbol = self.eat()
+        if symbol == '(':
+            node = self.alt()
+            self.eat(')')
+            return node
+        if symbol == '[':
+            node = self.alt()
+            self.eat(']')
+            return OPT, node
+        if symbol.startswith("'"):
+            return TERM, symbol[1:-1]
+        if symbol in TERMINALS:
+            return TERM, TERMINALS[symbol]
+        return RULE, symbol
+
+
+class Grammar:
+    """
+    rules       {规则名: 语法树}
+    first       {规则名: 能开始这条规则的终结符}
+    nullable    能推导出空串的规则
+    follow      {规则名: 能跟在这条规则之后的终结符}
+    predict     {规则名: {终结符: 选择}}, 只含规则体是多个选择的规则;
+                选择是一个规则名时记为规则名, 否则记为序号
+    conflicts   {规则名: 这条规则中 一个token之内不能决定的终结符}
+    """
+
+    def __init__(self, rules):
+        self.rules = {name: _Reader(name, text).read() for name, text in rules.items()}
+        for name, node in self.rules.items():
+            for used in self.used_rules(node):
+                if used not in self.rules:
+                    raise SyntaxError(f'{name}: undefined rule {used!r}')
+        self.first = {name: set() for name in self.rules}
+        self.nullable = set()
+        self.follow = {name: set() for name in self.rules}
+        self._compute_first()
+        self._compute_follow()
+        self.conflicts = {}
+        for name, node in self.rules.items():
+            self._walk(node, self.follow[name], name)
+        self.predict = {name: self._predict(name) for name, node in self.rules.items() if node[0] == ALT}
+
+    @classmethod
+    def from_file(cls, path=GRAMMAR_FILE):
+        return cls(read_rules(path))
+
+    def used_rules(self, node):
+        kind, value = node
+        if kind == RULE:
+            yield value
+        elif kind in (ALT, SEQ):
+            for child in value:
+                yield from self.used_rules(child)
+        elif kind in (OPT, STAR, PLUS):
+            yield from self.used_rules(value)
+
+    def first_of(self, node):
+        """(能开始node的终结符, node能否为空)"""
+        kind, value = node
+        if kind == TERM:
+            return {value}, False
+        if kind == RULE:
+            return self.first[value], value in self.nullable
+        if kind == SEQ:
+            first = set()
+            for child in value:
+                child_first, child_nullable = self.first_of(child)
+                first |= child_first
+                if not child_nullable:
+                    return first, False
+            return first, True
+        if kind == ALT:
+            first = set()
+            nullable = False
+            for child in value:
+                child_first, child_nullable = self.first_of(child)
+                first |= child_first
+                nullable = nullable or child_nullable
+            return first, nullable
+        first, nullable = self.first_of(value)
+        return first, nullable or kind != PLUS
+
+    def _compute_first(self):
+        changed = True
+        while changed:
+            changed = False
+            for name, node in self.rules.items():
+                first, nullable = self.first_of(node)
+                if not first <= self.first[name] or nullable and name not in self.nullable:
+                    self.first[name] |= first
+                    if nullable:
+                        self.nullable.add(name)
+                    changed = True
+
+    def _compute_follow(self):
+        changed = True
+        while changed:
+            sizes = [len(follow) for follow in self.follow.values()]
+            for name, node in self.rules.items():
+                self._walk(node, self.follow[name])
+            changed = sizes != [len(follow) for follow in self.follow.values()]
+
+    def _walk(self, node, follow, rule=None):
+        """
+        follow: 能跟在node之后的终结符, 把它加入node中规则的FOLLOW集合;
+        给出rule时 不再计算FOLLOW, 而是记录rule中每个选择点的冲突
+        """
+        kind, value = node
+        if kind == RULE:
+            if rule is None:
+                self.follow[value] |= follow
+        elif kind == SEQ:
+            for child in reversed(value):
+                self._walk(child, follow, rule)
+                first, nullable = self.first_of(child)
+                follow = first | follow if nullable else first
+        elif kind == ALT:
+            if rule is not None:
+                seen = set()
+                for child in value:
+                    first, nullable = self.first_of(child)
+                    if nullable:
+                        first = first | follow
+                    self._conflict(rule, seen & first)
+                    seen |= first
+            for child in value:
+                self._walk(child, follow, rule)
+        elif kind in (OPT, STAR, PLUS):
+            first, _ = self.first_of(value)
+            if rule is not None:
+                self._conflict(rule, first & follow)  # 进入还是跳过
+            self._walk(value, follow if kind == OPT else first | follow, rule)
+
+    def _conflict(self, rule, terminals):
+        if terminals:
+            self.conflicts.setdefault(rule, set()).update(terminals)
+
+    def _predict(self, name):
+        """有冲突时保留前面的选择, 与手写分析器按顺序尝试一致"""
+        table = {}
+        for index, node in enumerate(self.rules[name][1]):
+            first, nullable = self.first_of(node)
+            if nullable:
+                first = first | self.follow[name]
+            alternative = node[1] if node[0] == RULE else index
+            for terminal in first:
+                table.setdefault(terminal, alternative)
+        return table
+
+    def generate(self):
+        """_table.py的内容"""
+
+        def terminals(values):
+            return 'frozenset({%s})' % ', '.join(repr(value) for value in sorted(values))
+
+        def table(name, mapping, format_value):
+            lines = [f'{name} = {{']
+            lines.extend(f'    {key!r}: {format_value(value)},' for key, value in mapping.items())
+            lines.append('}')
+            return '\n'.join(lines)
+
+        def choices(mapping):
+            return '{%s}' % ', '.join(f'{key!r}: {mapping[key]!r}' for key in sorted(mapping))
+
+        parts = [
+            '# -*- coding: utf-8 -*-\n'
+            '# 由 parser/grammar.py 根据 Grammar1.md 生成, 不要手动修改: python -m parser.grammar',
+            table('FIRST', self.first, terminals),
+            'NULLABLE = ' + terminals(self.nullable),
+            table('FOLLOW', self.follow, terminals),
+            table('PREDICT', self.predict, choices),
+            table('CONFLICTS', self.conflicts, terminals),
+        ]
+        return '\n\n'.join(parts) + '\n'
+
+
+def main():
+    with open(TABLE_FILE, 'w', encoding='utf-8') as file:
+        file.write(Grammar.from_file().generate())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+from collections import OrderedDict
+from functools import wraps
 from lexer import tokens, PeekTokenLexer
+from lexer.tokens import Token
 from parser import ast
+from parser._table import FIRST, PREDICT
+from robin import settings
 from abc import ABC, abstractmethod
 
 """
@@ -9,30 +14,188 @@ from abc import ABC, abstractmethod
 """
 
 
-class Parser(ABC):
-    def __init__(self, lexer: PeekTokenLexer):
+class ParseError(Exception):
+    pass
+
+
+class ParserContext:
+    """
+    所有子分析器共享的状态: 词法分析器, 当前token, 每种规则分析器的唯一实例
+
+    packrat为True时以(规则, token位置)记住memoize规则的结果或错误, 回溯后再次分析同一位置时直接返回,
+    有序选择的回溯因此是线性的; 每个规则最多记住memo_limit个位置, 超过时删除最久未用的
+    """
+
+    def __init__(self, lexer: PeekTokenLexer, packrat=False, memo_limit=settings.MEMO_LIMIT):
+        if packrat and lexer.lazy:
+            raise ValueError('packrat parsing needs PeekTokenLexer(lazy=False)')
         self.lexer = lexer
-        self.indent = 0
         self.current_token = lexer.next_token()
+        self.parsers = {}
+        self.packrat = packrat
+        self.memo_limit = memo_limit
+        self.memo = {}  # {规则: OrderedDict(位置: (结果, 结束位置, 错误))}
+        self.stats = {}  # {规则: [命中, 未命中]}
+
+    def mark(self):
+        """当前token的位置"""
+        return self.lexer.index
+
+    def reset(self, position):
+        """回到mark()返回的位置"""
+        if self.lexer.lazy:
+            raise ValueError('backtracking needs PeekTokenLexer(lazy=False)')
+        self.lexer.index = position - 1
+        self.current_token = self.lexer.next_token()
+
+    def memoized(self, rule, method, parser):
+        position = self.mark()
+        memo = self.memo.get(rule)
+        if memo is None:
+            memo = self.memo[rule] = OrderedDict()
+            self.stats[rule] = [0, 0]
+        entry = memo.get(position)
+        if entry is not None:
+            self.stats[rule][0] += 1
+            memo.move_to_end(position)
+            result, end, error = entry
+            self.reset(end)
+            if error is not None:
+                raise error
+            return result
+
+        self.stats[rule][1] += 1
+        try:
+            result = method(parser)
+        except ParseError as e:
+            memo[position] = (None, position, e)
+            raise
+        else:
+            memo[position] = (result, self.mark(), None)
+            return result
+        finally:
+            if len(memo) > self.memo_limit:
+                memo.popitem(last=False)
+
+    def memo_stats(self):
+        """{规则: (命中, 未命中, 命中率)}"""
+        return {rule: (hits, misses, hits / (hits + misses)) for rule, (hits, misses) in self.stats.items()}
+
+    def format_memo_stats(self):
+        lines = [f'{"rule":<16} {"hits":>8} {"misses":>8} {"rate":>7}']
+        for rule, (hits, misses, rate) in sorted(self.memo_stats().items()):
+            lines.append(f'{rule:<16} {hits:>8} {misses:>8} {rate:>7.1%}')
+        return '\n'.join(lines)
+
+    def parser(self, cls):
+        """cls的唯一实例, 第一次用到时才创建"""
+        parser = self.parsers.get(cls)
+        if parser is None:
+            parser = cls(self)
+        return parser
+
+
+def memoize(rule):
+    """packrat模式下 以(rule, token位置)记住方法的结果, 见ParserContext"""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self):
+            if not self.context.packrat:
+                return method(self)
+            return self.context.memoized(rule, method, self)
+
+        return wrapper
+
+    return decorator
+
+
+class Parser(ABC):
+    def __init__(self, lexer):
+        """:param lexer PeekTokenLexer, 或与其他分析器共享的ParserContext"""
+        self.context = lexer if isinstance(lexer, ParserContext) else ParserContext(lexer)
+        self.context.parsers.setdefault(type(self), self)
+        self.lexer = self.context.lexer
+        self.indent = 0
         self.first_set = ()
 
-        self.simple_stmt_parser = SimpleStmtParser(lexer)
-        self.compound_stmt_parser = CompoundStmtParser(lexer)
-        self.expr_parser = ExprParser(lexer)
-        self.trailer_parser = TrailerParser(lexer)
-        self.test_parser = TestParser(lexer)
-        self.varargslist_parser = VarArgsListParser(lexer)
+    @property
+    def current_token(self):
+        return self.context.current_token
+
+    @current_token.setter
+    def current_token(self, token):
+        self.context.current_token = token
+
+    @property
+    def simple_stmt_parser(self):
+        return self.context.parser(SimpleStmtParser)
+
+    @property
+    def compound_stmt_parser(self):
+        return self.context.parser(CompoundStmtParser)
+
+    @property
+    def expr_parser(self):
+        return self.context.parser(ExprParser)
+
+    @property
+    def atom_parser(self):
+        return self.context.parser(AtomParser)
+
+    @property
+    def trailer_parser(self):
+        return self.context.parser(TrailerParser)
+
+    @property
+    def test_parser(self):
+        return self.context.parser(TestParser)
+
+    @property
+    def varargslist_parser(self):
+        return self.context.parser(VarArgsListParser)
 
     @abstractmethod
     def parse(self):
         # todo change ExprParser to root
         return self.expr_parser.parse()
 
+    def lookahead(self):
+        """当前token在预测表中的键: 类型, 关键字的类型就是关键字"""
+        return self.current_token.type
+
+    def predict(self, rule):
+        """
+        当前token开始rule的哪个选择, 一次查表
+        :return 选择是一个规则时为规则名, 否则为选择的序号
+        """
+        alternative = PREDICT[rule].get(self.lookahead())
+        if alternative is None:
+            self.error()
+        return alternative
+
     def error(self, type=None, value=None):
         msg = 'Invalid syntax. Unknown identity %s. ' % (self.current_token,)
         if type:
             msg += 'Need Token %r, %r' % (type, value)
-        raise Exception(msg)
+        raise ParseError(msg)
+
+    def attempt(self, method, *args):
+        """PEG的有序选择: method失败时回到开始的位置, 返回None"""
+        position = self.context.mark()
+        try:
+            return method(*args)
+        except ParseError:
+            self.context.reset(position)
+            return None
+
+    def expect(self, *types):
+        """依次吃掉types类型的token, 返回这些token"""
+        matched = []
+        for type in types:
+            matched.append(self.current_token)
+            self.eat(type)
+        return matched
 
     def eat(self, type=None):
         if type is None:
@@ -44,10 +207,10 @@ class Parser(ABC):
         else:
             self.error(type)
 
-    def binary_op(self, op, next_expr: str):
+    def binary_op(self, ops, next_expr: str):
         method = getattr(self, next_expr, self.generic_expr)
         node = method()
-        while self.current_token.type in op:
+        while self.current_token.type in ops:
             op = self.current_token
             self.eat()
             node = ast.Op(left=node, op=op, right=method())
@@ -68,32 +231,13 @@ class CompoundStmtParser(Parser):
     compound_stmt: if_stmt | while_stmt | for_stmt | try_stmt | with_stmt | funcdef | classdef | decorated | async_stmt
     """
 
-    def __init__(self, lexer: PeekTokenLexer):
+    def __init__(self, lexer):
         super().__init__(lexer)
-        self.first_set = ('if', 'while', 'for', 'try', 'with', 'def', 'class', '@', 'async')
+        self.first_set = FIRST['compound_stmt']
 
     def parse(self):
-        token = self.current_token
-        if token.type == 'if':
-            return self.if_stmt()
-        elif token.type == 'while':
-            return self.while_stmt()
-        elif token.type == 'for':
-            return self.for_stmt()
-        elif token.type == 'try':
-            return self.try_stmt()
-        elif token.type == 'with':
-            return self.with_stmt()
-        elif token.type == 'def':
-            return self.funcdef()
-        elif token.type == 'class':
-            return self.classdef()
-        elif token.type == '@':
-            return self.decorated()
-        elif token.type == tokens.ID and token.value == 'async':
-            return self.async_stmt()
-        else:
-            self.error()
+        # 每个选择都是同名方法
+        return getattr(self, self.predict('compound_stmt'))()
 
     def if_stmt(self):
         """
@@ -156,14 +300,14 @@ class CompoundStmtParser(Parser):
             self.eat(tokens.NEWLINE)
             self.eat(tokens.INDENT)
 
-            if self.current_token.type in self.compound_stmt_parser.first_set:
+            if self.lookahead() in self.compound_stmt_parser.first_set:
                 node = self.compound_stmt_parser.parse()
             else:
                 node = self.simple_stmt_parser.parse()
             node_list.append(node)
 
             while self.current_token.type != tokens.DEDENT:
-                if self.current_token.type in self.compound_stmt_parser.first_set:
+                if self.lookahead() in self.compound_stmt_parser.first_set:
                     node = self.compound_stmt_parser.parse()
                 else:
                     node = self.simple_stmt_parser.parse()
@@ -187,26 +331,27 @@ class ExprParser(Parser):
     atom_expr: [AWAIT] atom trailer*
     """
 
+    @memoize('expr')
     def parse(self):
-        self.binary_op('|', 'xor_expr')
+        return self.binary_op(('|',), 'xor_expr')
 
     def xor_expr(self):
-        self.binary_op('^', 'and_expr')
+        return self.binary_op(('^',), 'and_expr')
 
     def and_expr(self):
-        self.binary_op('&', 'shift_expr')
+        return self.binary_op(('&',), 'shift_expr')
 
     def shift_expr(self):
-        self.binary_op(('<<', '>>'), 'arith_expr')
+        return self.binary_op(('<<', '>>'), 'arith_expr')
 
     def arith_expr(self):
-        self.binary_op('+-', 'term')
+        return self.binary_op(('+', '-'), 'term')
 
     def term(self):
-        self.binary_op(('*', '@', '/', '%', '//'), 'factor')
+        return self.binary_op(('*', '@', '/', '%', '//'), 'factor')
 
     def factor(self):
-        if self.current_token.type in '+-~':
+        if self.predict('factor') != 'power':
             op = self.current_token
             self.eat()
             return ast.UnaryOp(op=op, expr=self.factor())
@@ -223,11 +368,11 @@ class ExprParser(Parser):
 
     def atom_expr(self):
         # todo  await
-        if self.current_token.type == tokens.ID and self.current_token.value == 'await':
+        if self.current_token.type == 'await':
             self.eat()
             pass
 
-        node = AtomParser(self.lexer).parse()
+        node = self.atom_parser.parse()
         # todo ast trailer
         while self.current_token.type in '({.':
             self.eat()
@@ -250,31 +395,70 @@ class AtomParser(Parser):
     """
 
     # todo AtomParser
+    @memoize('atom')
     def parse(self):
         token = self.current_token
         if token.type == '(':
-            self.eat()
-            pass
+            if self.lexer.lazy:  # 不能回溯
+                return self.group()
+            # 有序选择, 后面的选择在同一位置重新分析test时命中memo
+            node = self.attempt(self.empty_tuple) or self.attempt(self.parenthesized)
+            return node or self.tuple()
         elif token.type == '[':
             pass
         elif token.type == '{':
             pass
         elif token.type == tokens.ID:
+            self.eat()
             return ast.Var(token)
-        elif token.type == tokens.NUMBER:
-            return ast.Num(token)
-        elif token.type == tokens.STRING:
+        elif token.type in (tokens.NUMBER, tokens.STRING, 'None', 'True', 'False'):
             # todo 多个string
-            return ast.RegularStr(token)
+            self.eat()
+            return ast.Literals(token)
         elif token.type == '...':
             pass
-        elif token.type == 'None':
-            pass
-        elif token.type in ('True', 'False'):
-            return ast.Bool(token)
         else:
             self.error()
 
+    def empty_tuple(self):
+        self.expect('(', ')')
+        return ast.Tuple([])
+
+    def parenthesized(self):
+        """'(' test ')'"""
+        self.eat('(')
+        node = self.test_parser.parse()
+        self.eat(')')
+        return node
+
+    def tuple(self):
+        """'(' test (',' test)* [','] ')'  todo yield_expr, star_expr, comp_for"""
+        self.eat('(')
+        return self.tuple_rest(self.test_parser.parse())
+
+    def group(self):
+        """与上面三个选择相同, 不回溯: 读完第一个元素后再决定是括号还是元组"""
+        self.eat('(')
+        if self.current_token.type == ')':
+            self.eat()
+            return ast.Tuple([])
+        node = self.test_parser.parse()
+        if self.current_token.type == ')':
+            self.eat()
+            return node
+        return self.tuple_rest(node)
+
+    def tuple_rest(self, first):
+        """第一个元素之后的 (',' test)* [','] ')'"""
+        elements = [first]
+        while self.current_token.type == ',':
+            self.eat()
+            if self.current_token.type == ')':
+                break
+            elements.append(self.test_parser.parse())
+        self.eat(')')
+        return ast.Tuple(elements)
+
     def testlist_comp(self):
         pass
 
@@ -308,8 +492,9 @@ class TestParser(Parser):
     comp_op: '<'|'>'|'=='|'>='|'<='|'<>'|'!='|'in'|'not' 'in'|'is'|'is' 'not'
     """
 
+    @memoize('test')
     def parse(self):
-        if self.current_token.type == 'lambda':
+        if self.predict('test') == 'lambdef':
             return self.lambdef()
         else:
             node = self.or_test()
@@ -334,11 +519,23 @@ class TestParser(Parser):
             return ast.UnaryOp(op=op, expr=self.not_test())
         return self.comparison()
 
+    comp_ops = frozenset(('<', '>', '==', '>=', '<=', '<>', '!=', 'in', 'not', 'is'))
+
     def comparison(self):
-        if self.lexer.peek_token(1).type in ('not', 'is'):
-            # todo 'not' 'in'     'is' 'not'
-            pass
-        return self.binary_op(('<', '>', '==', '>=', '<=', '<>', '!=', 'in', 'is'), 'expr')
+        node = self.expr()
+        while self.current_token.type in self.comp_ops:
+            node = ast.Op(left=node, op=self.comp_op(), right=self.expr())
+        return node
+
+    def comp_op(self):
+        """'not' 'in' 与 'is' 'not' 由下一个token决定, 合成一个token"""
+        op = self.current_token
+        second = {'not': 'in', 'is': 'not'}.get(op.type)
+        if second is not None and (op.type == 'not' or self.lexer.peek_token(1).type == second):
+            self.expect(op.type, second)
+            return Token(f'{op.type} {second}', f'{op.type} {second}', op.line, op.column)
+        self.eat()
+        return op
 
     def expr(self):
         return self.expr_parser.parse()
@@ -423,7 +620,3 @@ class VarArgsListParser(Parser):
         if self.typed and self.current_token.type == ':':
             self.eat()
             type_node = self.test_parser.parse()
-
-
-if __name__ == '__main__':
-    async = 1
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import pytest
+from lexer import LexError, PeekTokenLexer, tokens
+from parser import grammar, _table
+from parser import parser as rules
+
+
+def test_table_up_to_date():
+    with open(grammar.TABLE_FILE, encoding='utf-8') as file:
+        assert file.read() == grammar.Grammar.from_file().generate(), '运行 python -m parser.grammar'
+
+
+def test_first_follow():
+    g = grammar.Grammar({
+        'expr': "term (('+'|'-') term)*",
+        'term': "['-'] atom",
+        'atom': "NAME | NUMBER | '(' expr ')'",
+    })
+    assert g.first['expr'] == {'-', 'id', 'number', '('}
+    assert g.follow['expr'] == {')'}
+    assert g.follow['atom'] == {'+', '-', ')'}
+    assert not g.nullable and not g.conflicts
+    assert g.predict['atom'] == {'id': 0, 'number': 1, '(': 2}
+
+    g = grammar.Grammar({'a': "b NAME", 'b': "[NAME]"})
+    assert g.nullable == {'b'} and g.conflicts == {'b': {'id'}}
+    with pytest.raises(SyntaxError):
+        grammar.Grammar({'a': "b"})
+
+
+def test_predict():
+    assert _table.PREDICT['compound_stmt']['async'] == 'async_stmt'
+    assert _table.PREDICT['stmt']['if'] == 'compound_stmt' and _table.PREDICT['stmt']['id'] == 'simple_stmt'
+    assert _table.CONFLICTS['comp_op'] == {'is'}  # 'is' 'not' 要多看一个token
+
+    parser = rules.CompoundStmtParser(PeekTokenLexer('while a: pass\n'))
+    assert parser.predict('compound_stmt') == 'while_stmt'
+    parser.current_token = tokens.Token('async', None, 0, 0)  # 词法分析器还不支持async
+    assert parser.lookahead() == 'async' and parser.predict('compound_stmt') == 'async_stmt'
+    with pytest.raises(LexError):
+        PeekTokenLexer('async def f(): pass\n')
+    parser = rules.CompoundStmtParser(PeekTokenLexer('else: pass\n'))
+    with pytest.raises(Exception):
+        parser.parse()
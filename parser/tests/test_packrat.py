@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import pytest
+from lexer import PeekTokenLexer
+from parser import ast
+from parser import parser as rules
+
+
+def parse_test(text, lazy=False, **kwargs):
+    context = rules.ParserContext(PeekTokenLexer(text + '\n', lazy=lazy), **kwargs)
+    node = rules.TestParser(context).parse()
+    assert context.current_token.type == 'newline'
+    return node, context
+
+
+def shape(node):
+    if isinstance(node, ast.Op):
+        return f'({shape(node.left)} {node.token.type} {shape(node.right)})'
+    if isinstance(node, ast.Tuple):
+        return '(' + ''.join(shape(element) + ', ' for element in node.elements) + ')'
+    return node.token.value
+
+
+def test_ordered_choice():
+    cases = {
+        'a not in b is not c < d': '(((a not in b) is not c) < d)',
+        'a is b': '(a is b)',
+        'a': 'a',
+        '((a))': 'a',
+        '(a, (b,), ())': '(a, (b, ), (), )',
+    }
+    for options in ({}, {'packrat': True}, {'lazy': True}):  # lazy时不回溯
+        for text, expected in cases.items():
+            assert shape(parse_test(text, **options)[0]) == expected
+    with pytest.raises(rules.ParseError):
+        parse_test('a not b', lazy=True)
+    with pytest.raises(rules.ParseError):
+        parse_test('(a, b', packrat=True)
+
+
+def test_memo():
+    depth = 12
+    text = '(' * depth + 'a, b)' + ', c)' * (depth - 1)
+    counts = []
+    for packrat in (False, True):
+        calls = []
+        parse = rules.ExprParser.term
+        rules.ExprParser.term = lambda self: calls.append(1) or parse(self)
+        try:
+            node, context = parse_test(text, packrat=packrat)
+        finally:
+            rules.ExprParser.term = parse
+        counts.append(len(calls))
+    assert counts[0] > 2 ** depth and counts[1] < 10 * depth  # 回溯不再重复分析
+
+    hits, misses, rate = context.memo_stats()['test']
+    assert hits == depth and 0 < rate < 1
+    assert 'test' in context.format_memo_stats()
+
+    node, context = parse_test(text, packrat=True, memo_limit=2)
+    assert all(len(memo) <= 2 for memo in context.memo.values())
+    with pytest.raises(ValueError):
+        rules.ParserContext(PeekTokenLexer('a\n', lazy=True), packrat=True)
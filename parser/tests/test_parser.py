@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from lexer import PeekTokenLexer
+from parser import parser as rules
+
+
+def test_shared_context():
+    parser = rules.CompoundStmtParser(PeekTokenLexer('if a: b\n'))
+    context = parser.context
+    assert context.parser(rules.CompoundStmtParser) is parser
+    # 子分析器只创建一次, 互相引用同一个实例
+    assert parser.test_parser.expr_parser is parser.expr_parser
+    assert parser.expr_parser.test_parser is parser.test_parser
+    assert set(context.parsers) == {rules.CompoundStmtParser, rules.TestParser, rules.ExprParser}
+
+    parser.eat('if')
+    assert parser.test_parser.current_token is parser.current_token  # 同一个当前token
+    parser.expr_parser.eat()
+    assert parser.current_token.type == ':'
+
+
+def test_context():
+    context = rules.ParserContext(PeekTokenLexer('a\n'))
+    assert context.parser(rules.ExprParser).context is context
+    assert context.parser(rules.ExprParser) is context.parser(rules.ExprParser)
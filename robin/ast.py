@@ -9,33 +9,55 @@ __email__ = 'aollio@outlook.com'
 
 
 class AST:
+    """
+    Statements and blocks made by the Parser have a span: (first line, end line),
+    0-based and end exclusive. A statement's span runs up to the next token it did not consume,
+    so the statements of a block cover its lines without gaps.
+    """
+
     def __repr__(self):
         return '<%s AST>' % self.__class__.__name__
 
 
-class Num(AST):
-    def __init__(self, token):
+class Constant(AST):
+    """A literal: its index in the program's robin.constants.ConstantPool, and the value there."""
+
+    def __init__(self, token, constants):
         self.token = token
-        self.value = token.value
+        self.index = constants.add(token)
+        self.value = constants.values[self.index]
+
+
+class Num(Constant):
+    pass
 
 
 class Bool(AST):
     def __init__(self, token):
-        self.token = token,
-        self.value = token.value
+        self.token = token
+        self.value = token.type == 'True'
+
+
+class RegularStr(Constant):
+    pass
+
+
+class Bytes(Constant):
+    pass
 
 
-class RegularStr(AST):
+class FormattedStr(AST):
+    """An f-string: not a constant, the token is kept as written."""
+
     def __init__(self, token):
-        self.token = token,
-        self.value = token.value
+        self.token = token
 
 
 class Op(AST):
     def __init__(self, left, op, right):
         self.right = right
         self.token = op
-        self.value = op.value
+        self.value = op.type
         self.left = left
 
 
@@ -43,7 +65,7 @@ class UnaryOp(AST):
     def __init__(self, op, expr):
         self.expr = expr
         self.token = op
-        self.value = op.value
+        self.value = op.type
 
 
 class EmptyOp(AST):
@@ -100,6 +122,23 @@ class Block(AST):
         self.children = children
 
 
+class LazyBlock(AST):
+    """
+    A function body not parsed yet, see Parser(lazy_functions=True).
+    parse() builds the Block on the first call and keeps it.
+    """
+
+    def __init__(self, parse):
+        self._parse = parse
+        self.block = None
+
+    def parse(self):
+        if self.block is None:
+            self.block = self._parse()
+            self._parse = None  # 不再引用token流
+        return self.block
+
+
 class FunctionDef(AST):
     """
     Function definition.
@@ -122,5 +161,20 @@ class FunctionCall(AST):
 
 
 class Program(AST):
-    def __init__(self, block: Block):
+    def __init__(self, block: Block, constants: list):
+        """:param constants the values of the ConstantPool, Constant.index refers to them"""
         self.block = block
+        self.constants = constants
+
+
+def walk(node):
+    """Yield node and all of its descendants, depth first."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        for value in reversed(list(vars(node).values())):
+            if isinstance(value, AST):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(child for child in reversed(value) if isinstance(child, AST))
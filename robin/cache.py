@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of parsed trees, like .pyc files for robin.ast.
+
+A cache file is named by the hash of the source bytes and the grammar version,
+so an edited script or a new parser never finds an old tree.
+Format: MAGIC, header (format version, grammar version, python major, minor), zlib compressed marshal data.
+The marshal data is (class table, nodes): the nodes in post order, each
+(class index, *field values), with a child node written as its index.
+"""
+import gc
+import marshal
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from contextlib import contextmanager
+from hashlib import blake2b
+from lexer.tokens import Token
+from robin import ast
+from robin import settings
+from robin.parser import GRAMMAR_VERSION
+
+__author__ = 'Aollio Hou'
+__email__ = 'aollio@outlook.com'
+
+MAGIC = b'RAST'
+FORMAT_VERSION = 1
+SUFFIX = '.rbc'
+header = struct.Struct('<HHBB')
+
+
+def _header():
+    return MAGIC + header.pack(FORMAT_VERSION, GRAMMAR_VERSION, *sys.version_info[:2])
+
+
+def cache_file(data, cache_dir=None):
+    """The cache file for source bytes data."""
+    digest = blake2b(data, digest_size=16).hexdigest()
+    return os.path.join(cache_dir or settings.CACHE_DIR, f'{digest}-{GRAMMAR_VERSION}{SUFFIX}')
+
+
+@contextmanager
+def _gc_paused():
+    """编码解码只新建对象不产生循环引用, 其间的垃圾回收只会反复遍历新建的节点"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# 字段值的种类, 与类名 字段名一起记在类表中
+PLAIN, NODE, TOKEN, NODES = range(4)
+
+
+def encode(tree):
+    """The tree as marshal-able (class table, nodes)."""
+    classes = {}
+    index = {}
+    nodes = []
+    append = nodes.append
+    for node in reversed(list(ast.walk(tree))):  # 逆前序: 子节点在父节点之前
+        if id(node) in index:
+            continue
+        fields = vars(node)
+        kinds = []
+        values = []
+        for value in fields.values():
+            if isinstance(value, ast.AST):
+                kinds.append(NODE)
+                values.append(index[id(value)])
+            elif isinstance(value, Token):
+                kinds.append(TOKEN)
+                values.append(tuple(value))
+            elif isinstance(value, list) and value and isinstance(value[0], ast.AST):
+                kinds.append(NODES)
+                values.append([index[id(item)] for item in value])
+            else:
+                kinds.append(PLAIN)
+                values.append(value)
+        key = (type(node).__name__, tuple(fields), tuple(kinds))
+        append((classes.setdefault(key, len(classes)), *values))
+        index[id(node)] = len(nodes) - 1
+    return tuple(classes), nodes
+
+
+def decode(data):
+    """Rebuild the tree from encode(tree); the nodes' __init__ is not called."""
+    table, nodes = data
+    classes = [(getattr(ast, name), fields, kinds) for name, fields, kinds in table]
+    built = []
+    append = built.append
+    make_token = Token._make
+    for class_index, *values in nodes:
+        cls, fields, kinds = classes[class_index]
+        node = cls.__new__(cls)
+        for field, kind, value in zip(fields, kinds, values):
+            if kind == NODE:
+                value = built[value]
+            elif kind == TOKEN:
+                value = make_token(value)
+            elif kind == NODES:
+                value = [built[item] for item in value]
+            node.__dict__[field] = value
+        append(node)
+    return built[-1]
+
+
+def load(path):
+    """The cached tree, or None if the file is missing, stale or corrupt."""
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    prefix = _header()
+    if not data.startswith(prefix):
+        return None
+    try:
+        with _gc_paused():
+            tree = decode(marshal.loads(zlib.decompress(data[len(prefix):])))
+    except (zlib.error, ValueError, EOFError, TypeError, IndexError, AttributeError):
+        return None
+    try:
+        os.utime(path)  # 最近使用, 淘汰时最后删除
+    except OSError:
+        pass
+    return tree
+
+
+def store(path, tree, max_size=None):
+    """
+    Write the tree atomically, then evict old files of the directory beyond max_size bytes.
+    A tree that cannot be written (read-only directory, nesting too deep for marshal) is not cached.
+    """
+    try:
+        with _gc_paused():
+            data = _header() + zlib.compress(marshal.dumps(encode(tree)), 1)  # 最快的压缩级别已缩小约4倍
+    except ValueError:
+        return
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp, path)  # 其他进程只会看到完整的文件
+        except BaseException:
+            os.unlink(temp)
+            raise
+    except OSError:
+        return
+    evict(directory, settings.CACHE_MAX_SIZE if max_size is None else max_size)
+
+
+def evict(directory, max_size):
+    """Remove the least recently used cache files until the directory holds at most max_size bytes."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(SUFFIX):
+            try:
+                stat = entry.stat()
+            except OSError:  # 被其他进程删除
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
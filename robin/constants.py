@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+The constant pool of a program: each distinct literal is decoded once, at parse time.
+"""
+from ast import literal_eval
+from lexer import tokens
+
+__author__ = 'Aollio Hou'
+__email__ = 'aollio@outlook.com'
+
+
+def number(text):
+    """The value of a NUMBER token: int in any base, float or complex, underscores allowed."""
+    if text[-1] in 'jJ':
+        return complex(text)
+    if text[:2].lower() in ('0x', '0o', '0b') or not any(char in text for char in '.eE'):
+        return int(text, 0)  # 不退回float, 0o8 09都是错误
+    return float(text)
+
+
+def formatted(token):
+    """Whether a STRING token is an f-string: its value depends on the scope, it is not a constant."""
+    text = token.value
+    quote = min(index for index in (text.find("'"), text.find('"')) if index != -1)
+    return 'f' in text[:quote].lower()
+
+
+def decode(token):
+    """
+    The value of a NUMBER, STRING or BYTES token; escapes and prefixes of strings are applied.
+    ValueError or SyntaxError if the literal is invalid, e.g. 0o8, or an f-string.
+    """
+    if token.type == tokens.NUMBER:
+        return number(token.value)
+    if token.type in (tokens.STRING, tokens.BYTES):
+        return literal_eval(token.value)
+    raise ValueError(f'{token.type} token is not a literal')
+
+
+class ConstantPool:
+    """
+    values: the decoded literals, in the order first seen, each distinct value once.
+    Values are equal only with the same type, so 1 and 0x1 share an entry but 1 and 1.0 do not.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.indexes = {}  # (token类型, 源文本) 同样的文本不再解码
+        self.value_indexes = {}  # (值的类型, 值)
+
+    def add(self, token):
+        """Index of the value of token, decoded the first time its text is seen."""
+        key = (token.type, token.value)
+        index = self.indexes.get(key)
+        if index is None:
+            index = self.indexes[key] = self.intern(decode(token))
+        return index
+
+    def intern(self, value):
+        """Index of value, added if the pool has no equal value of the same type."""
+        key = (type(value), value)
+        index = self.value_indexes.get(key)
+        if index is None:
+            index = self.value_indexes[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class TransientPool:
+    """
+    A ConstantPool that keeps nothing: each literal is decoded again, values holds only the last one
+    and every index is 0. For parsers that drop the nodes, see robin.events.
+    """
+
+    def __init__(self):
+        self.values = [None]
+
+    def add(self, token):
+        self.values[0] = decode(token)
+        return 0
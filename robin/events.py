@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Event-based parsing for tools that only look at the code, e.g. counting statements,
+listing function names or finding calls, without keeping the whole tree.
+
+EventParser(lexer, handler).parse() calls handler(Event) when each rule of robin.parser
+starts and ends. A block forgets its statements once they are reported and literals are
+not pooled, so with PeekTokenLexer(lazy=True) memory grows with the nesting depth and
+the largest statement, not with the size of the file.
+"""
+from collections import namedtuple
+from lexer import tokens
+from robin import ast
+from robin.constants import TransientPool
+from robin.parser import Parser
+from robin.util import traced_methods
+
+__author__ = 'Aollio Hou'
+__email__ = 'aollio@outlook.com'
+
+START, END = 'start', 'end'
+
+# start 规则的第一个token, end 规则之后的token(END事件才有)
+# node 规则返回的节点(END事件才有), 其中的Block没有子语句
+Event = namedtuple('Event', ['kind', 'rule', 'start', 'end', 'node'])
+
+# Parser中用log_def标记的规则, parse只是入口 事件由program报告
+RULES = tuple(name for name in traced_methods(Parser) if name != 'parse')
+
+
+class EventParser(Parser):
+    """
+    parse() returns the Program, with every Block empty; see handler for the statements.
+    Literals keep their value but not their place in a pool: index is 0 and Program.constants is not kept.
+    Parser.parse() is the tree builder, it does not pay for the events.
+    """
+
+    def __init__(self, lexer, handler):
+        """:param handler called with each Event, in source order"""
+        self.handler = handler
+        super().__init__(lexer)
+        self.constants = TransientPool()
+
+    def block(self):
+        start = self.current_token.line
+        while self.current_token.type not in (tokens.DEDENT, tokens.ENDMARKER):
+            self.statement()  # 已通过事件报告, 不保留
+        block = ast.Block(children=[])
+        block.span = (start, self.end_line())
+        return block
+
+
+def _reporting(name, method):
+    def rule(self, *args):
+        start = self.current_token
+        self.handler(Event(START, name, start, None, None))
+        node = method(self, *args)
+        self.handler(Event(END, name, start, self.current_token, node))
+        return node
+
+    rule.__name__ = name
+    rule.__doc__ = method.__doc__
+    return rule
+
+
+for _name in RULES:
+    setattr(EventParser, _name, _reporting(_name, getattr(EventParser, _name)))
+del _name
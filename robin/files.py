@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Lexer, parser and interpreter reading from a file, and the batch workers of manager.py
+"""
+import os
+from collections import namedtuple
+from lexer import PeekTokenLexer, ENGINES
+from lexer.source import SourceFile
+from lexer import tokens
+from robin import ast
+from robin.parser import Parser
+from robin.interpreter import Interpreter
+
+__author__ = 'Aollio Hou'
+__email__ = 'aollio@outlook.com'
+
+
+class FileLexer(PeekTokenLexer):
+    def __init__(self, file, lazy=False, engine='scanner', recover=False, compact=False):
+        """
+        :param file path or an open SourceFile. A file opened here is closed once the ENDMARKER is read,
+                    or by close(); a SourceFile passed in is left to the caller.
+        :param compact token_stream is a TokenBuffer, see PeekTokenLexer; only without lazy
+        With engine 'regex' the whole decoded text is kept in memory, see RegexLexer.
+        """
+        self.owns_source = not isinstance(file, SourceFile)
+        self.source = SourceFile(file) if self.owns_source else file
+        try:
+            super().__init__(self.source, lazy=lazy, engine=ENGINES[engine], recover=recover, compact=compact)
+        except BaseException:
+            self.close()
+            raise
+        if not lazy:  # token已全部读出
+            self.close()
+
+    def _read_token(self):
+        token = super()._read_token()
+        if token.type == tokens.ENDMARKER:
+            self.close()
+        return token
+
+    def close(self):
+        if self.owns_source:
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FileParser(Parser):
+    def __init__(self, file, engine='scanner', lazy=False, lazy_functions=False, compact=False):
+        super().__init__(FileLexer(file, lazy=lazy, engine=engine, compact=compact), lazy_functions=lazy_functions)
+
+    def close(self):
+        self.lexer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FileInterpreter(Interpreter):
+    def __init__(self, file, engine='scanner', cache=False, stream=False, lazy_functions=False):
+        """
+        :param cache reuse the tree from robin.cache while the source is unchanged
+        :param stream lex and parse lazily, running each top-level statement as soon as it is parsed;
+                      the whole tree is never built, and the cache is not used
+        :param lazy_functions parse a function body at its first call, see Parser; the cache is not used.
+                              Not with stream, which lexes lazily.
+        """
+        if stream and lazy_functions:
+            raise ValueError('stream and lazy_functions cannot be used together')
+        if stream:
+            super().__init__(None)
+            self.parser = FileParser(file, engine=engine, lazy=True)
+            self.statements = self.parser.statements()
+        elif lazy_functions:
+            super().__init__(FileParser(file, engine=engine, lazy_functions=True).parse())
+            self.statements = None
+        else:
+            super().__init__(cached_parse(file, engine=engine) if cache else FileParser(file, engine=engine).parse())
+            self.statements = None
+
+    def intreperter(self):
+        if self.statements is None:
+            super().intreperter()
+        else:
+            with self.parser:  # 语法错误或运行时错误时也关闭源文件
+                self.execute(self.statements)
+
+
+def cached_parse(file, engine='scanner', cache_dir=None):
+    """FileParser(file).parse(), lexing and parsing only when the cache has no tree for this source."""
+    from robin import cache
+    with SourceFile(file) as source:
+        path = cache.cache_file(source.data, cache_dir)
+        tree = cache.load(path)
+        if tree is None:
+            tree = FileParser(source, engine=engine).parse()
+            cache.store(path, tree)
+    return tree
+
+
+# 批量模式下每个文件的结果, 只含计数 以减少进程间传输
+FileResult = namedtuple('FileResult', ['path', 'size', 'tokens', 'nodes', 'error'])
+
+
+def lex_file(path, engine='scanner'):
+    """在子进程中运行"""
+    size = os.path.getsize(path)
+    try:
+        with FileLexer(path, lazy=True, engine=engine, recover=True) as a_lexer:
+            count = 1
+            while a_lexer.next_token().type != tokens.ENDMARKER:
+                count += 1
+    except Exception as e:
+        return FileResult(path, size, 0, 0, repr(e))
+    error = '; '.join(str(e) for e in a_lexer.errors) or None  # 一次报告所有词法错误
+    return FileResult(path, size, count, 0, error)
+
+
+def parse_file(path, engine='scanner'):
+    """在子进程中运行"""
+    size = os.path.getsize(path)
+    try:
+        a_parser = FileParser(path, engine=engine, compact=True)  # 分析时token列式存储
+        root = a_parser.parse()
+    except Exception as e:
+        return FileResult(path, size, 0, 0, repr(e))
+    nodes = sum(1 for _ in ast.walk(root))
+    return FileResult(path, size, len(a_parser.lexer.token_stream), nodes, None)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Incremental reparse: after an edit only the statements whose span covers
+the changed lines and tokens are parsed again and spliced into the old tree.
+"""
+from collections import Counter
+
+from lexer import tokens
+from lexer.incremental import IncrementalLexer
+from lexer.tokens import Token
+from robin import ast
+from robin.constants import ConstantPool
+from robin.parser import Parser
+
+__author__ = 'Aollio Hou'
+__email__ = 'aollio@outlook.com'
+
+
+def _first_token(stream, line, lo=0):
+    """Index of the first token at or after line, the ENDMARKER if there is none."""
+    hi = len(stream) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if stream[mid].line < line:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _blocks(node):
+    """The suites of a compound statement, elif and else included."""
+    if isinstance(node, (ast.FunctionDef, ast.While)):
+        yield node.block
+    elif isinstance(node, ast.If):
+        yield node.right_block
+        if isinstance(node.wrong_block, ast.If):  # elif
+            yield from _blocks(node.wrong_block)
+        elif isinstance(node.wrong_block, ast.Block):
+            yield node.wrong_block
+
+
+def _statement_start(stream, line):
+    """Index of the first token of the statement starting at line; the DEDENTs before it close the previous one."""
+    position = _first_token(stream, line)
+    while stream[position].type in (tokens.INDENT, tokens.DEDENT):
+        position += 1
+    return position
+
+
+def _statement_stop(stream, statement):
+    """Index of the token after statement: its suites consume one DEDENT each at the end line."""
+    end = statement.span[1]
+    if end > stream[-1].line:  # 到全文结束
+        return len(stream) - 1
+    position = _first_token(stream, end)
+    blocks = list(_blocks(statement))
+    while blocks:
+        position += 1
+        blocks = list(_blocks(blocks[-1].children[-1]))
+    return position
+
+
+def _overlap(children, lo, hi):
+    """(i, j): children[i:j + 1] are the statements whose span meets the lines [lo, hi), at least one."""
+    i = 0
+    while i < len(children) - 1 and children[i].span[1] <= lo:
+        i += 1
+    j = i
+    while j < len(children) - 1 and children[j + 1].span[0] < hi:
+        j += 1
+    return i, j
+
+
+def _retile(node, end, new_end):
+    """Spans end at the next statement: move the end of node, and of its last suites and statements, to new_end."""
+    while node.span[1] == end:
+        node.span = (node.span[0], new_end)
+        blocks = list(_blocks(node))
+        if not blocks:
+            break
+        blocks[-1].span = (blocks[-1].span[0], new_end)
+        node = blocks[-1].children[-1]
+
+
+def _shift(tree, line, delta):
+    """Move the spans and tokens at or after line by delta lines, skipping statements that end before it."""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        fields = vars(node)
+        span = fields.get('span')
+        if span is not None:
+            if span[1] < line:
+                continue
+            node.span = (span[0] + delta if span[0] >= line else span[0], span[1] + delta)
+        token = fields.get('token')
+        if token is not None and token.line >= line:
+            node.token = Token(token.type, token.value, token.line + delta, token.column)
+        for value in fields.values():
+            if isinstance(value, ast.AST):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(child for child in value if isinstance(child, ast.AST))
+
+
+def _references(nodes):
+    """Counter of the constant pool indexes used by nodes and their descendants."""
+    return Counter(node.index for root in nodes for node in ast.walk(root) if isinstance(node, ast.Constant))
+
+
+class IncrementalParser(Parser):
+    """
+    tree is Parser(PeekTokenLexer(text)).parse(), spans included;
+    after edit() it is the same as parsing the edited text.
+    The constant pool is compacted when most of its values are no longer used by the tree.
+    """
+
+    def __init__(self, text):
+        super().__init__(IncrementalLexer(text))
+        self.tree = self.parse()
+        self.references = _references([self.tree])
+
+    def text(self):
+        return self.lexer.text()
+
+    def edit(self, start, end, text):
+        """
+        Replace the lines [start, end) with text and reparse the smallest statements that cover the change.
+        Nodes outside them are kept, with spans and tokens moved to their new lines.
+        :return (block, i, j) block.children[i:j] are the new statements, the rest of the tree is reused
+        """
+        old_stream = self.lexer.token_stream
+        line_count = len(self.lexer.lines)
+        index, old_end, new_end = self.lexer.edit(start, end, text)
+        delta = len(self.lexer.lines) - line_count
+
+        # 编辑的行 与重新分析后改变的token所在的行, 旧的行号
+        lo, hi = start, max(end, start + 1)
+        if index < len(old_stream):
+            lo = min(lo, old_stream[index].line)
+        if old_end > index:
+            hi = max(hi, old_stream[old_end - 1].line + 1)
+
+        # 从根到包含[lo, hi)的最小的块, 从最内层开始尝试
+        path = [self.tree.block]
+        while path[-1].children:
+            i, j = _overlap(path[-1].children, lo, hi)
+            if i != j:
+                break
+            inner = [block for block in _blocks(path[-1].children[i]) if block.span[0] <= lo and hi <= block.span[1]]
+            if not inner:
+                break
+            path.append(inner[0])
+
+        for block in reversed(path):
+            if block.children:
+                result = self._reparse(block, lo, hi, delta, old_stream, index, old_end, new_end)
+                if result is not None:
+                    self._compact()
+                    return result
+
+        # 缩进或语句结构的改变超出了所有块, 全部重新分析
+        self.lexer.index = -1
+        self.current_token = self.lexer.next_token()
+        self.constants = ConstantPool()
+        self.tree = self.parse()
+        self.references = _references([self.tree])
+        return self.tree.block, 0, len(self.tree.block.children)
+
+    def _compact(self):
+        """Rebuild the constant pool from the tree once unused values outnumber the used ones."""
+        if len(self.constants.values) <= 2 * len(self.references):
+            return
+        self.constants = ConstantPool()
+        for node in ast.walk(self.tree):
+            if isinstance(node, ast.Constant):
+                node.index = self.constants.add(node.token)
+        self.tree.constants = self.constants.values
+        self.references = _references([self.tree])
+
+    def _reparse(self, block, lo, hi, delta, old_stream, index, old_end, new_end):
+        """
+        Reparse the children of block meeting [lo, hi).
+        None if the changed tokens old_stream[index:old_end], now stream[index:new_end], are not all inside them,
+        or the new statements do not end at the token that followed the old ones.
+        """
+        children = block.children
+        i, j = _overlap(children, lo, hi)
+        stream = self.lexer.token_stream
+        position = _statement_start(stream, min(children[i].span[0], lo))
+        if position > index or position != _statement_start(old_stream, min(children[i].span[0], lo)):
+            return None
+        stop = _statement_stop(old_stream, children[j])
+        if stop < old_end:
+            return None
+        stop += new_end - old_end
+
+        self.lexer.index = position - 1
+        self.current_token = self.lexer.next_token()
+        statements = []
+        try:
+            while self.lexer.index < stop and self.current_token.type not in (tokens.DEDENT, tokens.ENDMARKER):
+                statements.append(self.statement())
+        except Exception:  # 留给外层的块或全部重新分析报告
+            return None
+        if not statements or self.lexer.index != stop:
+            return None
+
+        if delta:
+            _shift(self.tree, children[j].span[1], delta)
+        if i:  # 新语句之前的空白行 注释行属于上一个语句
+            _retile(children[i - 1], children[i].span[0], statements[0].span[0])
+        self.references -= _references(children[i:j + 1])  # 只保留正数, 不再使用的索引被删除
+        self.references += _references(statements)
+        children[i:j + 1] = statements
+        block.span = (children[0].span[0], block.span[1])
+        return block, i, i + len(statements)
@@ -4,6 +4,7 @@
 Simple Robin Interpreter
 """
 import builtins
+import operator
 from robin import symbols
 from robin.parser import *
 
@@ -28,27 +29,18 @@ class Visitor:
             func='visit_' + type(node).__name__.lower()))
 
 
+# Every binary and prefix operator of robin.parser.binding_power
+binary_operators = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '//': operator.floordiv, '%': operator.mod, '**': operator.pow,
+    '<<': operator.lshift, '>>': operator.rshift, '&': operator.and_, '|': operator.or_, '^': operator.xor,
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+unary_operators = {'+': operator.pos, '-': operator.neg, '~': operator.invert}
+
+
 def op_operate(left, op, right):
-    if op == '+':
-        return left + right
-    elif op == '-':
-        return left - right
-    elif op == '*':
-        return left * right
-    elif op == '/':
-        return left / right
-    elif op == '//':
-        return left // right
-    elif op == '==':
-        return left == right
-    elif op == '<=':
-        return left <= right
-    elif op == '<':
-        return left < right
-    elif op == '>':
-        return left > right
-    elif op == '>=':
-        return left >= right
+    return binary_operators[op](left, right)
 
 
 class ScopeDict:
@@ -89,6 +81,15 @@ class Interpreter(Visitor):
     def intreperter(self):
         self.visit(self.tree)
 
+    def execute(self, statements):
+        """
+        Run top-level statements as they arrive, e.g. from Parser.statements().
+        A statement is dropped once run, so only what the scope refers to stays alive.
+        """
+        for statement in statements:
+            self.visit(statement)
+            del statement  # 不在解析下一个语句时保留
+
     def get_global(self):
         return self._global
 
@@ -120,14 +121,16 @@ class Interpreter(Visitor):
         self.scope = scope
         # enter function scope
         # initialize args to function scope by param order
-        for param_token in function.params:
-            arg_value = self.visit(node.args.pop(0))
+        for param_token, arg in zip(function.params, node.args):  # 不修改node, 函数体可以再次执行
+            arg_value = self.visit(arg)
             param_sym = symbols.VarSymbol(name=param_token.value,
                                           type=type(arg_value),
                                           value=arg_value)
             scope.put(param_sym)
 
         # exit function scope
+        if isinstance(function.block, ast.LazyBlock):  # 第一次调用时才分析函数体
+            function.block = function.block.parse()
         self.visit(function.block)
         self.scope = pre_scope
         del scope
@@ -158,9 +161,7 @@ class Interpreter(Visitor):
         raise NameError('Unknown Identity {name}'.format(name=node.value))
 
     def visit_unaryop(self, node: ast.UnaryOp):
-        if node.value == '-':
-            return -1 * self.visit(node.expr)
-        return self.visit(node.expr)
+        return unary_operators[node.value](self.visit(node.expr))
 
     def visit_op(self, node: ast.Op):
         return op_operate(left=self.visit(node.left), op=node.value, right=self.visit(node.right))
@@ -174,6 +175,13 @@ class Interpreter(Visitor):
     def visit_regularstr(self, node: ast.RegularStr):
         return node.value
 
+    def visit_bytes(self, node: ast.Bytes):
+        return node.value
+
+    def visit_formattedstr(self, node: ast.FormattedStr):
+        token = node.token
+        raise NotImplementedError('f-string at line %s, column %s' % (token.line, token.column))
+
     def visit_emptyop(self, node: ast.EmptyOp):
         pass
 
@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
+from copy import copy
 from functools import partial
-import logging
 from lexer import PeekTokenLexer
 from robin.util import log_def
 from robin import ast
+from robin.constants import ConstantPool, formatted
 from lexer import tokens
-from robin.settings import INDENT_LENGTH
 
 __author__ = 'Aollio Hou'
 __email__ = 'aollio@outlook.com'
 
 log_def = log_def(name='parser')
-logger = logging.getLogger('parser')
+
+# Bump when the tree produced for the same source changes, e.g. a new node field.
+# robin.cache keys cached trees by it.
+GRAMMAR_VERSION = 4
+
+# Binding powers of the operators in lexer.tokens.operator, loosest first.
+# type: (binary left, binary right, prefix), None when the operator has no such form.
+# left < right is left-associative, left > right right-associative.
+# A new precedence level is a new row, the Parser itself does not change.
+binding_power = {
+    '<': (1, 2, None), '>': (1, 2, None), '<=': (1, 2, None),
+    '>=': (1, 2, None), '==': (1, 2, None), '!=': (1, 2, None),
+    '|': (3, 4, None),
+    '^': (5, 6, None),
+    '&': (7, 8, None),
+    '<<': (9, 10, None), '>>': (9, 10, None),
+    '+': (11, 12, 15), '-': (11, 12, 15),
+    '*': (13, 14, None), '/': (13, 14, None), '//': (13, 14, None), '%': (13, 14, None),
+    '~': (None, None, 15),
+    '**': (17, 16, None),  # -a ** b is -(a ** b), a ** -b is allowed
+}
+no_power = (None, None, None)
 
 
 ###############################################################################
@@ -21,9 +42,16 @@ logger = logging.getLogger('parser')
 ###############################################################################
 
 class Parser:
-    def __init__(self, lexer: PeekTokenLexer):
+    def __init__(self, lexer: PeekTokenLexer, lazy_functions=False):
+        """
+        :param lazy_functions skip function bodies, an ast.LazyBlock parses one at the first call.
+                              Syntax errors in a body are found only then. Needs PeekTokenLexer(lazy=False).
+        """
+        if lazy_functions and lexer.lazy:
+            raise ValueError('lazy_functions needs PeekTokenLexer(lazy=False)')
         self.lexer = lexer
-        self.indent = 0
+        self.lazy_functions = lazy_functions
+        self.constants = ConstantPool()
         self.current_token = lexer.next_token()
 
     def error(self, type=None, value=None):
@@ -32,6 +60,16 @@ class Parser:
             msg += 'Need Token %r, %r' % (type, value)
         raise Exception(msg)
 
+    def constant(self, node_type):
+        """The current token as a node_type, its value in the constant pool."""
+        token = self.current_token
+        try:
+            node = node_type(token, self.constants)
+        except (ValueError, SyntaxError) as e:
+            raise Exception('Invalid literal %r at line %s, column %s. ' % (token.value, token.line, token.column)) from e
+        self.eat(token.type)
+        return node
+
     def eat(self, type):
         if self.current_token.type == type:
             self.current_token = self.lexer.next_token()
@@ -45,13 +83,13 @@ class Parser:
             <program> -> <block>
         :return:
         """
-        return ast.Program(self.block())
+        return ast.Program(self.block(), constants=self.constants.values)
 
     @log_def
     def function_def(self):
         """
         Function definition.
-            <function_def> -> DEF <variable> <argument_list> COLON NEWLINE INDENT <block>
+            <function_def> -> DEF <variable> <argument_list> COLON <suite>
         :return:
         """
         # todo using <params_list> replace the <argument_list>
@@ -60,13 +98,35 @@ class Parser:
         name = self.variable()
         params = self.argument_list()
         self.eat(':')
-        self.eat(tokens.NEWLINE)
-        self.indent += 1
-        block = self.block()
-        self.indent -= 1
+        if self.lazy_functions:
+            block = ast.LazyBlock(partial(self.lazy_suite, self.skip_suite()))
+        else:
+            block = self.suite()
 
         return ast.FunctionDef(name=name, params=params, block=block)
 
+    def skip_suite(self):
+        """Move past a suite without building nodes: its INDENTs and DEDENTs balance. The index of its first token."""
+        start = self.lexer.index
+        self.eat(tokens.NEWLINE)
+        self.eat(tokens.INDENT)
+        depth = 1
+        while depth and self.current_token.type != tokens.ENDMARKER:
+            if self.current_token.type == tokens.INDENT:
+                depth += 1
+            elif self.current_token.type == tokens.DEDENT:
+                depth -= 1
+            self.current_token = self.lexer.next_token()
+        return start
+
+    def lazy_suite(self, start):
+        """The suite skipped by skip_suite(), parsed from the same tokens."""
+        lexer = copy(self.lexer)  # 共用token_stream
+        lexer.index = start - 1
+        parser = Parser(lexer, lazy_functions=True)  # 子类的__init__可能需要别的参数, 如FileParser
+        parser.constants = self.constants  # 索引指向同一个常量池
+        return parser.suite()
+
     @log_def
     def block(self):
         """
@@ -74,11 +134,32 @@ class Parser:
             <block> -> <statement> | <statement> (<statement>)*
         :return:
         """
+        start = self.current_token.line
         result = []
-        while self.check_indent() and self.current_token.value != tokens.EOF:
-            self.eat_indent()
+        while self.current_token.type not in (tokens.DEDENT, tokens.ENDMARKER):
             result.append(self.statement())
-        return ast.Block(children=result)
+        block = ast.Block(children=result)
+        block.span = (start, self.end_line())
+        return block
+
+    def end_line(self):
+        """End (exclusive) of the lines consumed so far: the line of the current token, after the last one at ENDMARKER."""
+        token = self.current_token
+        return token.line + 1 if token.type == tokens.ENDMARKER else token.line
+
+    @log_def
+    def suite(self):
+        """
+        An indented block.
+            <suite> -> NEWLINE INDENT <block> DEDENT
+        :return:
+        """
+        self.eat(tokens.NEWLINE)
+        self.eat(tokens.INDENT)
+        block = self.block()
+        if self.current_token.type != tokens.ENDMARKER:  # 全文结束时lexer不一定产生DEDENT
+            self.eat(tokens.DEDENT)
+        return block
 
     @log_def
     def statement(self):
@@ -86,33 +167,38 @@ class Parser:
         A statement tokens.
              <statement> -> <assign_statement>
                          -> <function_call> NEWLINE
-                         -> <empty>
+                         -> PASS <empty>
                          -> <if_statement>
                          -> <while_statement>
                          -> <function_def>
         :return:
         """
         statement = None
+        start = self.current_token.line
+        type = self.current_token.type
         # 分辨是赋值，还是函数调用
-        if self.current_token.type == tokens.ID:
-            if self.lexer.peek_token() is None:
-                statement = self.empty()
-            elif self.lexer.peek_token().value == tokens.delimiter['(']:
+        if type == tokens.ID:
+            peek_type = self.lexer.peek_token().type
+            if peek_type == '(':
                 statement = self.function_call()
                 self.eat(tokens.NEWLINE)
-            elif self.lexer.peek_token().value == tokens.delimiter['=']:
+            elif peek_type == '=':
                 statement = self.assign_statement()
             else:
-                statement = self.empty()
-        elif self.current_token.value == tokens.keywords.IF:
+                self.error()
+        elif type == 'if':
             statement = self.if_statement()
-        elif self.current_token.value == tokens.keywords.WHILE:
+        elif type == 'while':
             statement = self.while_statement()
-        elif self.current_token.value == tokens.keywords.DEF:
+        elif type == 'def':
             statement = self.function_def()
-        else:
+        elif type == 'pass':
+            self.eat('pass')
             statement = self.empty()
+        else:
+            self.error()
 
+        statement.span = (start, self.end_line())
         return statement
 
     @log_def
@@ -135,9 +221,9 @@ class Parser:
         """
         args = []
         self.eat("(")
-        if self.current_token.value != ')':
+        if self.current_token.type != ')':
             args.append(self.expr())
-            while self.current_token.value == ',':
+            while self.current_token.type == ',':
                 self.eat(',')
                 args.append(self.expr())
         self.eat(')')
@@ -147,17 +233,14 @@ class Parser:
     def while_statement(self):
         """
         `while` statement:
-            <while_statement> -> WHILE <expression> COLON NEWLINE INDENT <block> DEDENT
+            <while_statement> -> WHILE <expression> COLON <suite>
         :return:
         """
         token = self.current_token
         self.eat('while')
         condition = self.expr()
         self.eat(':')
-        self.eat(tokens.NEWLINE)
-        self.indent += 1
-        right_block = self.block()
-        self.indent -= 1
+        right_block = self.suite()
 
         return ast.While(condition=condition, token=token, block=right_block)
 
@@ -165,7 +248,7 @@ class Parser:
     def if_statement(self):
         """
         `if` statement:
-            <if_statement> -> IF <expr> COLON NEWLINE INDENT <block> <elif_statement>
+            <if_statement> -> IF <expr> COLON <suite> <elif_statement>
 
         :return:
         """
@@ -173,11 +256,7 @@ class Parser:
         self.eat('if')
         condition = self.expr()
         self.eat(':')
-        self.eat(tokens.NEWLINE)
-
-        self.indent += 1
-        right_block = self.block()
-        self.indent -= 1
+        right_block = self.suite()
         wrong_block = self.elif_statement()
 
         return ast.If(condition=condition, token=token, right_block=right_block, wrong_block=wrong_block)
@@ -186,31 +265,23 @@ class Parser:
     def elif_statement(self):
         """
         `elif` statement:
-            <elif_statement> -> ELIF <expr> COLON NEWLINE INDENT <block> <elif_statement>*
-                             -> ELSE COLON NEWLINE INDENT <block>
+            <elif_statement> -> ELIF <expr> COLON <suite> <elif_statement>*
+                             -> ELSE COLON <suite>
                              -> <empty>
         :return:
         """
-        if self.current_token.value == 'elif':
+        if self.current_token.type == 'elif':
             token = self.current_token
             self.eat('elif')
             condition = self.expr()
             self.eat(':')
-            self.eat(tokens.NEWLINE)
-            self.indent += 1
-            right_block = self.block()
-            self.indent -= 1
+            right_block = self.suite()
             wrong_block = self.elif_statement()
             return ast.If(condition, token, right_block, wrong_block)
-        elif self.current_token.value == tokens.keywords.ELSE:
+        elif self.current_token.type == 'else':
             self.eat('else')
             self.eat(':')
-            self.eat(tokens.NEWLINE)
-
-            self.indent += 1
-            block = self.block()
-            self.indent -= 1
-            return block
+            return self.suite()
         else:
             return self.empty()
 
@@ -248,84 +319,54 @@ class Parser:
     @log_def
     def expr(self):
         """
-        A expression statementokens.
-            <expr> -> <term_plus_minus> ((EQUAL|LESS_THAN|LESS_EQUAL|GREAT_THAN|GREAT_EQUAL) <term_plus_minus>)*
-        :return:
-        """
-        node = self.term_plus_minus()
-
-        while self.current_token.value in tokens.operator:
-            # operator plus or minus
-            op = self.current_token
-            self.eat(self.current_token.value)
-            right = self.term_plus_minus()
-            node = ast.Op(left=node, op=op, right=right)
-
-        return node
-
-    @log_def
-    def term_plus_minus(self):
-        """
-        One or Two terms of addition or subtraction.
-            <term_plus_minus> -> <term_mul_div> ((PLUS|MINUS) <term_mul_div>)*
-        :return:
-        """
-        node = self.term_mul_div()
-
-        while self.current_token.value in '+-':
-            # operator plus or minus
-            op = self.current_token
-            self.eat(self.current_token.type)
-            right = self.term_mul_div()
-            node = ast.Op(left=node, op=op, right=right)
-
-        return node
-
-    @log_def
-    def term_mul_div(self):
-        """
-        One or Two terms of multiplication or division.
-            <term_mul_div> -> <factor> ((MUL|DIV) <factor>)*
+        An expression, parsed with the operator stack over binding_power in one call.
+        A pending operator is applied once the next operator does not bind tighter than it.
+            <expr> -> (PLUS|MINUS|INVERT)* <factor> (OPERATOR (PLUS|MINUS|INVERT)* <factor>)*
         :return:
         """
-        node = self.factor()
+        lexer = self.lexer
+        operands = []
+        pending = []  # (right binding power, operator token, is prefix)
+        while True:
+            prefix = binding_power.get(self.current_token.type, no_power)[2]
+            while prefix is not None:
+                pending.append((prefix, self.current_token, True))
+                self.current_token = lexer.next_token()
+                prefix = binding_power.get(self.current_token.type, no_power)[2]
+            operands.append(self.factor())
 
-        while self.current_token.value in '*/':
             op = self.current_token
-            self.eat(self.current_token.value)
-            right = self.factor()
-
-            node = ast.Op(left=node, op=op, right=right)
-
-        return node
+            left, right, _ = binding_power.get(op.type, no_power)
+            if left is None:  # 表达式结束, 应用全部
+                left = -1
+            while pending and pending[-1][0] > left:
+                _, pending_op, is_prefix = pending.pop()
+                if is_prefix:
+                    operands[-1] = ast.UnaryOp(op=pending_op, expr=operands[-1])
+                else:
+                    right_node = operands.pop()
+                    operands[-1] = ast.Op(left=operands[-1], op=pending_op, right=right_node)
+            if left == -1:
+                return operands[0]
+            pending.append((right, op, False))
+            self.current_token = lexer.next_token()
 
     @log_def
     def factor(self):
         """
-        A factor.
-            <factor> -> (+|-) <factor>
-                     -> CONST_INTEGER
+        A factor, the operand of an operator.
+            <factor> -> CONST_INTEGER
                      -> <variable>
                      -> LPAREN <expr> RPAREN
                      -> <function_call>
                      -> tokens.keywords['True']
                      -> CONST_REGULAR_STR
+                     -> CONST_FORMATTED_STR
+                     -> CONST_BYTES
         :return:
         """
-
-        if self.current_token.type in '+-':
-            op = self.current_token
-            if self.current_token.type == '+':
-                self.eat('+')
-                return ast.UnaryOp(op=op, expr=self.factor())
-            elif self.current_token.value == '-':
-                self.eat('-')
-                return ast.UnaryOp(op=op, expr=self.factor())
-
-        elif self.current_token.type == tokens.NUMBER:
-            integer = self.current_token
-            self.eat(self.current_token.type)
-            return ast.Num(integer)
+        if self.current_token.type == tokens.NUMBER:
+            return self.constant(ast.Num)
 
         elif self.current_token.type == tokens.ID:
             if self.lexer.peek_token().type == '(':
@@ -339,41 +380,35 @@ class Parser:
             return expr
         elif self.current_token.type in ('True', 'False'):
             booltoken = self.current_token
-            print(booltoken)
             self.eat(self.current_token.type)
             return ast.Bool(booltoken)
-        elif self.current_token.type == tokens.STRING:
+        elif self.current_token.type == tokens.STRING and formatted(self.current_token):
             strtoken = self.current_token
             self.eat(tokens.STRING)
-            return ast.RegularStr(strtoken)
+            return ast.FormattedStr(strtoken)
+        elif self.current_token.type == tokens.STRING:
+            return self.constant(ast.RegularStr)
+        elif self.current_token.type == tokens.BYTES:
+            return self.constant(ast.Bytes)
+        else:
+            self.error()
 
     @log_def
     def parse(self):
-        print('begin parse')
         node = self.program()
-        # if self.current_token.value != EOF:
-        #     self.error(need=EOF)
+        if self.current_token.type != tokens.ENDMARKER:
+            self.error(tokens.ENDMARKER)
         return node
 
-    @log_def
-    def check_indent(self):
-        indent = self.indent
-        if indent == 0:
-            return True
-        if self.current_token.type != tokens.INDENT:
-            return False
-
-        if self.indent * INDENT_LENGTH != self.current_token.value:
-            return False
-        return True
-
-    @log_def
-    def eat_indent(self):
-        indent = self.indent
-        if self.current_token.type == tokens.INDENT:
-            if indent * INDENT_LENGTH != self.current_token.value:
-                raise IndentationError()
-            self.eat(tokens.INDENT)
+    def statements(self):
+        """
+        The top-level statements of parse() one at a time, each complete when yielded.
+        A syntax error is raised only after the statements before it were yielded.
+        """
+        while self.current_token.type not in (tokens.DEDENT, tokens.ENDMARKER):
+            yield self.statement()
+        if self.current_token.type != tokens.ENDMARKER:
+            self.error(tokens.ENDMARKER)
 
     def __repr__(self):
         return '<%s>' % self.__class__.__name__
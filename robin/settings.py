@@ -1,20 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import logging
+import os
+
+LOG_FORMAT = '%(levelname)-7s %(name)-17s %(lineno)-4d : %(message)s'
+_logging_configured = False
 
-logging.basicConfig(
-    format='%(levelname)-7s %(name)-17s %(lineno)-4d : %(message)s',
-    level=logging.INFO
-)
-logging.getLogger('OpDelimiterScanner').setLevel(logging.ERROR)
-logging.getLogger('NumberScanner').setLevel(logging.ERROR)
-logging.getLogger('EndScanner').setLevel(logging.ERROR)
-logging.getLogger('IndentScanner').setLevel(logging.ERROR)
-logging.getLogger('NameScanner').setLevel(logging.ERROR)
-# logging.getLogger('Lexer').setLevel(logging.ERROR)
 TABSIZE = 8
+LOOKAHEAD = 2  # 解析器最多peek_token(1), 留一个余量
 INDENT_LENGTH = 4
 
 DEBUG = False
 TESTS_PY_SOURCE = 'tests_pysrc'
 TESTS_PY_SOURCE_RESULT_NAME = 'result'
+
+# manager.py run 的AST缓存, 见robin.cache
+CACHE_DIR = os.environ.get('ROBIN_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'robin')
+CACHE_MAX_SIZE = 64 << 20  # 超过时删除最久未使用的缓存文件
+
+# parser.parser packrat模式下每个规则最多记住的位置数, 超过时删除最久未用的
+MEMO_LIMIT = 4096
+# --trace 最多保留的调用事件数, 只输出最后这些
+TRACE_LIMIT = 100000
+
+
+def configure_logging(level='INFO'):
+    """由入口调用而不是在导入时配置; 只在第一次调用时设置格式, 之后只修改根logger的级别"""
+    import logging
+    global _logging_configured
+    if not _logging_configured:
+        _logging_configured = True
+        logging.basicConfig(format=LOG_FORMAT)
+    logging.getLogger().setLevel(level)
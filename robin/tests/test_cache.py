@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+from lexer import PeekTokenLexer
+from robin import ast, cache, files
+from robin.parser import Parser
+from robin.tests.util import dump, source
+
+
+def test_round_trip():
+    tree = Parser(PeekTokenLexer(source)).parse()
+    decoded = cache.decode(cache.encode(tree))
+    assert dump(decoded) == dump(tree) and decoded.constants == tree.constants
+    assert [node.index for node in ast.walk(decoded) if isinstance(node, ast.Constant)] == \
+           [node.index for node in ast.walk(tree) if isinstance(node, ast.Constant)]
+
+
+def test_cached_parse():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'script.py')
+        with open(path, 'w') as file:
+            file.write(source)
+        tree = files.cached_parse(path, cache_dir=directory)
+        cached, = [name for name in os.listdir(directory) if name.endswith(cache.SUFFIX)]
+
+        parsed = []
+        parse = files.FileParser.parse
+        files.FileParser.parse = lambda self: parsed.append(self) or parse(self)
+        try:
+            assert dump(files.cached_parse(path, cache_dir=directory)) == dump(tree)
+            assert not parsed  # 命中缓存, 不再分析
+            with open(path, 'a') as file:
+                file.write('y = 1\n')
+            files.cached_parse(path, cache_dir=directory)
+            assert len(parsed) == 1 and parsed[0].lexer.source.data.closed  # 分析后关闭源文件
+        finally:
+            files.FileParser.parse = parse
+        assert len([name for name in os.listdir(directory) if name.endswith(cache.SUFFIX)]) == 2
+
+        # 损坏或过期的缓存文件当作未命中
+        cached = os.path.join(directory, cached)
+        for data in (b'', b'RAST', cache._header() + b'\x00garbage', b'RAST\x00\x00' + open(cached, 'rb').read()[6:]):
+            with open(cached, 'wb') as file:
+                file.write(data)
+            assert cache.load(cached) is None
+
+
+def test_evict():
+    with tempfile.TemporaryDirectory() as directory:
+        tree = Parser(PeekTokenLexer(source)).parse()
+        paths = [cache.cache_file(str(i).encode(), directory) for i in range(5)]
+        for i, path in enumerate(paths):
+            cache.store(path, tree, max_size=1 << 20)
+            os.utime(path, (i, i))
+        size = os.path.getsize(paths[0])
+        assert cache.load(paths[0]) is not None  # 最近使用
+        cache.evict(directory, size * 3)
+        assert [os.path.exists(path) for path in paths] == [True, False, False, True, True]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from ast import literal_eval
+import pytest
+from lexer import PeekTokenLexer
+from robin import ast
+from robin.constants import number
+from robin.parser import Parser
+from robin.interpreter import Interpreter
+
+
+def test_number():
+    for text in ('0', '7', '1_000', '0x1f', '0XFF', '0o17', '0b101', '1.5', '.5', '1e3', '1E-3', '3.',
+                 '1_0.5_0', '1.5j', '2J', '0e0'):
+        value = number(text)
+        assert value == literal_eval(text) and type(value) is type(literal_eval(text))
+    for text in ('0o8', '09', '0x'):
+        with pytest.raises(ValueError):
+            number(text)
+
+
+def test_pool():
+    text = '''a = 1
+b = 1.0
+c = 0x1
+while a < 100:
+    a = a + 1
+    s = 'x\\ty'
+d = b'\\x00' + b'\\x00'
+e = "x\\ty"
+'''
+    tree = Parser(PeekTokenLexer(text)).parse()
+    constants = [node for node in ast.walk(tree) if isinstance(node, ast.Constant)]
+    assert len(constants) == 9
+    assert all(tree.constants[node.index] is node.value for node in constants)
+    # 相同的值只保存一次, 1和1.0类型不同 各自一项
+    assert tree.constants == [1, 1.0, 100, 'x\ty', b'\x00']
+    assert [type(value) for value in tree.constants[:2]] == [int, float]
+
+    interpreter = Interpreter(tree)
+    interpreter.intreperter()
+    assert interpreter.get_global().get('d').value == b'\x00\x00'
+    assert interpreter.get_global().get('s').value == 'x\ty'
+
+
+def test_formatted():
+    tree = Parser(PeekTokenLexer('b = 1\na = f"{b}"\nc = rF\'{b}\'\nd = "f"\n')).parse()
+    a, c, d = (tree.block.children[i].right for i in (1, 2, 3))
+    assert isinstance(a, ast.FormattedStr) and isinstance(c, ast.FormattedStr) and isinstance(d, ast.RegularStr)
+    assert tree.constants == [1, 'f']
+
+
+def test_invalid():
+    for text in ('a = 0o8\n', "b = 1\na = '\\N{nope}'\n"):
+        with pytest.raises(Exception, match='Invalid literal .* at line') as info:
+            Parser(PeekTokenLexer(text)).parse()
+        assert isinstance(info.value.__cause__, (ValueError, SyntaxError))
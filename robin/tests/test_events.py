@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import sys
+import weakref
+from lexer import PeekTokenLexer
+from robin import ast, parser
+from robin.events import EventParser, RULES, START, END
+from robin.tests.util import source
+
+
+def events(text):
+    result = []
+    tree = EventParser(PeekTokenLexer(text), result.append).parse()
+    return tree, result
+
+
+def test_events():
+    tree, result = events(source)
+    assert not tree.block.children  # 不保留语句
+    assert [event.kind for event in result[:2]] == [START, START] and result[0].rule == 'program'
+    assert result[-1].kind == END and result[-1].node is tree
+
+    depth = 0
+    for event in result:  # 开始与结束成对
+        depth += 1 if event.kind == START else -1
+        assert depth >= 0
+    assert depth == 0
+
+    ends = [event for event in result if event.kind == END]
+    assert [event.node.name for event in ends if event.rule == 'function_def'] == ['hello']
+    assert [event.node.name for event in ends if event.rule == 'function_call'] == ['print', 'hello']
+    statements = [event for event in ends if event.rule == 'statement']
+    assert len(statements) == 8
+    assert [(event.start.line, event.end.line) for event in statements if event.start.type == 'if'] == [(6, 11)]
+
+
+def test_memory():
+    """报告过的语句已经释放, 只有正在分析的语句的节点是活的"""
+    refs = []
+
+    def handler(event):
+        if event.kind == END and event.rule == 'assign_statement':
+            assert all(ref() is None for ref in refs)
+            refs.append(weakref.ref(event.node))
+
+    EventParser(PeekTokenLexer('def f():\n' + '    a = b + 1\n' * 200), handler).parse()
+    assert len(refs) == 200
+
+
+def test_rules():
+    """Parser中每个返回节点或节点列表的方法都报告事件, 除了入口parse和辅助方法constant"""
+    returning = set()
+
+    def profile(frame, event, value):
+        if event == 'return' and frame.f_code.co_filename == parser.__file__ and isinstance(value, (ast.AST, list)):
+            returning.add(frame.f_code.co_name)
+
+    sys.setprofile(profile)
+    try:
+        parser.Parser(PeekTokenLexer(source)).parse()
+    finally:
+        sys.setprofile(None)
+    assert returning - {'parse', 'constant'} == set(RULES)
+
+
+def test_constants():
+    tree, result = events('a = 1\nb = "x"\nc = 1\n')
+    values = [event.node.value for event in result if event.kind == END and event.rule == 'factor']
+    assert values == [1, 'x', 1] and len(tree.constants) == 1  # 不保留常量
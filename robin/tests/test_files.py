@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import pytest
+from lexer import tokens
+from lexer.source import SourceFile
+from robin import files
+from robin.tests.util import dump
+
+source = '''a = 1
+while a < 3:
+    a = a + 1
+'''
+
+
+def test_close():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'script.py')
+        with open(path, 'w') as file:
+            file.write(source)
+
+        for engine in ('scanner', 'regex'):
+            assert files.FileLexer(path, engine=engine).source.data.closed  # token已全部读出
+
+            a_lexer = files.FileLexer(path, lazy=True, engine=engine)
+            assert not a_lexer.source.data.closed
+            while a_lexer.next_token().type != tokens.ENDMARKER:
+                pass
+            assert a_lexer.source.data.closed
+
+            with files.FileLexer(path, lazy=True, engine=engine) as a_lexer:
+                a_lexer.next_token()
+            assert a_lexer.source.data.closed
+
+        with SourceFile(path) as source_file:  # 传入的SourceFile由调用者关闭
+            files.FileLexer(source_file).close()
+            assert not source_file.data.closed
+
+        interpreter = files.FileInterpreter(path, stream=True)
+        interpreter.intreperter()
+        assert interpreter.parser.lexer.source.data.closed
+        assert interpreter.get_global().get('a').value == 3
+
+
+def test_stream_lazy_functions():
+    with pytest.raises(ValueError):
+        files.FileInterpreter(__file__, stream=True, lazy_functions=True)
+
+
+def test_compact():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'script.py')
+        with open(path, 'w') as file:
+            file.write(source * 20)
+        a_parser = files.FileParser(path, compact=True)
+        assert dump(a_parser.parse()) == dump(files.FileParser(path).parse())
+        result = files.parse_file(path)
+        assert result.error is None and result.tokens == len(a_parser.lexer.token_stream) > 0
+
+
+def test_lazy_functions():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'script.py')
+        with open(path, 'w') as file:
+            file.write('def f(x):\n    y = x + 1\n    print(y)\n\nf(2)\nz = 3\n')
+        interpreter = files.FileInterpreter(path, lazy_functions=True)
+        interpreter.intreperter()  # 第一次调用f时分析函数体
+        function = interpreter.get_global().get('f')
+        assert function.block.children[0].right.right.value == 1
+        assert interpreter.get_global().get('z').value == 3
+
+
+def test_empty():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, '__init__.py')
+        open(path, 'w').close()
+        for engine in ('scanner', 'regex'):
+            assert files.lex_file(path, engine=engine) == files.FileResult(path, 0, 1, 0, None)
+            result = files.parse_file(path, engine=engine)
+            assert result.error is None and result.tokens == 1
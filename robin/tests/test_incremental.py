@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import random
+from lexer import PeekTokenLexer, lf_lines
+from robin import ast
+from robin.incremental import IncrementalParser
+from robin.parser import Parser
+from robin.tests.util import dump
+
+text = '''# comment
+a = 1
+
+def f(x, y):
+    z = x + y
+    if z > 3:
+        print(z)
+    elif z < 0:
+        pass
+    else:
+        z = 0
+    while z < 10:
+        z = z + 1
+    w = z
+
+b = f(1, 2)
+if b:
+    print('yes')
+c = 3
+'''
+
+
+def parse(text):
+    try:
+        return dump(Parser(PeekTokenLexer(text)).parse())
+    except Exception:
+        return None
+
+
+def check_edit(parser, start, end, new_text):
+    """:return edit()的结果, 编辑后的文本不能分析时为None"""
+    lines = lf_lines(parser.text())
+    expected = parse(''.join(lines[:start]) + new_text + ''.join(lines[end:]))
+    try:
+        result = parser.edit(start, end, new_text)
+    except Exception:
+        assert expected is None
+        return None
+    assert dump(parser.tree) == expected
+    return result
+
+
+def test_reuse():
+    parser = IncrementalParser(text)
+    function, call = parser.tree.block.children[1:3]
+    block, i, j = check_edit(parser, 12, 13, '        z = z + 2\n')  # while内
+    assert block is function.block.children[2].block and (i, j) == (0, 1)
+    assert parser.tree.block.children[1] is function and parser.tree.block.children[2] is call
+
+    block, i, j = check_edit(parser, 5, 5, '    # note\n    y = 2\n')  # 新增行 之后的语句平移
+    assert block is function.block and (i, j) == (1, 3)
+    assert parser.tree.block.children[2] is call and call.span == (17, 18)
+
+    check_edit(parser, 3, 4, 'def g(x, y):\n')  # 只重新分析这个函数
+    assert parser.tree.block.children[1] is not function and parser.tree.block.children[2] is call
+    check_edit(parser, 13, 14, '')  # 删除while
+    check_edit(parser, 17, 18, 'if b:\n')
+    check_edit(parser, 0, 0, 'if a:\n    a = 2\n')
+
+
+def test_random_edits():
+    rand = random.Random(0)
+    snippets = ['d = 4\n', '    e = 5\n', '        g = 6\n', 'if a:\n', '    pass\n', '\n', '# x\n',
+                'print(a,\n', '  1)\n', 'while c:\n', '    c = c - 1\n', 'else:\n', 'def h():\n', 'x = """\n']
+    for _ in range(200):
+        parser = IncrementalParser(text)
+        for _ in range(5):
+            lines = lf_lines(parser.text())
+            start = rand.randint(0, len(lines))
+            end = rand.randint(start, min(len(lines), start + 2))
+            indent = lines[start][:len(lines[start]) - len(lines[start].lstrip(' '))] if start < len(lines) else ''
+            new_text = ''.join(indent + rand.choice(snippets) for _ in range(rand.randint(0, 2)))
+            if check_edit(parser, start, end, new_text) is None:
+                break
+
+
+def test_constants():
+    parser = IncrementalParser(text)
+    for value in range(100):
+        check_edit(parser, 18, 19, 'c = %d\n' % value)  # 每次一个新的字面量, 旧的不再使用
+    assert len(parser.tree.constants) <= 2 * 5
+    for node in ast.walk(parser.tree):
+        if isinstance(node, ast.Constant):
+            assert parser.tree.constants[node.index] == node.value
+    assert parser.tree.block.children[-1].right.value == 99
+
+    check_edit(parser, 0, 0, 'if a:\n')  # 全部重新分析 使用新的常量池
+    assert sorted(parser.tree.constants, key=repr) == sorted({1, 2, 3, 10, 0, 'yes', 99}, key=repr)
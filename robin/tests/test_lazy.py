@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import pytest
+from lexer import PeekTokenLexer
+from robin import ast
+from robin.parser import Parser
+from robin.interpreter import Interpreter
+from robin.tests.util import dump
+
+text = '''def f(x):
+    def g(y):
+        z = y * 3
+    g(x)
+    y = x + 1
+
+def unused(a):
+    while a:
+        a = a - 1
+
+def broken():
+    b = = 1
+
+f(2)
+def last(c):
+    if c:
+        d = c'''
+
+
+def expand(tree):
+    """分析全部LazyBlock, 与一次分析全文的树相同"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and isinstance(node.block, ast.LazyBlock):
+            node.block = node.block.parse()
+    return tree
+
+
+def test_lazy_functions():
+    tree = Parser(PeekTokenLexer(text), lazy_functions=True).parse()
+    f, unused, broken, call, last = tree.block.children
+    assert all(isinstance(node.block, ast.LazyBlock) for node in (f, unused, broken, last))
+    assert [node.span for node in tree.block.children] == [(0, 6), (6, 10), (10, 13), (13, 14), (14, 17)]
+
+    interpreter = Interpreter(tree)
+    interpreter.intreperter()  # 语法错误的函数没有调用
+    assert unused.block.block is None and broken.block.block is None
+    function = interpreter.get_global().get('f')
+    eager = Parser(PeekTokenLexer(text.replace('b = = 1', 'pass'))).parse()
+    assert function.block is f.block.block and f.block.block.children[0].block.block is not None  # 调用f时调用了g
+    assert dump(expand(function.block)) == dump(eager.block.children[0].block)
+    assert dump(last.block.parse()) == dump(eager.block.children[4].block)
+
+    with pytest.raises(Exception):
+        broken.block.parse()
+
+
+def test_lazy_lexer():
+    with pytest.raises(ValueError):
+        Parser(PeekTokenLexer(text, lazy=True), lazy_functions=True)
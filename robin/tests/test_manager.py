@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import pytest
+import lexer
+from lexer import export
+
+click = pytest.importorskip('click')
+
+
+def test_choices():
+    """manager.py中的选项列表与lexer的定义一致"""
+    import manager
+    assert sorted(manager.ENGINE_NAMES) == sorted(lexer.ENGINES)
+    assert manager.EXPORT_FORMATS == export.FORMATS
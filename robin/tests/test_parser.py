@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from lexer import PeekTokenLexer
+from robin import ast
+from robin.parser import Parser
+from robin.interpreter import Interpreter
+
+
+def parse_expr(text):
+    root = Parser(PeekTokenLexer(f'x = {text}\n')).parse()
+    return root.block.children[0].right
+
+
+def shape(node):
+    """带括号的表达式, 用于检查结合顺序"""
+    if isinstance(node, ast.Op):
+        return f'({shape(node.left)} {node.value} {shape(node.right)})'
+    if isinstance(node, ast.UnaryOp):
+        return f'({node.value}{shape(node.expr)})'
+    return node.token.value
+
+
+def test_precedence():
+    cases = {
+        '1 + 2 * 3': '(1 + (2 * 3))',
+        '1 - 2 - 3': '((1 - 2) - 3)',
+        '2 ** 3 ** 2': '(2 ** (3 ** 2))',
+        '-2 ** 2': '(-(2 ** 2))',
+        '2 ** -1': '(2 ** (-1))',
+        '-a * b': '((-a) * b)',
+        'a < b + 1': '(a < (b + 1))',
+        '1 | 2 ^ 3 & 4 << 5': '(1 | (2 ^ (3 & (4 << 5))))',
+        '(1 + 2) * 3': '((1 + 2) * 3)',
+        '~a % 3 // 2': '(((~a) % 3) // 2)',
+    }
+    for text, expected in cases.items():
+        assert shape(parse_expr(text)) == expected, text
+
+
+def test_evaluate():
+    for text in ('1 + 2 * 3 - 4 / 2', '2 ** 3 ** 2', '-2 ** 2', '7 // 2 % 3', '~5 & 3 | 8 ^ 1',
+                 '1 << 3 >> 1', '3 != 4', '1 + 2 <= 3', '-(1 - 2) * +3'):
+        node = parse_expr(text)
+        assert Interpreter(node).visit(node) == eval(text), text
+
+
+def test_invalid():
+    for text in ('1 +', '1 ~ 2', '* 2', '(1 + 2'):
+        try:
+            parse_expr(text)
+        except Exception as e:
+            assert 'Invalid syntax' in str(e), text
+        else:
+            assert False, text
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import pytest
+from lexer import PeekTokenLexer
+from robin import ast
+from robin.parser import Parser
+
+
+def parse(text):
+    return Parser(PeekTokenLexer(text)).parse()
+
+
+def test_literals():
+    tree = parse("a = 0x10\nb = 'x\\ty'\nc = True\nd = 1.5\n")
+    assert [statement.right.value for statement in tree.block.children] == [16, 'x\ty', True, 1.5]
+
+
+def test_suites():
+    tree = parse('''def f(x):
+    if x:
+        y = 1
+    elif y:
+        pass
+    else:
+        while x:
+            x = x - 1
+f(1)
+''')
+    function, call = tree.block.children
+    assert isinstance(function, ast.FunctionDef) and isinstance(call, ast.FunctionCall)
+    if_statement, = function.block.children
+    assert isinstance(if_statement.wrong_block, ast.If)
+    while_statement, = if_statement.wrong_block.wrong_block.children
+    assert isinstance(while_statement.block.children[0], ast.Assign)
+
+
+def test_invalid():
+    for text in ('a b\n', '1 = 2\n', 'if a:\nb = 1\n', 'a = 1 2\n', 'while a\n'):
+        with pytest.raises(Exception):
+            parse(text)
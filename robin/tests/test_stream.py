@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import weakref
+import pytest
+from lexer import PeekTokenLexer
+from robin.parser import Parser
+from robin.interpreter import Interpreter
+from robin.tests.util import dump, source
+
+program = '''
+def f(x):
+    y = x * 2
+
+a = 1
+while a < 10:
+    a = a * 2
+f(a)
+b = a + 1
+'''
+
+
+def statements(text):
+    return Parser(PeekTokenLexer(text, lazy=True)).statements()
+
+
+def test_statements():
+    tree = Parser(PeekTokenLexer(source)).parse()
+    assert [dump(statement) for statement in statements(source)] == dump(tree.block.children)
+
+
+def test_execute():
+    interpreter = Interpreter(Parser(PeekTokenLexer(program)).parse())
+    interpreter.intreperter()
+    streamed = Interpreter(None)
+    refs = []
+
+    def tracked():
+        for statement in statements(program):
+            assert all(ref() is None for ref in refs)  # 执行过的语句已经释放
+            refs.append(weakref.ref(statement))
+            yield statement
+
+    streamed.execute(tracked())
+    assert len(refs) == 5
+    for name in ('a', 'b'):
+        assert streamed.get_global().get(name).value == interpreter.get_global().get(name).value
+
+
+def test_execute_before_error():
+    interpreter = Interpreter(None)
+    with pytest.raises(Exception):
+        interpreter.execute(statements('a = 1\nb = a + 1\nc = )\n'))
+    assert interpreter.get_global().get('b').value == 2  # 错误之前的语句已经执行
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+script = '''
+from robin import settings
+settings.TRACE_LIMIT = 50
+from robin import util
+util.enable_trace()
+from lexer import PeekTokenLexer
+from robin.parser import Parser
+Parser(PeekTokenLexer('a = 1\\n' * 100)).parse()
+print(len(util.trace_buffer), util.trace_buffer[-1][3])
+'''
+
+
+def test_trace_limit():
+    """在新的进程中打开跟踪, 不影响其他测试"""
+    output = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ['50', 'parse']
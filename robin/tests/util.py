@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""robin测试共用的源码和树的比较"""
+from robin import ast
+
+source = '''
+def hello(name, n):
+    while n > 0:
+        print('Hello', name, -n ** 2, 1.5j)
+        n = n - 1
+
+if True:
+    hello("World", 3)
+elif False:
+    pass
+else:
+    x = 0x1f
+'''
+
+
+def dump(node):
+    """
+    节点的类名和全部字段, 用于比较两棵树
+    常量池的顺序取决于分析的顺序(增量分析, 延迟分析的函数体), 只比较常量的值
+    """
+    if isinstance(node, ast.AST):
+        return type(node).__name__, {name: dump(value) for name, value in vars(node).items()
+                                     if name not in ('index', 'constants')}
+    if isinstance(node, list):
+        return [dump(item) for item in node]
+    return node
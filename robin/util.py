@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-import logging
+from collections import deque
 from functools import wraps
+from robin import settings
 
 __author__ = 'Aollio Hou'
 __email__ = 'aollio@outlook.com'
@@ -8,25 +9,93 @@ __email__ = 'aollio@outlook.com'
 _level = -1
 _step = '    '
 
+# Tracing is switched on once at startup by enable_trace(). Until then a method
+# decorated with log_def is the plain function, with no per-call overhead.
+_tracing = False
+_traced = []  # [(owner, attr, traced), ...] every method decorated with log_def
+# (event, depth, name, func_name, value), event is 'call' or 'return'; only the last TRACE_LIMIT are kept
+trace_buffer = deque(maxlen=settings.TRACE_LIMIT)
+
+
+class _Traced(object):
+    """
+    Placeholder returned by log_def. When the owner class is created it
+    replaces itself with the plain function, or with a tracing wrapper.
+    """
+
+    def __init__(self, func, name):
+        self.func = func
+        self.name = name
+
+    def __set_name__(self, owner, attr):
+        _traced.append((owner, attr, self))
+        setattr(owner, attr, self.wrapper() if _tracing else self.func)
+
+    def __get__(self, instance, owner=None):
+        return self.func.__get__(instance, owner)
+
+    def __call__(self, *args, **kw):
+        return self.func(*args, **kw)
+
+    def wrapper(self):
+        func, name = self.func, self.name
 
-def log_def(name):
-    def decorator(func):
         @wraps(func)
         def wrapper(*args, **kw):
-            logger = logging.getLogger(name)
             global _level
             _level += 1
-            logger.info(_level * _step + '-->️ %s(), args: %r, kw: %r. ', func.__name__, args, kw)
-            rv = func(*args, **kw)
-            logger.info(_level * _step + '<-- %s(), rv: %r, args: %r, kw:%r.', func.__name__, rv, args, kw)
-            _level -= 1
+            trace_buffer.append(('call', _level, name, func.__name__, (args, kw)))
+            try:
+                rv = func(*args, **kw)
+            finally:
+                _level -= 1
+            trace_buffer.append(('return', _level + 1, name, func.__name__, rv))
             return rv
 
         return wrapper
 
+
+def log_def(name):
+    """Record calls of the decorated method in trace_buffer once enable_trace() is called."""
+
+    def decorator(func):
+        return _Traced(func, name)
+
     return decorator
 
 
+def traced_methods(owner):
+    """Names of the log_def methods of owner and its base classes, in definition order."""
+    return [attr for cls, attr, _ in _traced if issubclass(owner, cls)]
+
+
+def enable_trace():
+    """
+    Wrap every log_def method, at startup for settings.DEBUG, -d or --trace. False if already enabled.
+    Methods already bound before the call are not traced: the dispatch table of a Lexer
+    built earlier, and the rules robin.events wraps when it is imported.
+    """
+    global _tracing
+    if _tracing:
+        return False
+    _tracing = True
+    for owner, attr, traced in _traced:
+        setattr(owner, attr, traced.wrapper())
+    return True
+
+
+def format_trace(events=None):
+    """Render trace events as text, indented by call depth."""
+    lines = []
+    for event, depth, name, func_name, value in trace_buffer if events is None else events:
+        if event == 'call':
+            args, kw = value
+            lines.append(f'{depth * _step}--> {name}.{func_name}(), args: {args!r}, kw: {kw!r}')
+        else:
+            lines.append(f'{depth * _step}<-- {name}.{func_name}(), rv: {value!r}')
+    return '\n'.join(lines)
+
+
 def log_cls(cls):
     class NewCls(object):
         def __init__(self, *args, **kwargs):